@@ -0,0 +1,121 @@
+"""
+Benchmark: runtime asyncio (una corrutina por vehículo) vs Vehicle con threads.
+
+Cada caso corre en un subproceso aparte para que la memoria máxima (RSS) de un
+caso no contamine al siguiente. Los tiempos de la configuración se escalan con
+--escala (por defecto 0.01: 4-8 s estacionado pasan a ser 40-80 ms).
+
+Uso:
+    python benchmarks/bench_async_vs_threads.py
+    python benchmarks/bench_async_vs_threads.py --tamanos 100 1000 --escala 0.01
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+TAMANOS = [100, 1_000, 10_000, 100_000]
+
+
+def peak_rss_mb():
+    """Memoria máxima del proceso en MB (ru_maxrss está en KB en Linux)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_threads(n, capacidad, escala):
+    from parking_lot import ParkingLot
+    from vehicle import Vehicle
+
+    lot = ParkingLot(capacidad)
+    events = queue.Queue()
+    stop = threading.Event()
+    # Los tiempos de la configuración se escalan igual que en el runtime asyncio
+    vehicles = [Vehicle(i + 1, lot, events, stop, time_scale=escala) for i in range(n)]
+    for v in vehicles:
+        v.start()
+    for v in vehicles:
+        v.join()
+    return events.qsize()
+
+
+def run_async(n, capacidad, escala):
+    from async_runtime import run_async_simulation
+
+    events = queue.Queue()
+    asyncio.run(run_async_simulation(n, capacidad, events, time_scale=escala))
+    return events.qsize()
+
+
+def child(modo, n, capacidad, escala):
+    """Ejecuta un solo caso e imprime el resultado como JSON."""
+    runner = run_threads if modo == "threads" else run_async
+    started = time.perf_counter()
+    try:
+        eventos = runner(n, capacidad, escala)
+        error = None
+    except (RuntimeError, MemoryError) as e:
+        eventos, error = 0, str(e)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "modo": modo,
+        "vehiculos": n,
+        "capacidad": capacidad,
+        "segundos": round(elapsed, 4),
+        "vehiculos_por_segundo": round(n / elapsed, 1) if elapsed and not error else 0,
+        "rss_max_mb": round(peak_rss_mb(), 1),
+        "eventos": eventos,
+        "error": error,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS)
+    parser.add_argument("--escala", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=300,
+                        help="Segundos máximos por caso")
+    parser.add_argument("--json", help="Archivo donde guardar los resultados")
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        modo, n, capacidad, escala = args.child
+        child(modo, int(n), int(capacidad), float(escala))
+        return
+
+    results = []
+    print(f"{'modo':>8} {'vehículos':>10} {'segundos':>10} {'veh/s':>10} {'RSS MB':>8}  error")
+    for n in args.tamanos:
+        capacidad = max(5, n // 100)  # 99% de los vehículos esperan a la vez
+        for modo in ("threads", "asyncio"):
+            cmd = [sys.executable, os.path.abspath(__file__), "--child",
+                   modo, str(n), str(capacidad), str(args.escala)]
+            try:
+                out = subprocess.run(cmd, capture_output=True, text=True,
+                                     timeout=args.timeout).stdout.strip()
+                result = json.loads(out.splitlines()[-1]) if out else {
+                    "modo": modo, "vehiculos": n, "error": "sin salida (proceso abortado)"}
+            except subprocess.TimeoutExpired:
+                result = {"modo": modo, "vehiculos": n, "error": "timeout"}
+            results.append(result)
+            print(f"{modo:>8} {n:>10} {result.get('segundos', 0):>10} "
+                  f"{result.get('vehiculos_por_segundo', 0):>10} "
+                  f"{result.get('rss_max_mb', 0):>8}  {result.get('error') or ''}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
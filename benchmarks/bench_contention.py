@@ -0,0 +1,95 @@
+"""
+Benchmark de contención: ParkingLot (un solo lock) vs ShardedParkingLot.
+
+N hilos entran y salen del parqueadero en un ciclo cerrado (try_enter sin
+espera + exit) durante un tiempo fijo. Se reporta el throughput total
+(operaciones entrada+salida por segundo) según el número de hilos.
+
+Uso:
+    python benchmarks/bench_contention.py
+    python benchmarks/bench_contention.py --hilos 1 4 16 --franjas 16 --segundos 2
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+from parking_lot import ParkingLot          # noqa: E402
+from sharded_lot import ShardedParkingLot   # noqa: E402
+
+HILOS = [1, 2, 4, 8, 16, 32]
+
+
+def worker(lot, thread_id, start, deadline, counts, elapsed):
+    """
+    Entra y sale con nombres propios hasta 'deadline'.
+
+    Cada hilo controla su propio plazo: con muchos hilos compitiendo por el
+    GIL, un hilo principal que duerme y luego avisa 'stop' puede tardar
+    mucho en volver a correr y alarga (o cuelga) la medición.
+    """
+    start.wait()
+    base = thread_id * 1_000_000
+    ops = 0
+    k = 0
+    began = time.perf_counter()
+    now = began
+    while now < deadline:
+        for _ in range(256):
+            name = base + k
+            if lot.try_enter(name, timeout=0):
+                lot.exit(name)
+                ops += 2
+            k = (k + 1) % 1000
+        now = time.perf_counter()
+    counts[thread_id] = ops
+    elapsed[thread_id] = now - began
+
+
+def measure(lot, threads, seconds):
+    start = threading.Event()
+    counts = [0] * threads
+    elapsed = [0.0] * threads
+    deadline = time.perf_counter() + seconds + 0.05  # Margen para arrancar los hilos
+    workers = [threading.Thread(target=worker,
+                                args=(lot, t, start, deadline, counts, elapsed))
+               for t in range(threads)]
+    for w in workers:
+        w.start()
+    start.set()
+    for w in workers:
+        w.join()
+    return sum(counts) / max(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hilos", type=int, nargs="+", default=HILOS)
+    parser.add_argument("--capacidad", type=int, default=1024)
+    parser.add_argument("--franjas", type=int, default=8)
+    parser.add_argument("--segundos", type=float, default=1.0)
+    parser.add_argument("--json", help="Archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    print(f"GIL activo: {getattr(sys, '_is_gil_enabled', lambda: True)()}")
+    print(f"{'hilos':>6} {'ParkingLot op/s':>18} {'Sharded op/s':>18} {'relación':>9}")
+    results = []
+    for threads in args.hilos:
+        single = measure(ParkingLot(args.capacidad), threads, args.segundos)
+        sharded = measure(ShardedParkingLot(args.capacidad, args.franjas), threads, args.segundos)
+        results.append({"hilos": threads, "parking_lot": round(single),
+                        "sharded": round(sharded), "franjas": args.franjas})
+        print(f"{threads:>6} {single:>18,.0f} {sharded:>18,.0f} {sharded / single:>8.2f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark de reservas: costo de la admisión con ReservationPolicy según
+cuántas reservas pendientes hay en el libro.
+
+Mide held() (lo que consulta cada try_enter), peak() de una ventana corta
+(lo que consulta cada reserva nueva) y un ciclo try_enter + exit de
+ParkingLot con la política, contra el mismo ciclo sin política. Si la
+admisión es O(log n), pasar de 1.000 a 100.000 reservas apenas cambia
+el costo por operación.
+
+Uso:
+    python benchmarks/bench_reservations.py
+    python benchmarks/bench_reservations.py --reservas 1000 100000 1000000 --json reservas.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+from parking_lot import ParkingLot                          # noqa: E402
+from policies import ReservationBook, ReservationPolicy    # noqa: E402
+
+RESERVAS = [1_000, 10_000, 100_000]
+HORIZONTE = 30 * 24 * 3600   # Las reservas se reparten en un mes (segundos)
+
+
+class _FixedClock:
+    """Reloj detenido en 'now': todas las operaciones ven el mismo libro vigente."""
+
+    def __init__(self, now):
+        self._now = now
+
+    def now(self):
+        return self._now
+
+    def wait_event(self, event, timeout=None):
+        return event.wait(timeout)
+
+
+def fill(book, count, seed=1):
+    """'count' reservas de 1 a 4 horas repartidas en HORIZONTE (en orden de inicio: insort barato)."""
+    rng = random.Random(seed)
+    for k, start in enumerate(sorted(rng.uniform(0, HORIZONTE) for _ in range(count))):
+        book.book(f"R{k}", start, start + rng.uniform(3600, 4 * 3600))
+
+
+def per_call(function, calls):
+    """Segundos por llamada de function(k) con k = 0..calls-1."""
+    started = time.perf_counter()
+    for k in range(calls):
+        function(k)
+    return (time.perf_counter() - started) / calls
+
+
+def measure(count, calls):
+    book = ReservationBook()
+    fill(book, count)
+    rng = random.Random(2)
+    instants = [rng.uniform(0, HORIZONTE) for _ in range(1024)]
+    held = per_call(lambda k: book.held(instants[k & 1023]), calls)
+    peak = per_call(lambda k: book.peak(instants[k & 1023], instants[k & 1023] + 900), calls)
+
+    # Capacidad de sobra: el ciclo siempre entra, se mide solo la admisión.
+    # Las reservas ya vencidas se limpian antes (try_enter lo haría en la primera llamada)
+    now = HORIZONTE / 2
+    started = time.perf_counter()
+    expired = book.expire(now)
+    expire = time.perf_counter() - started
+    policy = ReservationPolicy(100_000)
+    policy.book = book
+    with_policy = ParkingLot(100_000, clock=_FixedClock(now), policy=policy)
+    plain = ParkingLot(100_000, clock=_FixedClock(now))
+
+    def cycle(lot):
+        def run(k):
+            lot.try_enter(k, timeout=0)
+            lot.exit(k)
+        return run
+
+    return {
+        "reservas": count,
+        "vigentes": book.held(now),
+        "vencidas": expired,
+        "expire_ms": expire * 1e3,
+        "held_ns": held * 1e9,
+        "peak_ns": peak * 1e9,
+        "ciclo_con_politica_us": per_call(cycle(with_policy), calls // 10) * 1e6,
+        "ciclo_sin_politica_us": per_call(cycle(plain), calls // 10) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reservas", type=int, nargs="+", default=RESERVAS)
+    parser.add_argument("--llamadas", type=int, default=200_000)
+    parser.add_argument("--json", help="Archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    print(f"{'reservas':>10} {'vigentes':>9} {'held ns':>9} {'peak ns':>9} {'expire ms':>10} "
+          f"{'ciclo c/política µs':>20} {'ciclo s/política µs':>20}")
+    results = []
+    for count in args.reservas:
+        row = measure(count, args.llamadas)
+        results.append(row)
+        print(f"{row['reservas']:>10,} {row['vigentes']:>9} {row['held_ns']:>9.0f} {row['peak_ns']:>9.0f} {row['expire_ms']:>10.1f} "
+              f"{row['ciclo_con_politica_us']:>20.2f} {row['ciclo_sin_politica_us']:>20.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
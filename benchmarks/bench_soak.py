@@ -0,0 +1,186 @@
+"""
+Prueba de resistencia (soak): llegadas continuas durante un día simulado.
+
+Compara el modelo anterior (un thread por vehículo guardado en una lista que
+se recorre en cada refresco) con VehiclePool (hilos fijos, vehículos que
+terminan se liberan). Cada modo corre en un subproceso aparte y toma muestras
+periódicas de la memoria residente (RSS), los threads vivos y el costo de un
+"refresco" (procesar eventos y contar vehículos vivos, como update_ui).
+
+Los tiempos de config.py se escalan con --escala: con 24 horas y escala 0.001
+la corrida dura ~86 segundos reales.
+
+Uso:
+    python benchmarks/bench_soak.py
+    python benchmarks/bench_soak.py --horas 24 --escala 0.001 --modos pool
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+MODOS = ["hilos", "pool"]
+REFRESCO = 0.2  # Segundos reales entre refrescos (como REFRESCO_UI)
+
+
+def current_rss_mb():
+    """Memoria residente actual en MB (/proc en Linux; si no, la máxima)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def child(modo, horas, escala, intervalo, capacidad, hilos_pool, muestras):
+    """Ejecuta un modo e imprime sus muestras como JSON."""
+    from events import EventChannel
+    from parking_lot import ParkingLot
+    from stats import SimulationStats
+    from vehicle import Vehicle
+    from vehicle_pool import VehiclePool
+
+    lot = ParkingLot(capacidad)
+    channel = EventChannel(maxsize=1_000_000)
+    stats = SimulationStats(capacidad)
+    stop = threading.Event()
+    pool = VehiclePool(hilos_pool) if modo == "pool" else None
+    vehicles = []  # Solo modo "hilos": la lista que nunca se vacía
+
+    duration = horas * 3600 * escala
+    arrival_gap = intervalo * escala
+    sample_every = duration / muestras
+    samples = []
+
+    start = time.perf_counter()
+    next_arrival = start
+    next_tick = start + REFRESCO
+    next_sample = start + sample_every
+    vehicle_id = 0
+    tick_total = 0.0
+    tick_count = 0
+    tick_max = 0.0
+    alive = 0
+
+    while True:
+        now = time.perf_counter()
+        if now - start >= duration:
+            break
+
+        # Llegadas pendientes hasta 'now'
+        while next_arrival <= now:
+            vehicle_id += 1
+            v = Vehicle(vehicle_id, lot, channel, stop,
+                        on_finish=stats.vehicle_finished, time_scale=escala)
+            stats.vehicle_started()
+            if pool is not None:
+                pool.submit(v)
+            else:
+                vehicles.append(v)
+                v.start()
+            next_arrival += arrival_gap
+
+        # Refresco: procesar eventos y contar vehículos vivos
+        if now >= next_tick:
+            t0 = time.perf_counter()
+            for event in channel.drain(len(vehicles) + 100_000):
+                stats.record_event(event)
+            if pool is None:
+                alive = sum(1 for v in vehicles if v.is_alive())
+            else:
+                alive = stats.live_vehicles
+            cost = time.perf_counter() - t0
+            tick_total += cost
+            tick_count += 1
+            tick_max = max(tick_max, cost)
+            next_tick = now + REFRESCO
+
+        if now >= next_sample:
+            samples.append({
+                "horas_simuladas": round((now - start) / escala / 3600, 2),
+                "vehiculos": vehicle_id,
+                "rss_mb": round(current_rss_mb(), 1),
+                "threads": threading.active_count(),
+                "vivos": alive,
+                "refresco_ms": round(tick_total / tick_count * 1000, 3) if tick_count else 0.0,
+                "refresco_max_ms": round(tick_max * 1000, 3),
+            })
+            tick_total, tick_count, tick_max = 0.0, 0, 0.0
+            next_sample += sample_every
+
+        delay = min(next_arrival, next_tick, next_sample) - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    stop.set()
+    lot.cancel_waiting()
+    if pool is not None:
+        pool.cancel_pending()
+        pool.shutdown(timeout=5)
+
+    print(json.dumps({"modo": modo, "capacidad": capacidad, "muestras": samples}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--horas", type=float, default=24, help="Horas simuladas")
+    parser.add_argument("--escala", type=float, default=0.001,
+                        help="Factor de los tiempos de config.py (0.001 = 1 hora en 3.6 s)")
+    parser.add_argument("--intervalo", type=float, default=1.0,
+                        help="Segundos simulados entre llegadas")
+    parser.add_argument("--capacidad", type=int, default=10)
+    parser.add_argument("--hilos-pool", type=int, default=32)
+    parser.add_argument("--muestras", type=int, default=12)
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=MODOS)
+    parser.add_argument("--json", help="Archivo donde guardar los resultados")
+    parser.add_argument("--child", nargs=7, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        modo, horas, escala, intervalo, capacidad, hilos_pool, muestras = args.child
+        child(modo, float(horas), float(escala), float(intervalo), int(capacidad),
+              int(hilos_pool), int(muestras))
+        return
+
+    results = []
+    for modo in args.modos:
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", modo,
+               str(args.horas), str(args.escala), str(args.intervalo),
+               str(args.capacidad), str(args.hilos_pool), str(args.muestras)]
+        out = subprocess.run(cmd, capture_output=True, text=True).stdout.strip()
+        if not out:
+            print(f"{modo}: sin salida (proceso abortado)")
+            continue
+        result = json.loads(out.splitlines()[-1])
+        results.append(result)
+
+        print(f"\n=== {modo} ===")
+        print(f"{'horas':>6} {'vehículos':>10} {'RSS MB':>8} {'threads':>8} {'vivos':>6} "
+              f"{'refresco ms':>12} {'máx ms':>8}")
+        for s in result["muestras"]:
+            print(f"{s['horas_simuladas']:>6} {s['vehiculos']:>10} {s['rss_mb']:>8} "
+                  f"{s['threads']:>8} {s['vivos']:>6} {s['refresco_ms']:>12} "
+                  f"{s['refresco_max_ms']:>8}")
+        muestras = result["muestras"]
+        if len(muestras) >= 2:
+            # Comparar contra la primera muestra ya en régimen (la segunda)
+            first, last = muestras[1], muestras[-1]
+            print(f"Crecimiento RSS: {last['rss_mb'] - first['rss_mb']:+.1f} MB  |  "
+                  f"refresco: {first['refresco_ms']} -> {last['refresco_ms']} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+Suite de benchmarks de las rutas calientes, con resultados comparables entre commits.
+
+Casos:
+- parking_lot: try_enter/exit sin espera con N hilos (operaciones por segundo)
+- vehiculo: ciclo de vida completo de Vehicle.run con tiempos en cero
+  (vehículos por segundo), en el mismo hilo y en un VehiclePool
+- logger: filas por segundo de log_to_csv (abre el archivo por fila) y de
+  EventLogger (un archivo abierto, escritura por lotes)
+- gui: costo por frame de ParkingLotGUI.update_spaces según la capacidad y
+  de refresh_log (log virtual) según los eventos nuevos por frame. Siempre
+  se mide contra un canvas de prueba (costo del lado de Python); si hay
+  display, también contra Tk real (incluye el dibujo de Tk).
+  Sin display ni tkinter, lo que no se puede medir se marca como omitido.
+
+Cada resultado se guarda con la versión (commit) y el entorno para poder
+comparar dos corridas: --comparar marca las regresiones mayores al umbral y
+termina con código 1 si hay alguna.
+
+Uso:
+    python benchmarks/bench_suite.py --json base.json
+    python benchmarks/bench_suite.py --json nuevo.json --comparar base.json
+    python benchmarks/bench_suite.py --casos gui --capacidades 5 1000 10000
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+sys.path.insert(0, SRC)
+
+from event_history import EventHistory, HistoryView        # noqa: E402
+from events import EventChannel, EventKind, ParkingEvent   # noqa: E402
+from logger import EventLogger, log_to_csv                 # noqa: E402
+from parking_lot import ParkingLot                         # noqa: E402
+from slots import OCUPADO, build_slots, default_layout     # noqa: E402
+from vehicle import Vehicle                                # noqa: E402
+from vehicle_pool import VehiclePool                       # noqa: E402
+from bench_contention import measure as measure_lot        # noqa: E402
+
+CASOS = ["parking_lot", "vehiculo", "logger", "gui"]
+HILOS = [1, 4, 16]
+CAPACIDADES = [5, 100, 1000, 10000]
+EVENTOS_FRAME = [10, 1000, 10000]
+
+
+def result(caso, parametros, valor, unidad, mayor_es_mejor):
+    return {"caso": caso, "parametros": parametros, "valor": valor,
+            "unidad": unidad, "mayor_es_mejor": mayor_es_mejor}
+
+
+def skipped(caso, parametros, motivo):
+    return {"caso": caso, "parametros": parametros, "omitido": motivo}
+
+
+def best_of(repeticiones, fn, mayor_es_mejor):
+    """Repite la medición y se queda con la mejor (la menos perturbada)."""
+    values = [fn() for _ in range(repeticiones)]
+    return max(values) if mayor_es_mejor else min(values)
+
+
+# === PARKING LOT ===
+
+def bench_parking_lot(args):
+    results = []
+    for threads in args.hilos:
+        ops = best_of(args.repeticiones,
+                      lambda: measure_lot(ParkingLot(args.capacidad), threads, args.segundos),
+                      True)
+        results.append(result("parking_lot.try_enter_exit", {"hilos": threads},
+                              round(ops), "op/s", True))
+    return results
+
+
+# === VEHÍCULOS ===
+
+def _run_vehicles(n, capacidad, workers):
+    """
+    Corre n vehículos con time_scale=0 (sin esperas): mide solo el costo del
+    ciclo de vida (parqueadero, eventos, callbacks).
+    """
+    lot = ParkingLot(capacidad)
+    channel = EventChannel(maxsize=n * 4 + 16)
+    stop = threading.Event()
+    vehicles = [Vehicle(k + 1, lot, channel, stop, time_scale=0, initial_wait=0, dwell=0)
+                for k in range(n)]
+    start = time.perf_counter()
+    if workers == 0:
+        for v in vehicles:
+            v.run()
+    else:
+        pool = VehiclePool(workers)
+        for v in vehicles:
+            pool.submit(v)
+        pool.wait_idle()
+        pool.shutdown()
+    return n / (time.perf_counter() - start)
+
+
+def bench_vehicle(args):
+    results = []
+    for workers in (0, args.hilos_pool):
+        rate = best_of(args.repeticiones,
+                       lambda: _run_vehicles(args.vehiculos, args.capacidad, workers), True)
+        modo = "directo" if workers == 0 else "pool"
+        results.append(result("vehiculo.run", {"modo": modo, "hilos": workers},
+                              round(rate), "vehículos/s", True))
+    return results
+
+
+# === LOGGER ===
+
+def _sample_events(n):
+    kinds = (EventKind.ESPERANDO, EventKind.INGRESO, EventKind.SALIDA)
+    return [ParkingEvent.now(kinds[k % 3], k, k % 50) for k in range(n)]
+
+
+def _log_to_csv_rate(events, directory):
+    filename = os.path.join(directory, "log_to_csv.csv")
+    start = time.perf_counter()
+    for event in events:
+        log_to_csv(filename, event)
+    elapsed = time.perf_counter() - start
+    os.remove(filename)
+    return len(events) / elapsed
+
+
+def _event_logger_rate(events, directory, fmt):
+    filename = os.path.join(directory, f"event_logger.{fmt}")
+    start = time.perf_counter()
+    logger = EventLogger(filename, fmt=fmt)
+    for event in events:
+        logger.log(event)
+    logger.close()
+    elapsed = time.perf_counter() - start
+    os.remove(filename)
+    return len(events) / elapsed
+
+
+def bench_logger(args):
+    events = _sample_events(args.filas)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        rate = best_of(args.repeticiones, lambda: _log_to_csv_rate(events, directory), True)
+        results.append(result("logger.log_to_csv", {"filas": args.filas},
+                              round(rate), "filas/s", True))
+        for fmt in ("csv", "bin"):
+            rate = best_of(args.repeticiones,
+                           lambda: _event_logger_rate(events, directory, fmt), True)
+            results.append(result("logger.event_logger", {"filas": args.filas, "formato": fmt},
+                                  round(rate), "filas/s", True))
+    return results
+
+
+# === GUI ===
+
+class _StubItems:
+    """Canvas/Listbox/PhotoImage de prueba: acepta cualquier llamada y cuenta ítems."""
+
+    def __init__(self, *args, **kwargs):
+        self._next = 0
+        self._size = 0
+
+    def _create(self, *args, **kwargs):
+        self._next += 1
+        return self._next
+
+    create_rectangle = create_line = create_text = create_image = _create
+
+    def insert(self, index, *items):
+        self._size += len(items)
+
+    def delete(self, first, last=None):
+        if first == "all":
+            return
+        if last == "end":
+            self._size = first
+            return
+        last = first if last is None else last
+        self._size -= last - first + 1
+
+    def size(self):
+        return self._size
+
+    def zoom(self, factor):
+        return _StubItems()
+
+    def __getattr__(self, name):
+        # itemconfig, coords, put, yview, bind, ...
+        return lambda *args, **kwargs: None
+
+
+class _StubRoot:
+    def after_idle(self, callback):
+        return None
+
+
+def _stub_gui(gui_module):
+    """
+    ParkingLotGUI sin Tk: los mismos atributos que arman _create_parking_canvas
+    y _create_event_log.
+    """
+    gui = gui_module.ParkingLotGUI.__new__(gui_module.ParkingLotGUI)
+    gui.root = _StubRoot()
+    gui.canvas = _StubItems()
+    gui.log_box = _StubItems()
+    gui.log_scrollbar = _StubItems()
+    gui.log_count_label = _StubItems()
+    gui.history = EventHistory()
+    gui._log_view = HistoryView(gui.history)
+    gui._log_top = 0
+    gui._log_follow = True
+    gui._log_shown = None
+    gui._log_scroll_shown = None
+    gui._log_refresh_pending = None
+    gui._slots = []
+    gui._states = bytearray()
+    gui._tiles = {}
+    gui._heatmap = None
+    gui._heat_base = None
+    gui._heatmap_item = None
+    gui._cols = gui._rows = 1
+    gui._pitch = gui.TILE_MAX
+    gui._view_x = gui._view_y = 0
+    gui._drag = None
+    gui._redraw_pending = None
+    return gui
+
+
+def _frames(capacidad, frames, cambios, seed=0):
+    """Estados de espacios frame a frame, cambiando una fracción por frame."""
+    rng = random.Random(seed)
+    states = bytearray(capacidad)
+    changed = max(1, int(capacidad * cambios))
+    result = []
+    for _ in range(frames):
+        for i in rng.sample(range(capacidad), changed):
+            states[i] ^= OCUPADO
+        result.append(bytes(states))
+    return result
+
+
+def _time_frames(gui, frames, after=None):
+    """Microsegundos por frame de update_spaces (mediana)."""
+    costs = []
+    for states in frames:
+        start = time.perf_counter()
+        gui.update_spaces(states)
+        if after is not None:
+            after()
+        costs.append(time.perf_counter() - start)
+    return statistics.median(costs) * 1e6
+
+
+def _time_refresh_log(gui, frames, per_frame, after=None):
+    """
+    Microsegundos por frame de refresh_log con 'per_frame' eventos nuevos en
+    el historial (mediana). Agregar al historial no se mide: lo hace update_ui.
+    """
+    events = _sample_events(per_frame)
+    append = gui.history.append
+    costs = []
+    for _ in range(frames):
+        for event in events:
+            append(event)
+        start = time.perf_counter()
+        gui.refresh_log()
+        if after is not None:
+            after()
+        costs.append(time.perf_counter() - start)
+    return statistics.median(costs) * 1e6
+
+
+def bench_gui(args):
+    try:
+        import tkinter as tk
+        import gui as gui_module
+    except ImportError as e:
+        return [skipped("gui", {}, f"tkinter no disponible: {e}")]
+
+    results = []
+
+    # Canvas de prueba: tk.PhotoImage necesita un intérprete Tk, así que se
+    # reemplaza solo mientras se mide
+    photo = tk.PhotoImage
+    tk.PhotoImage = _StubItems
+    try:
+        for capacidad in args.capacidades:
+            gui = _stub_gui(gui_module)
+            gui.init_spaces(build_slots(default_layout(capacidad)))
+            frames = _frames(capacidad, args.frames, args.cambios)
+            cost = best_of(args.repeticiones, lambda: _time_frames(gui, frames), False)
+            results.append(result("gui.update_spaces", {"capacidad": capacidad, "tk": False,
+                                                        "modo": gui._mode()},
+                                  round(cost, 1), "µs/frame", False))
+        for per_frame in args.eventos_frame:
+            gui = _stub_gui(gui_module)
+            cost = best_of(args.repeticiones,
+                           lambda: _time_refresh_log(gui, args.frames, per_frame), False)
+            results.append(result("gui.refresh_log", {"eventos_por_frame": per_frame, "tk": False},
+                                  round(cost, 1), "µs/frame", False))
+    finally:
+        tk.PhotoImage = photo
+
+    # Tk real (incluye el dibujo, forzado con update_idletasks)
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        reason = f"sin display: {e}"
+        results.append(skipped("gui.update_spaces", {"tk": True}, reason))
+        results.append(skipped("gui.refresh_log", {"tk": True}, reason))
+        return results
+
+    try:
+        root.withdraw()
+        noop = lambda: None   # noqa: E731
+        gui = gui_module.ParkingLotGUI(root, noop, noop, noop, noop)
+        for capacidad in args.capacidades:
+            gui.init_spaces(build_slots(default_layout(capacidad)))
+            root.update_idletasks()
+            frames = _frames(capacidad, args.frames, args.cambios)
+            cost = best_of(args.repeticiones,
+                           lambda: _time_frames(gui, frames, root.update_idletasks), False)
+            results.append(result("gui.update_spaces", {"capacidad": capacidad, "tk": True,
+                                                        "modo": gui._mode()},
+                                  round(cost, 1), "µs/frame", False))
+        for per_frame in args.eventos_frame:
+            gui.clear_log()
+            cost = best_of(args.repeticiones,
+                           lambda: _time_refresh_log(gui, args.frames, per_frame,
+                                                     root.update_idletasks), False)
+            results.append(result("gui.refresh_log", {"eventos_por_frame": per_frame, "tk": True},
+                                  round(cost, 1), "µs/frame", False))
+    finally:
+        root.destroy()
+    return results
+
+
+BENCHMARKS = {
+    "parking_lot": bench_parking_lot,
+    "vehiculo": bench_vehicle,
+    "logger": bench_logger,
+    "gui": bench_gui,
+}
+
+
+# === RESULTADOS ===
+
+def environment():
+    """Versión del código y del entorno en que se midió."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--", "src"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+    except OSError:
+        commit, dirty = None, False
+    return {
+        "commit": commit,
+        "cambios_sin_commit": dirty,
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "gil": getattr(sys, "_is_gil_enabled", lambda: True)(),
+    }
+
+
+def _key(r):
+    return r["caso"], json.dumps(r["parametros"], sort_keys=True)
+
+
+def _describe(r):
+    params = " ".join(f"{k}={v}" for k, v in r["parametros"].items())
+    return f"{r['caso']} {params}".strip()
+
+
+def compare(base, results, umbral):
+    """
+    Compara contra una corrida anterior.
+
+    Retorna:
+    - Lista de descripciones de los casos que empeoraron más que 'umbral'
+    """
+    previous = {_key(r): r for r in base["resultados"] if "valor" in r}
+    regressions = []
+    print(f"\nComparación contra {base['entorno'].get('commit')} "
+          f"(umbral {umbral:.0%}):")
+    print(f"{'caso':<52} {'antes':>12} {'ahora':>12} {'cambio':>8}")
+    for r in results:
+        old = previous.get(_key(r))
+        if old is None or "valor" not in r or not old["valor"]:
+            continue
+        change = r["valor"] / old["valor"] - 1
+        worse = -change if r["mayor_es_mejor"] else change
+        flag = ""
+        if worse > umbral:
+            flag = "  REGRESIÓN"
+            regressions.append(_describe(r))
+        elif worse < -umbral:
+            flag = "  mejora"
+        print(f"{_describe(r):<52} {old['valor']:>12,} {r['valor']:>12,} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--casos", nargs="+", choices=CASOS, default=CASOS)
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="Repeticiones por caso (se guarda la mejor)")
+    parser.add_argument("--hilos", type=int, nargs="+", default=HILOS)
+    parser.add_argument("--capacidad", type=int, default=64,
+                        help="Capacidad del parqueadero en parking_lot y vehiculo")
+    parser.add_argument("--segundos", type=float, default=0.5,
+                        help="Duración de cada medición de parking_lot")
+    parser.add_argument("--vehiculos", type=int, default=5000)
+    parser.add_argument("--hilos-pool", type=int, default=8)
+    parser.add_argument("--filas", type=int, default=5000)
+    parser.add_argument("--capacidades", type=int, nargs="+", default=CAPACIDADES)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--cambios", type=float, default=0.05,
+                        help="Fracción de espacios que cambia por frame")
+    parser.add_argument("--eventos-frame", type=int, nargs="+", default=EVENTOS_FRAME,
+                        help="Eventos nuevos por frame en el caso gui.refresh_log")
+    parser.add_argument("--json", help="Archivo donde guardar los resultados")
+    parser.add_argument("--comparar", help="Resultados anteriores (--json) para comparar")
+    parser.add_argument("--umbral", type=float, default=0.15,
+                        help="Empeoramiento relativo que cuenta como regresión")
+    args = parser.parse_args()
+
+    env = environment()
+    print(f"commit {env['commit']}{' (con cambios)' if env['cambios_sin_commit'] else ''}  |  "
+          f"Python {env['python']}  |  {env['cpus']} CPU  |  GIL activo: {env['gil']}")
+
+    results = []
+    for caso in args.casos:
+        for r in BENCHMARKS[caso](args):
+            results.append(r)
+            if "omitido" in r:
+                print(f"{_describe(r):<52} omitido ({r['omitido']})")
+            else:
+                print(f"{_describe(r):<52} {r['valor']:>14,} {r['unidad']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"entorno": env, "resultados": results}, f, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regressions = compare(base, results, args.umbral)
+        if regressions:
+            print(f"\n{len(regressions)} regresión(es): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import asyncio
+from events import EventKind, ParkingEvent
+from parking_lot import AsyncParkingLot
+from settings import SETTINGS
+from vehicle import vehicle_rng
+
+
+async def async_vehicle(vehicle_id, parking_lot, event_queue, stop_event, time_scale=1.0, rng=None):
+    """
+    Ciclo de vida de un vehículo como corrutina (equivalente a Vehicle.run).
+
+    Cada vehículo ocupa unos pocos KB en el event loop en lugar de un thread
+    con su propia pila, así que caben decenas de miles esperando a la vez.
+    Un vehículo que encuentra el parqueadero lleno avisa una sola vez
+    (ESPERANDO, enseguida, como Vehicle) y se queda en la fila del semáforo:
+    no reintenta cada 2 segundos, porque con decenas de miles de vehículos
+    esos reintentos saturan el event loop.
+
+    Parámetros:
+    - event_queue: Cualquier cola con put_nowait() (queue.Queue o asyncio.Queue)
+    - stop_event: asyncio.Event para el shutdown ordenado
+    - time_scale: Factor que multiplica los tiempos de la configuración (1.0 = tiempo real)
+    - rng: Generador aleatorio del vehículo (None = vehicle_rng(SEMILLA, vehicle_id),
+      el mismo que usaría el Vehicle con hilos)
+    """
+    # Tiempos de la configuración vigente (SETTINGS), igual que Vehicle
+    if rng is None:
+        rng = vehicle_rng(SETTINGS.SEMILLA, vehicle_id)
+    await asyncio.sleep(rng.uniform(SETTINGS.TIEMPO_MIN_ESPERA, SETTINGS.TIEMPO_MAX_ESPERA) * time_scale)
+    if stop_event.is_set():
+        return
+
+    try:
+        if not await parking_lot.try_enter(vehicle_id, timeout=0):
+            event_queue.put_nowait(ParkingEvent.now(EventKind.ESPERANDO, vehicle_id))
+            await parking_lot.try_enter(vehicle_id, timeout=None)
+    except asyncio.CancelledError:
+        parking_lot.abandon(vehicle_id)  # Detenido mientras esperaba (en cualquiera de los intentos)
+        event_queue.put_nowait(ParkingEvent.now(EventKind.RECHAZADO, vehicle_id))
+        raise
+
+    event_queue.put_nowait(ParkingEvent.now(EventKind.INGRESO, vehicle_id))
+    try:
+        await asyncio.sleep(rng.uniform(SETTINGS.TIEMPO_MIN_ESTACIONADO, SETTINGS.TIEMPO_MAX_ESTACIONADO)
+                            * time_scale)
+    finally:
+        await parking_lot.exit(vehicle_id)
+        event_queue.put_nowait(ParkingEvent.now(EventKind.SALIDA, vehicle_id))
+
+
+async def run_async_simulation(vehicles, capacidad=None, event_queue=None,
+                               time_scale=1.0, spawn_interval=0.0, stop_event=None, seed=None):
+    """
+    Lanza 'vehicles' corrutinas contra un AsyncParkingLot y espera a que terminen.
+
+    Parámetros:
+    - capacidad: Espacios del parqueadero (None = SETTINGS.CAPACIDAD)
+    - seed: Semilla de la corrida (None = SETTINGS.SEMILLA); cada vehículo
+      deriva de ella su generador
+    - spawn_interval: Segundos entre la creación de cada vehículo (sin bloquear)
+    - stop_event: asyncio.Event opcional; al activarlo se cancelan los vehículos
+
+    Retorna:
+    - El AsyncParkingLot usado (para consultar su estado final)
+    """
+    if capacidad is None:
+        capacidad = SETTINGS.CAPACIDAD
+    if seed is None:
+        seed = SETTINGS.SEMILLA
+    parking_lot = AsyncParkingLot(capacidad)
+    if stop_event is None:
+        stop_event = asyncio.Event()
+    if event_queue is None:
+        event_queue = asyncio.Queue()
+
+    tasks = []
+
+    async def watch_stop():
+        await stop_event.wait()
+        for task in tasks:
+            task.cancel()
+
+    watcher = asyncio.create_task(watch_stop())
+    for i in range(vehicles):
+        if stop_event.is_set():
+            break
+        tasks.append(asyncio.create_task(
+            async_vehicle(i + 1, parking_lot, event_queue, stop_event, time_scale,
+                          vehicle_rng(seed, i + 1))))
+        if spawn_interval:
+            await asyncio.sleep(spawn_interval)
+
+    try:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        watcher.cancel()
+    return parking_lot
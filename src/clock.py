@@ -0,0 +1,178 @@
+import threading
+import time
+from config import VELOCIDAD_SIMULACION, VELOCIDAD_MAXIMA
+
+# Espera real máxima entre revisiones al esperar un threading.Event con
+# timeout simulado (para notar cambios de velocidad o pausas a tiempo)
+_REVISION = 0.1
+
+
+class WallClock:
+    """
+    Reloj de tiempo real (time.monotonic / time.sleep). Es el reloj por
+    defecto de Vehicle, ParkingLot y TrafficFeeder: sin un SimulationClock se
+    comportan igual que antes.
+    """
+    speed = 1.0
+    paused = False
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds, stop_event=None):
+        """
+        Duerme 'seconds' segundos.
+
+        Retorna:
+        - False si stop_event se activó antes de terminar, True si no
+        """
+        if stop_event is None:
+            if seconds > 0:
+                time.sleep(seconds)
+            return True
+        if seconds > 0:
+            return not stop_event.wait(seconds)
+        return not stop_event.is_set()
+
+    def wait_event(self, event, timeout=None):
+        """event.wait() con el timeout medido en este reloj."""
+        return event.wait(timeout)
+
+    def wake(self):
+        """Nada que despertar: sleep() ya espera sobre stop_event."""
+
+
+WALL_CLOCK = WallClock()
+
+
+class SimulationClock:
+    """
+    Reloj simulado: avanza 'speed' veces más rápido que el tiempo real y se
+    puede pausar o adelantar paso a paso.
+
+    Arranca igual a time.monotonic(), así que a velocidad 1 sin pausas marca
+    lo mismo que el reloj real. Vehicle, ParkingLot, TrafficFeeder y la GUI
+    miden y duermen con él, y los eventos llevan su timestamp: las
+    estadísticas quedan en tiempo simulado y se pueden comparar entre
+    corridas a distinta velocidad.
+
+    Los hilos dormidos esperan en una Condition; cambiar la velocidad,
+    pausar, reanudar, adelantar o wake() los despierta para que recalculen
+    cuánto les falta.
+    """
+
+    def __init__(self, speed=VELOCIDAD_SIMULACION, max_speed=VELOCIDAD_MAXIMA):
+        """
+        Parámetros:
+        - speed: Multiplicador inicial (1 = tiempo real)
+        - max_speed: Multiplicador máximo que acepta set_speed() (VELOCIDAD_MAXIMA de la configuración)
+        """
+        self._cond = threading.Condition()
+        self.max_speed = max_speed
+        self._real = time.monotonic()  # Instante real del último cambio de velocidad/pausa
+        self._sim = self._real         # Tiempo simulado en ese instante
+        self.origin = self._sim
+        self.paused = False
+        self.speed = 1.0
+        self.set_speed(speed)
+
+    def now(self):
+        """Tiempo simulado actual (segundos)."""
+        if self.paused:
+            return self._sim
+        return self._sim + (time.monotonic() - self._real) * self.speed
+
+    def elapsed(self):
+        """Segundos simulados desde que se creó el reloj."""
+        return self.now() - self.origin
+
+    def _rebase(self):
+        """Fija el tiempo simulado actual como nuevo punto de partida (con el lock tomado)."""
+        real = time.monotonic()
+        if not self.paused:
+            self._sim += (real - self._real) * self.speed
+        self._real = real
+
+    # === CONTROLES ===
+
+    def set_speed(self, speed):
+        """Cambia el multiplicador de velocidad (1 = tiempo real)."""
+        if not 0 < speed <= self.max_speed:
+            raise ValueError(f"Velocidad fuera de rango: {speed} (0 < velocidad <= {self.max_speed})")
+        with self._cond:
+            self._rebase()
+            self.speed = float(speed)
+            self._cond.notify_all()
+
+    def pause(self):
+        with self._cond:
+            self._rebase()
+            self.paused = True
+            self._cond.notify_all()
+
+    def resume(self):
+        with self._cond:
+            self._rebase()
+            self.paused = False
+            self._cond.notify_all()
+
+    def step(self, seconds):
+        """
+        Adelanta el reloj 'seconds' segundos simulados de golpe (pensado para
+        avanzar en pausa). Los hilos cuyo plazo ya se cumplió se despiertan.
+        """
+        with self._cond:
+            self._rebase()
+            self._sim += seconds
+            self._cond.notify_all()
+
+    def wake(self):
+        """Despierta a los hilos dormidos (p. ej. después de stop_event.set())."""
+        with self._cond:
+            self._cond.notify_all()
+
+    # === ESPERAS ===
+
+    def to_real(self, seconds):
+        """Segundos reales que tardan 'seconds' simulados a la velocidad actual (None en pausa)."""
+        if self.paused:
+            return None
+        return seconds / self.speed
+
+    def sleep(self, seconds, stop_event=None):
+        """
+        Duerme 'seconds' segundos simulados.
+
+        Parámetros:
+        - stop_event: threading.Event opcional que corta la espera (junto con wake())
+
+        Retorna:
+        - False si stop_event se activó antes de terminar, True si no
+        """
+        deadline = self.now() + seconds
+        with self._cond:
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                remaining = deadline - self.now()
+                if remaining <= 0:
+                    return True
+                self._cond.wait(self.to_real(remaining))
+
+    def wait_event(self, event, timeout=None):
+        """
+        event.wait() con 'timeout' en segundos simulados.
+
+        El evento no avisa a la Condition del reloj, así que se espera sobre el
+        evento en tramos reales cortos y se recalcula el plazo en cada uno.
+        """
+        if timeout is None:
+            return event.wait()
+        deadline = self.now() + timeout
+        while True:
+            remaining = deadline - self.now()
+            if remaining <= 0:
+                return event.is_set()
+            real = self.to_real(remaining)
+            if event.wait(_REVISION if real is None else min(real, _REVISION)):
+                return True
@@ -1,9 +1,79 @@
 # Configuración global del simulador
+#
+# Estos son los valores por defecto. settings.SETTINGS los combina con un
+# archivo JSON (--config o CONFIG_ARCHIVO), variables de entorno
+# PARQUEADERO_<NOMBRE> y la línea de comandos, y permite recargarlos en caliente.
 
 CAPACIDAD = 5          # Número de espacios del parqueadero
+# Distribución por niveles/zonas: lista de (nivel, zona, tipo, cantidad), con tipo
+# de slots.SlotType (0 estándar, 1 compacto, 2 grande, 3 eléctrico, 4 discapacidad).
+# None = CAPACIDAD espacios estándar en un solo nivel.
+# Ejemplo: [(1, "A", 0, 3), (1, "A", 3, 1), (2, "B", 4, 1)]
+DISTRIBUCION_ESPACIOS = None
 VEHICULOS_INICIALES = 8
+SEMILLA = 42           # Semilla: cada vehículo deriva de ella su propio generador aleatorio
 TIEMPO_MIN_ESPERA = 2  # Tiempo mínimo antes de intentar entrar
 TIEMPO_MAX_ESPERA = 5
 TIEMPO_MIN_ESTACIONADO = 4
 TIEMPO_MAX_ESTACIONADO = 8
 REFRESCO_UI = 200      # Frecuencia de actualización (ms)
+HILOS_POOL = 32        # Hilos fijos del VehiclePool (crece solo si hay más vehículos activos)
+INTERVALO_INICIAL = 0.5  # Segundos simulados entre los vehículos iniciales
+PLAZO_DETENCION = 3.0    # Segundos reales para que terminen los vehículos al reiniciar
+
+# Barreras de entrada y salida (gates.py)
+PUERTAS_ENTRADA = 0              # Barreras de entrada (0 = entrar es instantáneo)
+PUERTAS_SALIDA = 0               # Barreras de salida (0 = salir es instantáneo)
+PUERTA_SERVICIO_ENTRADA = 6.0    # Segundos promedio para cruzar una barrera de entrada
+PUERTA_SERVICIO_SALIDA = 10.0    # Segundos promedio en una barrera de salida (pago)
+PUERTA_DISTRIBUCION = "exponencial"  # "uniforme", "exponencial" o "lognormal"
+PUERTA_ESTRATEGIA = "cola_corta"     # Cómo elige puerta un vehículo: "cola_corta" o "turno"
+
+# Configuración en tiempo de ejecución (settings.py)
+CONFIG_ARCHIVO = None            # Archivo JSON que se vigila y recarga en caliente (None = ninguno)
+CONFIG_REVISION_MS = 1000        # Cada cuánto se revisa si el archivo cambió (ms)
+
+# Reloj de la simulación (clock.py)
+VELOCIDAD_SIMULACION = 1.0       # Veces el tiempo real al iniciar
+VELOCIDAD_MAXIMA = 1000          # Multiplicador máximo permitido
+VELOCIDADES = [1, 10, 100, 1000]  # Botones de velocidad de la GUI
+PASO_SIMULACION = 1.0            # Segundos simulados que avanza el botón "Paso"
+
+# Generador de tráfico (traffic.py)
+TRAFICO_PERFIL = None            # None = VEHICULOS_INICIALES fijos; "constante" o "pico"
+TRAFICO_TASA = 600               # Vehículos por hora fuera de las horas pico
+TRAFICO_TASA_PICO = 2400         # Vehículos por hora en horas pico
+TRAFICO_HORAS_PICO = [(7, 9), (17, 19)]  # (hora_inicio, hora_fin)
+TRAFICO_ESTADIA = "uniforme"     # "uniforme", "exponencial" o "lognormal"
+
+# Trazas (event_trace.py)
+TRAZA_GRABAR = None              # Archivo donde grabar la traza de cada corrida (None = no grabar)
+VELOCIDAD_REPRODUCCION = 10.0    # Veces el tiempo real al reproducir una traza en la GUI
+
+# Sesiones persistentes en SQLite (session_store.py)
+SESION_DB = None                 # Archivo donde guardar corridas, vehículos y eventos (None = no guardar)
+SESION_EVENTOS = True            # False = solo corridas, métricas, vehículos y asignaciones
+SESION_LOTE = 5000               # Eventos por transacción
+
+# Barridos de parámetros (sweep.py)
+BARRIDO_CACHE = "sweep_cache.jsonl"  # Resultados ya calculados, por hash del escenario
+
+# Registro de eventos (EventLogger)
+LOG_ARCHIVO = "event_log.csv"
+LOG_FORMATO = "csv"        # "csv", "csv.gz" o "bin"
+LOG_LOTE = 500             # Eventos por escritura
+LOG_INTERVALO_FLUSH = 1.0  # Segundos máximos antes de escribir un lote
+
+# Historial de eventos del log de la GUI (event_history.py)
+HISTORIAL_EVENTOS = 1_000_000    # Eventos que se conservan en memoria (~21 bytes c/u)
+
+# Cola de eventos hacia la GUI
+TAMANO_COLA_EVENTOS = 10000      # Eventos máximos pendientes
+POLITICA_DESBORDE = "bloquear"   # "bloquear", "descartar_nuevo" o "descartar_antiguo"
+                                 # (descartar puede dejar las estadísticas por debajo)
+MAX_EVENTOS_POR_FRAME = 500      # Eventos procesados como máximo en cada refresco
+PRESUPUESTO_FRAME_MS = 25        # Tiempo máximo de procesamiento por refresco (ms)
+
+# Métricas estilo Prometheus en http://METRICAS_HOST:METRICAS_PUERTO/metrics (metrics.py)
+METRICAS_PUERTO = None           # None = sin métricas (ni endpoint ni instrumentación)
+METRICAS_HOST = "127.0.0.1"      # Interfaz del endpoint (por defecto solo local)
@@ -0,0 +1,333 @@
+import heapq
+import itertools
+import math
+import random
+import time
+from collections import deque
+from config import CAPACIDAD
+from events import EventKind, SIN_ESPACIO
+from parking_lot import ParkingLot
+from settings import SETTINGS
+
+# Tipos de evento del motor: los mismos valores de EventKind, como int simples
+# para que el ciclo principal compare rápido
+LLEGADA = int(EventKind.LLEGADA)    # El vehículo termina su espera inicial y pide entrar
+ENTRADA = int(EventKind.INGRESO)    # El vehículo ocupa un espacio
+SALIDA = int(EventKind.SALIDA)      # El vehículo libera su espacio
+ESPERANDO = int(EventKind.ESPERANDO)  # Parqueadero lleno: el vehículo hace fila
+RECHAZADO = int(EventKind.RECHAZADO)  # Se cansó de esperar (max_wait) y se fue
+# Internos (no se emiten): el vehículo termina de cruzar una barrera
+FIN_PUERTA_ENTRADA = -1
+FIN_PUERTA_SALIDA = -2
+
+
+class DiscreteEventEngine:
+    """
+    Motor de simulación de eventos discretos (sin threads y sin sleep).
+
+    En lugar de un hilo por vehículo que duerme en tiempo real, se usa un reloj
+    virtual y una cola de prioridad (heap) de eventos LLEGADA/ENTRADA/SALIDA.
+    El motor salta directamente al siguiente evento, así que un día completo de
+    simulación se resuelve en segundos.
+
+    Usa el mismo ParkingLot que el modo con threads: cada entrada pasa por
+    try_enter() y cada salida por exit(). Los vehículos que encuentran el
+    parqueadero lleno esperan en una cola FIFO y entran cuando alguien sale.
+
+    Con un parqueadero repartido entre procesos (ver multiprocess.py) los
+    espacios que otro proceso cede llegan entre una ventana y la siguiente;
+    admit_waiting() hace pasar a los primeros de la fila.
+
+    Los tiempos por defecto son los de SETTINGS al crear el motor; 'wait_range' y
+    'dwell_range' ((mínimo, máximo) en segundos) los reemplazan, y con
+    'max_wait' un vehículo que lleva tanto tiempo en la fila se va (RECHAZADO).
+
+    Con puertas (gates.GateBank) cada llegada hace fila en una barrera de
+    entrada antes de pedir espacio y cada salida en una de salida antes de
+    liberarlo; el servicio de cada barrera es un evento más. Por defecto
+    se usan las del parqueadero, si las tiene.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD, seed=None, on_event=None,
+                 parking_lot=None, wait_range=None, dwell_range=None, max_wait=None,
+                 entry_gates=None, exit_gates=None):
+        self.parking_lot = parking_lot if parking_lot is not None else ParkingLot(capacidad)
+        # SharedParkingLot (multiprocess.py) no tiene puertas
+        self.entry_gates = entry_gates or getattr(self.parking_lot, "entry_gates", None)
+        self.exit_gates = exit_gates or getattr(self.parking_lot, "exit_gates", None)
+        self.capacidad = self.parking_lot.capacidad
+        self.wait_range = wait_range or (SETTINGS.TIEMPO_MIN_ESPERA, SETTINGS.TIEMPO_MAX_ESPERA)
+        self.dwell_range = dwell_range or (SETTINGS.TIEMPO_MIN_ESTACIONADO, SETTINGS.TIEMPO_MAX_ESTACIONADO)
+        self.max_wait = max_wait
+        self.rng = random.Random(seed)
+        # Callback opcional: on_event(tipo, vehicle_id, tiempo, espacio); tipo es un valor de EventKind
+        self.on_event = on_event
+
+        self.now = 0.0           # Reloj virtual (segundos simulados)
+        self._heap = []          # (tiempo, secuencia, tipo, vehicle_id)
+        self._seq = 0            # Desempate estable para eventos simultáneos
+        self._waiting = deque()  # (vehicle_id, tiempo en que empezó a esperar)
+        self._in_line = set()    # vehicle_id de la fila (solo con max_wait)
+        self._handoffs = 0       # Eventos ENTRADA pendientes (admisiones reservadas para la fila)
+        self._dwell = {}         # vehicle_id -> estadía fija (vehículos del generador de tráfico)
+        self._at_gate = {}       # vehicle_id -> Gate en la que hace fila o la atienden
+
+        # Estadísticas
+        self.total_vehicles_created = 0
+        self.successful_parks = 0
+        self.vehicles_exited = 0
+        self.vehicles_waited = 0
+        self.rejections = 0
+        self.max_waiting = 0
+        self.total_wait_time = 0.0
+
+    def schedule(self, when, kind, vehicle_id):
+        """Agenda un evento en el tiempo virtual 'when'."""
+        heapq.heappush(self._heap, (when, self._seq, kind, vehicle_id))
+        self._seq += 1
+
+    def add_vehicle(self, vehicle_id=None, arrival_time=None, dwell=None):
+        """
+        Agrega un vehículo a la simulación.
+
+        Si no se indica arrival_time, se usa el mismo retardo inicial aleatorio
+        que Vehicle.run (wait_range) desde 'now'.
+        Si no se indica dwell (segundos estacionado), se sortea al entrar.
+        """
+        self.total_vehicles_created += 1
+        if vehicle_id is None:
+            vehicle_id = self.total_vehicles_created
+        if arrival_time is None:
+            arrival_time = self.now + self.rng.uniform(*self.wait_range)
+        if dwell is not None:
+            self._dwell[vehicle_id] = dwell
+        self.schedule(arrival_time, LLEGADA, vehicle_id)
+        return vehicle_id
+
+    def add_vehicles(self, count, interval=0.0):
+        """Agrega 'count' vehículos, separados 'interval' segundos simulados."""
+        start = self.now
+        for i in range(count):
+            self.add_vehicle(arrival_time=start + i * interval
+                             + self.rng.uniform(*self.wait_range))
+
+    def _emit(self, kind, vehicle_id, slot=SIN_ESPACIO):
+        if self.on_event is not None:
+            self.on_event(kind, vehicle_id, self.now, slot)
+
+    def _slot(self, vehicle_id):
+        slot = self.parking_lot.slot_of(vehicle_id)
+        return SIN_ESPACIO if slot is None else slot
+
+    def _park(self, vehicle_id):
+        """El vehículo ya tiene su espacio: agenda su salida."""
+        self.successful_parks += 1
+        if self.on_event is not None:
+            self._emit(ENTRADA, vehicle_id, self._slot(vehicle_id))
+        stay = self._dwell.pop(vehicle_id, None)
+        if stay is None:
+            stay = self.rng.uniform(*self.dwell_range)
+        self.schedule(self.now + stay, SALIDA, vehicle_id)
+
+    def step(self):
+        """
+        Procesa el siguiente evento de la cola.
+
+        Retorna:
+        - True si se procesó un evento
+        - False si la cola está vacía
+        """
+        if not self._heap:
+            return False
+
+        when, _, kind, vehicle_id = heapq.heappop(self._heap)
+        self.now = when
+
+        if kind == LLEGADA:
+            self._emit(LLEGADA, vehicle_id)
+            if self.entry_gates is None:
+                self._arrive(vehicle_id)
+            else:
+                self._to_gate(self.entry_gates, FIN_PUERTA_ENTRADA, vehicle_id)
+
+        elif kind == FIN_PUERTA_ENTRADA:
+            self._from_gate(FIN_PUERTA_ENTRADA, vehicle_id)
+            self._arrive(vehicle_id)
+
+        elif kind == ENTRADA:
+            # Turno del primero de la fila (un espacio se liberó en este instante)
+            self._handoffs -= 1
+            if self._waiting:
+                next_id, since = self._waiting[0]
+                if self.parking_lot.try_enter(next_id, timeout=0):
+                    self._waiting.popleft()
+                    self._in_line.discard(next_id)
+                    self.total_wait_time += when - since
+                    self._park(next_id)
+
+        elif kind == SALIDA:
+            # Fin de la estadía: con barreras de salida, el espacio sigue
+            # ocupado hasta cruzar una
+            if self.exit_gates is None:
+                self._leave(vehicle_id)
+            else:
+                self._to_gate(self.exit_gates, FIN_PUERTA_SALIDA, vehicle_id)
+
+        elif kind == FIN_PUERTA_SALIDA:
+            self._from_gate(FIN_PUERTA_SALIDA, vehicle_id)
+            self._leave(vehicle_id)
+
+        elif kind == RECHAZADO:
+            # Plazo de espera cumplido: se va solo si sigue en la fila. Con
+            # la misma paciencia para todos suele ser el primero de la fila
+            if vehicle_id in self._in_line:
+                self._in_line.discard(vehicle_id)
+                for i, (waiting_id, _) in enumerate(self._waiting):
+                    if waiting_id == vehicle_id:
+                        del self._waiting[i]
+                        break
+                self.rejections += 1
+                self._emit(RECHAZADO, vehicle_id)
+
+        return True
+
+    def _arrive(self, vehicle_id):
+        """El vehículo pide espacio: entra o hace fila."""
+        now = self.now
+        # Respetar el orden de llegada: si ya hay cola, no se puede colar
+        if (not self._waiting and not self._handoffs
+                and self.parking_lot.try_enter(vehicle_id, timeout=0)):
+            self._park(vehicle_id)
+            return
+        self._emit(ESPERANDO, vehicle_id)
+        self._waiting.append((vehicle_id, now))
+        self.vehicles_waited += 1
+        if len(self._waiting) > self.max_waiting:
+            self.max_waiting = len(self._waiting)
+        if self.max_wait is not None:
+            self._in_line.add(vehicle_id)
+            self.schedule(now + self.max_wait, RECHAZADO, vehicle_id)
+
+    def _leave(self, vehicle_id):
+        """El vehículo libera su espacio."""
+        slot = self._slot(vehicle_id) if self.on_event is not None else SIN_ESPACIO
+        self.parking_lot.exit(vehicle_id)
+        self.vehicles_exited += 1
+        self._emit(SALIDA, vehicle_id, slot)
+        # Despertar exactamente a un vehículo en espera (el primero en llegar)
+        if self._waiting:
+            self._schedule_admission(self.now)
+
+    def _to_gate(self, gates, done, vehicle_id):
+        """El vehículo elige una barrera: si está libre empieza su servicio, si no hace fila."""
+        gate = gates.choose()
+        self._at_gate[vehicle_id] = gate
+        if gate.arrive(vehicle_id, self.now):
+            self.schedule(self.now + gate.service.sample(self.rng, 1)[0], done, vehicle_id)
+
+    def _from_gate(self, done, vehicle_id):
+        """El vehículo terminó de cruzar: la barrera atiende al siguiente de su fila."""
+        gate = self._at_gate.pop(vehicle_id)
+        following = gate.finish(self.now)
+        if following is not None:
+            self.schedule(self.now + gate.service.sample(self.rng, 1)[0], done, following)
+
+    def gate_stats(self):
+        """Métricas de cada barrera hasta 'now' (lista vacía si no hay)."""
+        return [stats for gates in (self.entry_gates, self.exit_gates) if gates is not None
+                for stats in gates.stats(self.now)]
+
+    def _schedule_admission(self, when):
+        """Reserva un turno de entrada para el primero de la fila."""
+        self._handoffs += 1
+        self.schedule(when, ENTRADA, -1)
+
+    def admit_waiting(self, count):
+        """
+        El parqueadero recibió 'count' espacios libres de afuera (otro
+        proceso los cedió): los primeros de la fila pasan ahora.
+        """
+        for _ in range(min(count, len(self._waiting) - self._handoffs)):
+            self._schedule_admission(self.now)
+
+    def waiting_since(self, limit):
+        """Desde cuándo esperan los primeros 'limit' vehículos de la fila (en orden)."""
+        return [since for _, since in itertools.islice(self._waiting, limit)]
+
+    def next_event_time(self):
+        """Tiempo virtual del próximo evento (math.inf si no queda ninguno)."""
+        return self._heap[0][0] if self._heap else math.inf
+
+    def run(self, until=None):
+        """
+        Ejecuta la simulación hasta vaciar la cola de eventos o hasta el tiempo
+        virtual 'until' (segundos simulados).
+
+        Retorna:
+        - dict con el resumen de la ejecución
+        """
+        started = time.perf_counter()
+        heap = self._heap
+        while heap and (until is None or heap[0][0] <= until):
+            self.step()
+        if until is not None and until > self.now:
+            self.now = until
+        elapsed = time.perf_counter() - started
+        return self.summary(elapsed)
+
+    def summary(self, elapsed=0.0):
+        """Resumen de estadísticas de la simulación."""
+        summary = {
+            "capacidad": self.capacidad,
+            "vehiculos_creados": self.total_vehicles_created,
+            "estacionados": self.successful_parks,
+            "completados": self.vehicles_exited,
+            "esperando": len(self._waiting),
+            "vehiculos_que_esperaron": self.vehicles_waited,
+            "max_en_espera": self.max_waiting,
+            "rechazos": self.rejections,
+            "espera_promedio": (self.total_wait_time / self.successful_parks
+                                if self.successful_parks else 0.0),
+            "tiempo_simulado": self.now,
+            "tiempo_real": elapsed,
+        }
+        gates = self.gate_stats()
+        if gates:
+            summary["puerta_utilizacion_max"] = max(g["utilizacion"] for g in gates)
+            summary["puertas"] = gates
+        return summary
+
+
+def run_headless(vehicles, capacidad=CAPACIDAD, interval=0.5, seed=None, on_event=None,
+                 entry_gates=None, exit_gates=None):
+    """
+    Ejecuta una simulación completa sin interfaz gráfica.
+
+    Parámetros:
+    - vehicles: Número de vehículos a simular
+    - capacidad: Espacios del parqueadero
+    - interval: Segundos simulados entre la creación de cada vehículo
+    - seed: Semilla del generador aleatorio (reproducibilidad)
+    - on_event: Callback opcional on_event(tipo, vehicle_id, tiempo, espacio)
+    - entry_gates / exit_gates: gates.GateBank opcionales (None = sin barreras)
+    """
+    engine = DiscreteEventEngine(capacidad, seed=seed, on_event=on_event,
+                                 entry_gates=entry_gates, exit_gates=exit_gates)
+    engine.add_vehicles(vehicles, interval)
+    return engine.run()
+
+
+def print_summary(summary):
+    """Imprime el resumen de run_headless() en consola."""
+    print("=== Simulación headless (eventos discretos) ===")
+    for key, value in summary.items():
+        if key == "puertas":
+            continue
+        if isinstance(value, float):
+            print(f"{key:>24}: {value:.3f}")
+        else:
+            print(f"{key:>24}: {value}")
+    for gate in summary.get("puertas", ()):
+        print(f"{'puerta ' + gate['puerta']:>24}: utilización {gate['utilizacion']:.0%}, "
+              f"fila promedio {gate['fila_promedio']:.2f} (máx {gate['max_en_fila']}), "
+              f"espera promedio {gate['espera_promedio']:.2f} s, {gate['atendidos']} atendidos")
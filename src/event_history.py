@@ -0,0 +1,214 @@
+import struct
+from array import array
+from bisect import bisect_left
+from clock import WALL_CLOCK
+from events import EventKind, ParkingEvent, SIN_ESPACIO, format_event
+
+TEXTO = 255  # Tipo de las entradas de texto libre (avisos de la simulación)
+
+_ID = struct.Struct("<q")
+
+
+class EventHistory:
+    """
+    Historial en memoria de los últimos 'capacity' eventos (buffer circular).
+
+    Cada evento se guarda en columnas compactas (timestamp, tipo, vehículo,
+    espacio; ~21 bytes por evento) y se numera con una secuencia creciente;
+    al llenarse, los nuevos pisan a los más viejos. El texto solo existe para
+    los avisos y los detalles de error; el resto se formatea al mostrarlo.
+
+    Los vehículos y los tipos se guardan en bytearray para que find() busque
+    en C: filtrar un millón de eventos por vehículo o por tipo no recorre los
+    eventos en Python.
+    """
+
+    def __init__(self, capacity=1_000_000, clock=None):
+        """
+        Parámetros:
+        - capacity: Eventos que se conservan
+        - clock: Reloj que da el timestamp de los avisos de texto (None = tiempo real)
+        """
+        if capacity < 1:
+            raise ValueError("La capacidad del historial debe ser al menos 1")
+        self.capacity = capacity
+        self.clock = clock or WALL_CLOCK
+        self.clear()
+
+    def clear(self):
+        self.total = 0                # Eventos agregados desde clear() (= siguiente secuencia)
+        self.origin = self.clock.now()  # Los timestamps se muestran relativos a este instante
+        self._times = array("d")
+        self._slots = array("i")
+        self._kinds = bytearray()
+        self._ids = bytearray()       # vehicle_id en int64 little-endian, 8 bytes por evento
+        self._texts = {}              # posición -> texto (avisos y detalles de error)
+
+    # === AGREGAR ===
+
+    def append(self, event):
+        """Agrega un ParkingEvent o un aviso de texto."""
+        if not isinstance(event, ParkingEvent):
+            self.add_text(str(event))
+            return
+        self._put(event.timestamp, event.kind, event.vehicle_id, event.slot, event.detail)
+
+    def add_text(self, text, timestamp=None):
+        """Agrega un aviso de texto libre (sin vehículo)."""
+        self._put(self.clock.now() if timestamp is None else timestamp, TEXTO, -1, SIN_ESPACIO, text)
+
+    def _put(self, timestamp, kind, vehicle_id, slot, text):
+        pos = self.total % self.capacity
+        if self.total < self.capacity:
+            self._times.append(timestamp)
+            self._kinds.append(kind)
+            self._ids += _ID.pack(vehicle_id)
+            self._slots.append(slot)
+        else:
+            self._times[pos] = timestamp
+            self._kinds[pos] = kind
+            _ID.pack_into(self._ids, pos * 8, vehicle_id)
+            self._slots[pos] = slot
+            self._texts.pop(pos, None)
+        if text is not None:
+            self._texts[pos] = text
+        self.total += 1
+
+    # === LEER ===
+
+    @property
+    def oldest(self):
+        """Secuencia del evento más viejo que se conserva."""
+        return max(0, self.total - self.capacity)
+
+    def __len__(self):
+        return self.total - self.oldest
+
+    def get(self, seq):
+        """
+        Evento con secuencia 'seq'.
+
+        Retorna:
+        - ParkingEvent, o el texto si es un aviso
+        """
+        if not self.oldest <= seq < self.total:
+            raise IndexError(f"Secuencia {seq} fuera del historial")
+        pos = seq % self.capacity
+        kind = self._kinds[pos]
+        if kind == TEXTO:
+            return self._texts[pos]
+        return ParkingEvent(EventKind(kind), _ID.unpack_from(self._ids, pos * 8)[0],
+                            self._times[pos], self._slots[pos], self._texts.get(pos))
+
+    def format(self, seq):
+        """Línea del log: tiempo desde el inicio y texto del evento."""
+        pos = seq % self.capacity
+        elapsed = max(0.0, self._times[pos] - self.origin)
+        minutes, seconds = divmod(elapsed, 60)
+        hours, minutes = divmod(int(minutes), 60)
+        return f"[{hours:02d}:{minutes:02d}:{seconds:04.1f}] {format_event(self.get(seq))}"
+
+    # === BUSCAR ===
+
+    def _ranges(self, start, end):
+        """Tramos contiguos del buffer (posición inicial, final, secuencia inicial) de [start, end)."""
+        start = max(start, self.oldest)
+        while start < end:
+            pos = start % self.capacity
+            length = min(end - start, self.capacity - pos)
+            yield pos, pos + length, start
+            start += length
+
+    def find(self, vehicle_id=None, kind=None, start=0, end=None):
+        """
+        Secuencias de los eventos de un vehículo y/o un tipo, en orden.
+
+        Parámetros:
+        - vehicle_id: Número de vehículo (None = todos)
+        - kind: EventKind o TEXTO (None = todos)
+        - start, end: Rango de secuencias a revisar (por defecto todo el historial)
+
+        Retorna:
+        - array('q') de secuencias
+        """
+        end = self.total if end is None else min(end, self.total)
+        found = array("q")
+        if vehicle_id is None and kind is None:
+            found.extend(range(max(start, self.oldest), end))
+            return found
+        for lo, hi, seq in self._ranges(start, end):
+            if vehicle_id is not None:
+                # Buscar los 8 bytes del id; solo valen las coincidencias alineadas
+                pattern = _ID.pack(vehicle_id)
+                kinds = self._kinds
+                i = self._ids.find(pattern, lo * 8, hi * 8)
+                while i != -1:
+                    if i % 8 == 0:
+                        pos = i // 8
+                        if kind is None or kinds[pos] == kind:
+                            found.append(seq + pos - lo)
+                        i = self._ids.find(pattern, i + 8, hi * 8)
+                    else:
+                        i = self._ids.find(pattern, i + 1, hi * 8)
+            else:
+                needle = bytes((kind,))
+                find = self._kinds.find
+                i = find(needle, lo, hi)
+                while i != -1:
+                    found.append(seq + i - lo)
+                    i = find(needle, i + 1, hi)
+        return found
+
+
+class HistoryView:
+    """
+    Vista filtrada de un EventHistory que se actualiza incrementalmente.
+
+    refresh() solo revisa los eventos agregados desde la última vez y descarta
+    los que el buffer ya pisó; la vista se puede indexar como una lista
+    (posición 0 = el más viejo que coincide).
+    """
+
+    def __init__(self, history, vehicle_id=None, kind=None):
+        self.history = history
+        self.vehicle_id = vehicle_id
+        self.kind = kind
+        self._seqs = array("q")
+        self._first = 0     # Posición en _seqs del primer elemento vigente
+        self._scanned = 0   # Secuencias revisadas hasta aquí
+        self.refresh()
+
+    @property
+    def filtered(self):
+        return self.vehicle_id is not None or self.kind is not None
+
+    def refresh(self):
+        """Incorpora los eventos nuevos y descarta los que salieron del historial."""
+        history = self.history
+        if history.total < self._scanned:
+            # El historial se limpió: empezar de nuevo
+            self._seqs = array("q")
+            self._first = 0
+            self._scanned = 0
+        if not self.filtered:
+            self._scanned = history.total
+            return
+        if self._scanned < history.total:
+            self._seqs.extend(history.find(self.vehicle_id, self.kind, self._scanned))
+            self._scanned = history.total
+        self._first = bisect_left(self._seqs, history.oldest, self._first)
+        if self._first > 4096 and self._first > len(self._seqs) // 2:
+            # Compactar de vez en cuando en lugar de borrar al frente en cada refresco
+            del self._seqs[:self._first]
+            self._first = 0
+
+    def __len__(self):
+        if not self.filtered:
+            return len(self.history)
+        return len(self._seqs) - self._first
+
+    def seq(self, index):
+        """Secuencia del elemento 'index' de la vista."""
+        if not self.filtered:
+            return self.history.oldest + index
+        return self._seqs[self._first + index]
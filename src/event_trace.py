@@ -0,0 +1,176 @@
+import json
+import threading
+import time
+from events import EventKind, ParkingEvent
+from stats import SimulationStats
+
+# Formato de una traza (texto, una línea por evento):
+#   # traza v1 {"seed": 42, "capacidad": 5, ...}
+#   tiempo,tipo,vehículo,espacio
+#   ...
+#   # resumen {...}            (SimulationStats.snapshot() al cerrar, opcional)
+# 'tiempo' es el timestamp monotónico original, con repr() para no perder precisión:
+# así las estadísticas recalculadas desde la traza son idénticas bit a bit.
+_CABECERA = "# traza v1 "
+_RESUMEN = "# resumen "
+
+# Claves del resumen que no salen de los eventos (dependen de cuántos
+# vehículos se crearon, no de lo que pasó en el parqueadero)
+_NO_REPRODUCIBLES = ("vehiculos_creados", "vehiculos_vivos")
+
+
+class TraceRecorder:
+    """
+    Graba los eventos de una corrida en el orden exacto en que los procesó la
+    simulación, para reproducirla después (ver replay / replay_stats).
+
+    Se llama desde un solo hilo (el consumidor de la cola de eventos).
+    """
+
+    def __init__(self, filename, **meta):
+        """
+        Parámetros:
+        - filename: Archivo de la traza
+        - meta: Datos de la corrida guardados en la cabecera (seed, capacidad...)
+        """
+        self.filename = filename
+        self._file = open(filename, "w", encoding="utf-8")
+        self._file.write(_CABECERA + json.dumps(meta) + "\n")
+        self.count = 0
+
+    def record(self, event):
+        """Agrega un ParkingEvent (el texto libre no forma parte de la traza)."""
+        if not isinstance(event, ParkingEvent):
+            return
+        self._file.write(f"{event.timestamp!r},{int(event.kind)},"
+                         f"{event.vehicle_id},{event.slot}\n")
+        self.count += 1
+
+    def close(self, summary=None):
+        """
+        Cierra la traza.
+
+        Parámetros:
+        - summary: SimulationStats.snapshot() de la corrida, para poder
+          comprobar después que la reproducción da lo mismo
+        """
+        if self._file.closed:
+            return
+        if summary is not None:
+            self._file.write(_RESUMEN + json.dumps(summary) + "\n")
+        self._file.close()
+
+
+def load_trace(filename):
+    """
+    Lee una traza.
+
+    Retorna:
+    - (meta, lista de ParkingEvent con sus timestamps originales)
+      El resumen grabado, si hay, queda en meta["resumen"].
+    """
+    with open(filename, encoding="utf-8") as f:
+        header = f.readline()
+        if not header.startswith(_CABECERA):
+            raise ValueError(f"{filename} no es una traza (cabecera inválida)")
+        meta = json.loads(header[len(_CABECERA):])
+        events = []
+        for line in f:
+            if line.startswith(_RESUMEN):
+                meta["resumen"] = json.loads(line[len(_RESUMEN):])
+                continue
+            t, kind, vehicle_id, slot = line.rstrip("\n").split(",")
+            events.append(ParkingEvent(EventKind(int(kind)), int(vehicle_id), float(t), int(slot)))
+    return meta, events
+
+
+def trace_capacity(meta, events):
+    """
+    Espacios que necesita la reproducción de una traza: los de la cabecera
+    o, si la traza usa más (o no los dice), el mayor espacio de sus eventos.
+    No depende del parqueadero actual, que puede ser más chico.
+    """
+    return max([meta.get("capacidad") or 0] + [event.slot + 1 for event in events])
+
+
+def replay(events, sink, speed=None, stop_event=None, origin=None, clock=None):
+    """
+    Reproduce los eventos de una traza en el mismo orden.
+
+    Parámetros:
+    - sink: Callback sink(event) (p. ej. EventChannel.put)
+    - speed: None = lo más rápido posible; 10 = diez veces el tiempo real
+    - stop_event: threading.Event opcional para cortar la reproducción
+    - origin: Base de los timestamps reproducidos (por defecto la hora del
+      reloj al empezar); los intervalos entre eventos se conservan
+    - clock: clock.SimulationClock opcional: los intervalos se esperan en su
+      tiempo (velocidad, pausa y paso del reloj) y 'speed' no se usa
+
+    Retorna:
+    - Número de eventos reproducidos
+    """
+    if origin is None:
+        origin = time.monotonic() if clock is None else clock.now()
+    first = events[0].timestamp if events else 0.0
+    started = time.monotonic() if clock is None else clock.now()
+    count = 0
+    for event in events:
+        elapsed = event.timestamp - first
+        if clock is not None:
+            delay = started + elapsed - clock.now()
+            if delay > 0 and not clock.sleep(delay, stop_event):
+                break
+        elif speed is not None:
+            delay = started + elapsed / speed - time.monotonic()
+            if delay > 0:
+                if stop_event is not None:
+                    if stop_event.wait(delay):
+                        break
+                else:
+                    time.sleep(delay)
+        if stop_event is not None and stop_event.is_set():
+            break
+        sink(event._replace(timestamp=origin + elapsed))
+        count += 1
+    return count
+
+
+def replay_stats(filename):
+    """
+    Recalcula las estadísticas de una traza sin esperar (más rápido que tiempo real).
+
+    Retorna:
+    - (meta, dict de SimulationStats.snapshot(), lista de claves que no
+      coinciden con el resumen grabado)
+    """
+    meta, events = load_trace(filename)
+    stats = SimulationStats(trace_capacity(meta, events))
+    for event in events:
+        stats.record_event(event)
+    snapshot = stats.snapshot()
+
+    recorded = meta.get("resumen", {})
+    mismatches = [key for key, value in recorded.items()
+                  if key not in _NO_REPRODUCIBLES and snapshot.get(key) != value]
+    return meta, snapshot, mismatches
+
+
+class TraceReplayer(threading.Thread):
+    """
+    Hilo que reproduce una traza hacia la cola de eventos de la GUI, a
+    'speed' veces el tiempo real o al ritmo de 'clock' si se da.
+    """
+
+    def __init__(self, events, event_queue, stop_event, speed=1.0, clock=None):
+        super().__init__(name="TraceReplayer", daemon=True)
+        self.events = events
+        self.event_queue = event_queue
+        self.stop_event = stop_event
+        self.speed = speed
+        self.clock = clock
+        self.replayed = 0
+
+    def run(self):
+        self.replayed = replay(self.events, self.event_queue.put, self.speed, self.stop_event,
+                               clock=self.clock)
+        self.event_queue.put(f"⏹ Reproducción terminada: {self.replayed} eventos")
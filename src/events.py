@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import NamedTuple, Optional
+
+
+class EventKind(IntEnum):
+    """Tipos de evento del ciclo de vida de un vehículo."""
+    LLEGADA = 0     # Terminó su espera inicial y pide entrar
+    INGRESO = 1     # Ocupó un espacio
+    SALIDA = 2      # Liberó su espacio
+    ESPERANDO = 3   # Encontró el parqueadero lleno y hace fila
+    ERROR = 4       # Falla inesperada en el hilo del vehículo
+    RECHAZADO = 5   # Se fue sin estacionar (simulación detenida mientras hacía fila)
+
+
+SIN_ESPACIO = -1  # Valor de 'slot' cuando el evento no tiene espacio asociado
+
+
+class ParkingEvent(NamedTuple):
+    """
+    Evento estructurado que viaja de los vehículos a la GUI, el log y las
+    estadísticas. Es una tupla compacta: no se construye ni se analiza texto
+    en el camino crítico; solo format_event() lo convierte en frase al mostrarlo.
+    """
+    kind: EventKind
+    vehicle_id: int
+    timestamp: float            # time.monotonic() (o tiempo simulado) del momento del evento
+    slot: int = SIN_ESPACIO     # Índice del espacio (0..capacidad-1)
+    detail: Optional[str] = None  # Solo para ERROR: mensaje de la excepción
+
+    @classmethod
+    def now(cls, kind, vehicle_id, slot=SIN_ESPACIO, detail=None, clock=None):
+        """Crea un evento con el timestamp actual (monotónico, o el de 'clock')."""
+        return cls(kind, vehicle_id, time.monotonic() if clock is None else clock.now(),
+                   slot, detail)
+
+
+def vehicle_name(vehicle_id):
+    """Nombre visible de un vehículo (igual al nombre de su thread)."""
+    return f"Vehículo-{vehicle_id}"
+
+
+_TEXTOS = {
+    EventKind.LLEGADA: "{name} llegó al parqueadero.",
+    EventKind.INGRESO: "{name} ingresó al parqueadero.",
+    EventKind.SALIDA: "{name} salió del parqueadero.",
+    EventKind.ESPERANDO: "{name} esperando espacio...",
+    EventKind.ERROR: "Error en {name}: {detail}",
+    EventKind.RECHAZADO: "{name} se fue sin estacionar.",
+}
+
+
+def format_event(event):
+    """
+    Convierte un evento en el texto que se muestra al usuario.
+    Los mensajes que ya son texto (avisos de la simulación) se devuelven igual.
+    """
+    if not isinstance(event, ParkingEvent):
+        return str(event)
+    text = _TEXTOS[event.kind].format(name=vehicle_name(event.vehicle_id), detail=event.detail)
+    if event.slot != SIN_ESPACIO and event.kind in (EventKind.INGRESO, EventKind.SALIDA):
+        text = f"{text[:-1]} (espacio #{event.slot + 1})."
+    return text
+
+
+# Políticas de desborde de EventChannel
+BLOQUEAR = "bloquear"                    # El productor espera a que haya lugar
+DESCARTAR_NUEVO = "descartar_nuevo"      # Se pierde el evento que llega
+DESCARTAR_ANTIGUO = "descartar_antiguo"  # Se pierde el evento más viejo de la cola
+POLITICAS = (BLOQUEAR, DESCARTAR_NUEVO, DESCARTAR_ANTIGUO)
+
+
+class EventChannel:
+    """
+    Cola acotada de eventos entre los vehículos y la GUI.
+
+    Reemplaza a queue.Queue (sin límite): si la GUI se atrasa, la cola no
+    crece sin fin sino que aplica la política de desborde configurada.
+    El consumidor saca eventos por lotes con drain(), tomando el lock una
+    sola vez por lote en lugar de una vez por evento.
+    """
+
+    def __init__(self, maxsize=10000, policy=BLOQUEAR):
+        if policy not in POLITICAS:
+            raise ValueError(f"Política de desborde desconocida: {policy} (use {', '.join(POLITICAS)})")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self.dropped = 0       # Eventos perdidos por desborde
+        self.max_depth = 0     # Mayor tamaño alcanzado por la cola
+        self.closed = False    # Ver close()
+
+    def put(self, event, timeout=None):
+        """
+        Publica un evento aplicando la política de desborde.
+
+        Retorna:
+        - True si el evento quedó en la cola
+        - False si se descartó (o se cumplió el timeout esperando lugar)
+        """
+        with self._lock:
+            if self.closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.policy == DESCARTAR_NUEVO:
+                    self.dropped += 1
+                    return False
+                if self.policy == DESCARTAR_ANTIGUO:
+                    self._items.popleft()
+                    self.dropped += 1
+                elif (not self._not_full.wait_for(
+                        lambda: self.closed or len(self._items) < self.maxsize, timeout)
+                      or self.closed):
+                    self.dropped += 1
+                    return False
+            self._items.append(event)
+            if len(self._items) > self.max_depth:
+                self.max_depth = len(self._items)
+            return True
+
+    def put_nowait(self, event):
+        """Igual que put() pero sin esperar lugar (compatible con asyncio.Queue)."""
+        return self.put(event, timeout=0)
+
+    def drain(self, max_items):
+        """Saca hasta 'max_items' eventos de una sola vez, en orden de llegada."""
+        with self._lock:
+            count = min(max_items, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            if count and self.policy == BLOQUEAR:
+                self._not_full.notify(count)
+            return batch
+
+    def peek(self):
+        """El evento más antiguo sin sacarlo (None si la cola está vacía)."""
+        with self._lock:
+            return self._items[0] if self._items else None
+
+    def qsize(self):
+        return len(self._items)
+
+    def empty(self):
+        return not self._items
+
+    def clear(self):
+        """Descarta todos los eventos pendientes (p. ej. al reiniciar)."""
+        with self._lock:
+            self._items.clear()
+            self._not_full.notify_all()
+
+    def close(self):
+        """
+        Desacopla el canal de su consumidor: saca lo pendiente y desde
+        ahora put() devuelve False sin esperar. Al reiniciar, los vehículos
+        de la corrida anterior que todavía publican no se bloquean ni
+        mezclan sus eventos con los de la nueva.
+
+        Retorna:
+        - Los eventos que quedaban sin procesar, en orden de llegada
+        """
+        with self._lock:
+            self.closed = True
+            pending = list(self._items)
+            self._items.clear()
+            self._not_full.notify_all()
+            return pending
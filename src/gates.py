@@ -0,0 +1,261 @@
+import itertools
+import threading
+from collections import deque
+from traffic import ESTADIAS
+
+
+class _Turn:
+    """Un vehículo (hilo) en la fila de una puerta."""
+    __slots__ = ("event", "granted")
+
+    def __init__(self):
+        self.event = threading.Event()  # Se activa al llegarle el turno o al cancelar
+        self.granted = False
+
+
+class Gate:
+    """
+    Una barrera de entrada o de salida: atiende un vehículo a la vez y los
+    demás esperan en su fila FIFO.
+
+    Lleva sus propias métricas: vehículos atendidos, tiempo ocupada
+    (utilización), espera en la fila y largo de la fila promediado en el tiempo.
+
+    Solo guarda el estado; quién la usa decide cómo pasa el tiempo:
+    GateBank.pass_through() con hilos que duermen el tiempo de servicio y
+    DiscreteEventEngine con eventos. Los métodos reciben el instante 'now'.
+    """
+
+    def __init__(self, name, service, now=0.0):
+        """
+        Parámetros:
+        - name: Nombre para las métricas ("E1", "S2"...)
+        - service: Distribución del tiempo de servicio (sample(rng, n), como las de traffic.py)
+        - now: Instante desde el que se mide la utilización
+        """
+        self.name = name
+        self.service = service
+        self.queue = deque()     # (vehículo, desde cuándo espera)
+        self.busy = False
+        self._busy_since = now
+        self._opened = now
+
+        self.served = 0
+        self.started = 0         # Vehículos que empezaron a ser atendidos
+        self.busy_time = 0.0
+        self.total_wait = 0.0
+        self.max_queue = 0
+        self._queue_area = 0.0   # Integral del largo de la fila en el tiempo
+        self._last_change = now
+
+    def load(self):
+        """Vehículos en la puerta (en servicio + en fila)."""
+        return len(self.queue) + self.busy
+
+    def _mark(self, now):
+        self._queue_area += len(self.queue) * (now - self._last_change)
+        self._last_change = now
+
+    def arrive(self, vehicle, now):
+        """
+        Un vehículo llega a la puerta.
+
+        Retorna:
+        - True si la puerta estaba libre y empieza a atenderlo
+        - False si queda en la fila
+        """
+        if not self.busy:
+            self.busy = True
+            self._busy_since = now
+            self.started += 1
+            return True
+        self._mark(now)
+        self.queue.append((vehicle, now))
+        if len(self.queue) > self.max_queue:
+            self.max_queue = len(self.queue)
+        return False
+
+    def finish(self, now):
+        """
+        Termina de atender al vehículo actual.
+
+        Retorna:
+        - El siguiente vehículo de la fila (ya en servicio), o None si no hay fila
+        """
+        self.served += 1
+        if not self.queue:
+            self.busy = False
+            self.busy_time += now - self._busy_since
+            return None
+        self._mark(now)
+        vehicle, since = self.queue.popleft()
+        self.total_wait += now - since
+        self.started += 1
+        return vehicle
+
+    def clear(self, now):
+        """Vacía la fila (simulación detenida). Retorna los vehículos que esperaban."""
+        self._mark(now)
+        waiting = [vehicle for vehicle, _ in self.queue]
+        self.queue.clear()
+        return waiting
+
+    def stats(self, now):
+        """
+        Métricas de la puerta hasta 'now'.
+
+        Retorna:
+        - dict con atendidos, utilización, fila actual/máxima/promedio y espera promedio
+        """
+        elapsed = now - self._opened
+        busy = self.busy_time + (now - self._busy_since if self.busy else 0.0)
+        area = self._queue_area + len(self.queue) * (now - self._last_change)
+        return {
+            "puerta": self.name,
+            "atendidos": self.served,
+            "utilizacion": busy / elapsed if elapsed > 0 else 0.0,
+            "en_fila": len(self.queue),
+            "max_en_fila": self.max_queue,
+            "fila_promedio": area / elapsed if elapsed > 0 else 0.0,
+            "espera_promedio": self.total_wait / self.started if self.started else 0.0,
+        }
+
+
+# === ESTRATEGIAS DE ELECCIÓN DE PUERTA ===
+
+class ShortestQueue:
+    """La puerta con menos vehículos (en servicio + en fila); en un empate, la primera."""
+
+    def choose(self, gates):
+        return min(gates, key=Gate.load)
+
+
+class RoundRobin:
+    """Las puertas por turno, sin mirar las filas."""
+
+    def __init__(self):
+        self._turn = itertools.count()
+
+    def choose(self, gates):
+        return gates[next(self._turn) % len(gates)]
+
+
+ESTRATEGIAS = {
+    "cola_corta": ShortestQueue,
+    "turno": RoundRobin,
+}
+
+
+def service_time(distribution, mean):
+    """
+    Distribución del tiempo de servicio de una puerta con media 'mean' segundos.
+
+    Parámetros:
+    - distribution: "uniforme" (entre 0.5 y 1.5 veces la media), "exponencial" o "lognormal"
+    """
+    if distribution == "uniforme":
+        return ESTADIAS["uniforme"](mean * 0.5, mean * 1.5)
+    return ESTADIAS[distribution](mean)
+
+
+class GateBank:
+    """
+    Un conjunto de puertas (las de entrada o las de salida de un parqueadero)
+    y la estrategia con que cada vehículo elige una.
+
+    Con hilos, pass_through() hace que el vehículo espere su turno en la
+    puerta elegida y duerma su tiempo de servicio: la fila se atiende en
+    orden y al terminar se despierta solo al siguiente (igual que la fila
+    de ParkingLot, y como ella se cancela con cancel_waiting()). Un solo
+    lock protege todas las puertas del conjunto.
+    """
+
+    def __init__(self, gates, strategy=None):
+        """
+        Parámetros:
+        - gates: Lista de Gate
+        - strategy: Objeto con choose(gates) (None = ShortestQueue)
+        """
+        if not gates:
+            raise ValueError("Se necesita al menos una puerta")
+        self.gates = list(gates)
+        self.strategy = strategy or ShortestQueue()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def build(cls, prefix, count, service, strategy="cola_corta", now=0.0):
+        """
+        'count' puertas iguales ("E1", "E2"... con prefix="E").
+
+        Parámetros:
+        - service: Distribución del tiempo de servicio (ver service_time())
+        - strategy: Nombre de ESTRATEGIAS
+        """
+        gates = [Gate(f"{prefix}{k + 1}", service, now) for k in range(count)]
+        return cls(gates, ESTRATEGIAS[strategy]())
+
+    def choose(self):
+        """Puerta para el próximo vehículo según la estrategia."""
+        return self.strategy.choose(self.gates)
+
+    def pass_through(self, rng, clock, stop_event=None):
+        """
+        Un vehículo (hilo) cruza una puerta: fila, servicio y salida.
+
+        Parámetros:
+        - rng: Generador aleatorio del vehículo (tiempo de servicio)
+        - clock: Reloj en que se mide y se duerme
+
+        Retorna:
+        - True si cruzó
+        - False si la simulación se detuvo antes
+        """
+        turn = _Turn()
+        with self.lock:
+            if stop_event is not None and stop_event.is_set():
+                return False
+            gate = self.choose()
+            turn.granted = gate.arrive(turn, clock.now())
+        if not turn.granted:
+            clock.wait_event(turn.event)
+            if not turn.granted:
+                return False  # cancel_waiting(): simulación detenida
+        completed = clock.sleep(gate.service.sample(rng, 1)[0], stop_event)
+        with self.lock:
+            following = gate.finish(clock.now())
+            if following is not None:
+                following.granted = True
+        if following is not None:
+            following.event.set()
+        return completed
+
+    def cancel_waiting(self, now):
+        """Despierta a todos los vehículos en las filas sin atenderlos."""
+        with self.lock:
+            waiting = [turn for gate in self.gates for turn in gate.clear(now)]
+        for turn in waiting:
+            turn.event.set()
+
+    def stats(self, now):
+        """Métricas de cada puerta (lista de dicts de Gate.stats)."""
+        with self.lock:
+            return [gate.stats(now) for gate in self.gates]
+
+
+def build_gates(config, now=0.0):
+    """
+    Barreras de entrada y de salida según la configuración (PUERTAS_*, PUERTA_*).
+
+    Parámetros:
+    - config: settings.Settings (o el módulo config)
+    - now: Instante desde el que se mide la utilización
+
+    Retorna:
+    - (GateBank de entrada, GateBank de salida); None donde hay 0 puertas
+    """
+    banks = []
+    for prefix, count, mean in (("E", config.PUERTAS_ENTRADA, config.PUERTA_SERVICIO_ENTRADA),
+                                ("S", config.PUERTAS_SALIDA, config.PUERTA_SERVICIO_SALIDA)):
+        banks.append(GateBank.build(prefix, count, service_time(config.PUERTA_DISTRIBUCION, mean),
+                                    config.PUERTA_ESTRATEGIA, now) if count else None)
+    return tuple(banks)
@@ -1,5 +1,9 @@
+import math
 import tkinter as tk
 from tkinter import ttk, font
+from event_history import EventHistory, HistoryView, TEXTO
+from events import EventKind
+from slots import ABREVIATURAS, OCUPADO
 
 class ParkingLotGUI:
     """
@@ -22,10 +26,40 @@ class ParkingLotGUI:
     COLOR_TEXT_LIGHT = "#FFFFFF"     # Texto claro
     COLOR_BORDER = "#BDC3C7"         # Bordes sutiles
 
-    def __init__(self, root, start_callback, add_vehicle_callback, stop_callback, reset_callback):
+    # === VISTA DEL PARQUEADERO ===
+    CANVAS_WIDTH = 950     # Ancho fijo del canvas (1000 - 2*20 padding - 10)
+    CANVAS_HEIGHT = 180    # Alto fijo del canvas
+    TILE_MAX = 140         # Paso (px) de un espacio con zoom máximo (dibujo completo)
+    TILE_DETALLE = 56      # Desde este paso se dibujan número, ubicación y estado
+    TILE_GRILLA = 16       # Desde este paso, cuadros; por debajo, mapa de calor
+    TILE_MIN = 1           # Un pixel por espacio
+
+    # === LOG DE EVENTOS ===
+    LOG_FILAS = 6          # Filas visibles (las únicas que existen en el Listbox)
+    LOG_TIPOS = {          # Opciones del filtro por tipo de evento
+        "Todos": None,
+        "Llegada": EventKind.LLEGADA,
+        "Ingreso": EventKind.INGRESO,
+        "Salida": EventKind.SALIDA,
+        "Esperando": EventKind.ESPERANDO,
+        "Rechazado": EventKind.RECHAZADO,
+        "Error": EventKind.ERROR,
+        "Avisos": TEXTO,
+    }
+
+    def __init__(self, root, start_callback, add_vehicle_callback, stop_callback, reset_callback,
+                 speed_callback=None, pause_callback=None, step_callback=None, speeds=(1, 10, 100, 1000),
+                 history=None):
+        """
+        Parámetros:
+        - speed_callback(velocidad), pause_callback(), step_callback(): Controles
+          del reloj de la simulación (si no se dan, no se muestran)
+        - speeds: Multiplicadores ofrecidos en los botones de velocidad
+        - history: EventHistory que muestra el log (None = uno propio)
+        """
         self.root = root
         self.root.title("🚗 Simulador de Parqueadero Inteligente - OS Concepts Demo")
-        self.root.geometry("1000x800")  # Aumentado para mostrar todos los botones
+        self.root.geometry("1000x850")  # Aumentado para mostrar todos los botones
         self.root.configure(bg=self.COLOR_BG)
 
         # Configurar fuentes personalizadas
@@ -35,6 +69,9 @@ class ParkingLotGUI:
         self.font_small = font.Font(family="Segoe UI", size=9)
         self.font_stats = font.Font(family="Segoe UI", size=14, weight="bold")
 
+        # Historial de eventos que muestra el log (buffer circular)
+        self.history = history if history is not None else EventHistory()
+
         # === HEADER  ===
         self._create_header()
 
@@ -51,6 +88,11 @@ class ParkingLotGUI:
         self._create_control_buttons(start_callback, add_vehicle_callback,
                                      stop_callback, reset_callback)
 
+        # === RELOJ (velocidad, pausa, paso) ===
+        self.clock_label = None
+        if speed_callback is not None:
+            self._create_clock_controls(speed_callback, pause_callback, step_callback, speeds)
+
         # === BARRA DE ESTADO ===
         self._create_status_bar()
 
@@ -134,6 +176,28 @@ class ParkingLotGUI:
             2
         )
 
+        # Línea de métricas: percentiles, ocupación y throughput
+        self.metrics_label = tk.Label(
+            stats_container,
+            text="",
+            font=self.font_small,
+            bg=self.COLOR_BG,
+            fg=self.COLOR_TEXT_DARK,
+            anchor="w"
+        )
+        self.metrics_label.pack(fill=tk.X, pady=(8, 0))
+
+        # Línea de barreras: utilización y fila de cada puerta (vacía si no hay)
+        self.gates_label = tk.Label(
+            stats_container,
+            text="",
+            font=self.font_small,
+            bg=self.COLOR_BG,
+            fg=self.COLOR_TEXT_DARK,
+            anchor="w"
+        )
+        self.gates_label.pack(fill=tk.X)
+
     def _create_stat_card(self, parent, title, value, color, column):
         """
         Crea una tarjeta individual de estadística.
@@ -209,38 +273,85 @@ class ParkingLotGUI:
             canvas_frame,
             bg="#34495E",  # Fondo tipo asfalto oscuro
             highlightthickness=0,
-            height=180,  # Altura fija para el canvas
-            width=950    # Ancho fijo para el canvas (1000 - 2*20 padding - 10)
+            height=self.CANVAS_HEIGHT,
+            width=self.CANVAS_WIDTH,
+            cursor="fleur"
         )
         self.canvas.pack(padx=5, pady=5)
-        self.spaces = []
+
+        # Estado de la vista virtualizada
+        self._slots = []
+        self._states = bytearray()
+        self._tiles = {}             # índice -> (rect, texto de estado) de los espacios visibles
+        self._heatmap = None         # PhotoImage del modo mapa de calor (ya ampliada)
+        self._heat_base = None       # Un pixel por espacio; se mantiene al día con el conjunto sucio
+        self._heatmap_item = None
+        self._cols = self._rows = 1
+        self._pitch = self.TILE_MAX  # Paso de la grilla en px (zoom)
+        self._view_x = self._view_y = 0
+        self._drag = None
+        self._redraw_pending = None
+
+        # Zoom con la rueda (Windows/macOS: <MouseWheel>, X11: botones 4/5)
+        # y paneo arrastrando
+        self.canvas.bind("<MouseWheel>", self._on_zoom)
+        self.canvas.bind("<Button-4>", self._on_zoom)
+        self.canvas.bind("<Button-5>", self._on_zoom)
+        self.canvas.bind("<ButtonPress-1>", self._on_pan_start)
+        self.canvas.bind("<B1-Motion>", self._on_pan_move)
 
     def _create_event_log(self):
         """
-        Crea el área de log de eventos con scroll.
+        Crea el área de log de eventos: una vista virtual del historial.
+
+        El Listbox solo tiene las LOG_FILAS filas visibles; la scrollbar y la
+        rueda del mouse mueven una ventana sobre el historial (o sobre el
+        resultado del filtro), así que el costo no depende de cuántos eventos
+        lleguen ni de cuántos se guarden.
         """
         # Contenedor
         log_container = tk.Frame(self.root, bg=self.COLOR_BG, height=150)
         log_container.pack(pady=10, padx=20, fill=tk.X)
         log_container.pack_propagate(False)  # Mantener altura fija
 
-        # Título
+        # Título + filtros (vehículo y tipo de evento)
+        header = tk.Frame(log_container, bg=self.COLOR_BG)
+        header.pack(fill=tk.X, pady=(0, 10))
+
         section_title = tk.Label(
-            log_container,
+            header,
             text="Registro de Eventos",
             font=self.font_header,
             bg=self.COLOR_BG,
             fg=self.COLOR_TEXT_DARK
         )
-        section_title.pack(anchor="w", pady=(0, 10))
+        section_title.pack(side=tk.LEFT)
+
+        self.log_count_label = tk.Label(header, text="", font=self.font_small,
+                                        bg=self.COLOR_BG, fg=self.COLOR_TEXT_DARK)
+        self.log_count_label.pack(side=tk.RIGHT)
+
+        self.log_kind_var = tk.StringVar(value="Todos")
+        kind_box = ttk.Combobox(header, textvariable=self.log_kind_var, values=list(self.LOG_TIPOS),
+                                state="readonly", width=11, font=self.font_small)
+        kind_box.pack(side=tk.RIGHT, padx=(6, 12))
+        kind_box.bind("<<ComboboxSelected>>", lambda e: self._apply_log_filter())
+
+        self.log_vehicle_var = tk.StringVar()
+        vehicle_entry = tk.Entry(header, textvariable=self.log_vehicle_var, width=8,
+                                 font=self.font_small, relief=tk.FLAT)
+        vehicle_entry.pack(side=tk.RIGHT)
+        vehicle_entry.bind("<KeyRelease>", lambda e: self._schedule_log_filter())
+        tk.Label(header, text="Vehículo:", font=self.font_small,
+                 bg=self.COLOR_BG, fg=self.COLOR_TEXT_DARK).pack(side=tk.RIGHT, padx=(0, 4))
 
         # Frame para listbox + scrollbar
         log_frame = tk.Frame(log_container, bg=self.COLOR_CARD)
         log_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 0))
 
-        # Scrollbar
-        scrollbar = tk.Scrollbar(log_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Scrollbar de la vista virtual (no la del Listbox)
+        self.log_scrollbar = tk.Scrollbar(log_frame, command=self._on_log_scroll)
+        self.log_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         # Listbox estilo consola
         self.log_box = tk.Listbox(
@@ -250,13 +361,23 @@ class ParkingLotGUI:
             fg="#ECF0F1",           # Texto claro
             selectbackground="#34495E",
             selectforeground="#FFFFFF",
-            yscrollcommand=scrollbar.set,
-            height=6,  # Reducido de 8 a 6 líneas
+            height=self.LOG_FILAS,
             borderwidth=0,
             highlightthickness=0
         )
         self.log_box.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.log_box.yview)
+        self.log_box.bind("<MouseWheel>", self._on_log_wheel)
+        self.log_box.bind("<Button-4>", self._on_log_wheel)
+        self.log_box.bind("<Button-5>", self._on_log_wheel)
+
+        # Estado de la vista virtual
+        self._log_view = HistoryView(self.history)
+        self._log_top = 0            # Posición en la vista de la primera fila visible
+        self._log_follow = True      # Pegado al final: seguir los eventos nuevos
+        self._log_shown = None       # (primera secuencia, filas) dibujadas en el Listbox
+        self._log_scroll_shown = None
+        self._log_refresh_pending = None
+        self._log_filter_pending = None
 
     def _create_control_buttons(self, start_cb, add_cb, stop_cb, reset_cb):
         """
@@ -355,6 +476,71 @@ class ParkingLotGUI:
         self._add_button_hover_effect(btn_stop, self.COLOR_WARNING, "#DC7633")
         self._add_button_hover_effect(btn_reset, self.COLOR_DANGER, "#C0392B")
 
+    def _create_clock_controls(self, speed_cb, pause_cb, step_cb, speeds):
+        """
+        Controles del reloj: velocidad (botones exclusivos), pausa/reanudar,
+        avanzar un paso y el tiempo simulado transcurrido.
+        """
+        clock_frame = tk.Frame(self.root, bg=self.COLOR_BG)
+        clock_frame.pack(pady=(0, 10), padx=20)
+
+        tk.Label(clock_frame, text="Velocidad:", font=self.font_body,
+                 bg=self.COLOR_BG, fg=self.COLOR_TEXT_DARK).grid(row=0, column=0, padx=(0, 6))
+
+        self.speed_var = tk.DoubleVar(value=speeds[0])
+        for column, speed in enumerate(speeds, start=1):
+            tk.Radiobutton(
+                clock_frame,
+                text=f"x{speed:g}",
+                variable=self.speed_var,
+                value=speed,
+                command=lambda: speed_cb(self.speed_var.get()),
+                indicatoron=False,
+                font=self.font_small,
+                bg=self.COLOR_CARD,
+                selectcolor=self.COLOR_ACCENT,
+                relief=tk.FLAT,
+                padx=10,
+                pady=4,
+                cursor="hand2",
+                borderwidth=0
+            ).grid(row=0, column=column, padx=2)
+
+        column = len(speeds) + 1
+        self.pause_button = tk.Button(
+            clock_frame,
+            text="⏯ Pausar",
+            command=pause_cb,
+            font=self.font_small,
+            bg=self.COLOR_SECONDARY,
+            fg=self.COLOR_TEXT_LIGHT,
+            relief=tk.FLAT,
+            padx=10,
+            pady=4,
+            cursor="hand2",
+            borderwidth=0
+        )
+        self.pause_button.grid(row=0, column=column, padx=(12, 2))
+
+        btn_step = tk.Button(
+            clock_frame,
+            text="⏭ Paso",
+            command=step_cb,
+            font=self.font_small,
+            bg=self.COLOR_SECONDARY,
+            fg=self.COLOR_TEXT_LIGHT,
+            relief=tk.FLAT,
+            padx=10,
+            pady=4,
+            cursor="hand2",
+            borderwidth=0
+        )
+        btn_step.grid(row=0, column=column + 1, padx=2)
+
+        self.clock_label = tk.Label(clock_frame, text="", font=self.font_small,
+                                    bg=self.COLOR_BG, fg=self.COLOR_TEXT_DARK)
+        self.clock_label.grid(row=0, column=column + 2, padx=(12, 0))
+
     def _add_button_hover_effect(self, button, normal_color, hover_color):
         """
         Agrega efecto hover a los botones (cambio de color al pasar el mouse).
@@ -378,105 +564,364 @@ class ParkingLotGUI:
             anchor="w",
             padx=10
         )
-        self.status_label.pack(fill=tk.X)
+        self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-    def init_spaces(self, capacidad):
+        # Retraso de la cola de eventos (backpressure)
+        self.lag_label = tk.Label(
+            status_bar,
+            text="",
+            font=self.font_small,
+            bg=self.COLOR_SECONDARY,
+            fg=self.COLOR_TEXT_LIGHT,
+            anchor="e",
+            padx=10
+        )
+        self.lag_label.pack(side=tk.RIGHT)
+
+    def init_spaces(self, slots):
         """
-        Dibuja los espacios de parqueo con estilo mejorado.
+        Prepara la vista del parqueadero para un nuevo conjunto de espacios.
+
+        La vista está virtualizada: solo se dibujan los espacios visibles y el
+        zoom inicial muestra todo el parqueadero (5 o 10.000 espacios).
+
+        Parámetros:
+        - slots: Lista de slots.Slot del parqueadero (nivel, zona, tipo)
         """
+        self._slots = list(slots)
+        self._states = bytearray(len(self._slots))  # Último estado dibujado (todo LIBRE)
+        self._heat_base = None
+
+        # Columnas de la grilla: una sola fila si cabe a tamaño completo;
+        # si no, una grilla con la proporción del canvas
+        n = max(1, len(self._slots))
+        if n * self.TILE_MAX <= self.CANVAS_WIDTH:
+            self._cols = n
+        else:
+            self._cols = max(1, math.ceil(math.sqrt(n * self.CANVAS_WIDTH / self.CANVAS_HEIGHT)))
+        self._rows = math.ceil(n / self._cols)
+
+        # Zoom para ver todo el parqueadero
+        fit = min(self.CANVAS_WIDTH // self._cols, self.CANVAS_HEIGHT // self._rows)
+        self._pitch = max(self.TILE_MIN, min(self.TILE_MAX, fit))
+        self._view_x = 0
+        self._view_y = 0
+        self._redraw()
+
+    # === VISTA VIRTUALIZADA ===
+
+    def _mode(self):
+        """Modo de dibujo según el zoom: detalle, grilla o mapa de calor."""
+        if self._pitch >= self.TILE_DETALLE:
+            return "detalle"
+        if self._pitch >= self.TILE_GRILLA:
+            return "grilla"
+        return "mapa"
+
+    def _origin(self):
+        """Posición en el canvas de la esquina superior izquierda de la grilla."""
+        world_w = self._cols * self._pitch
+        world_h = self._rows * self._pitch
+        # Centrar si la grilla es más chica que el canvas; si no, aplicar el paneo
+        x = (self.CANVAS_WIDTH - world_w) // 2 if world_w <= self.CANVAS_WIDTH else -self._view_x
+        y = (self.CANVAS_HEIGHT - world_h) // 2 if world_h <= self.CANVAS_HEIGHT else -self._view_y
+        return x, y
+
+    def _clamp_view(self):
+        """Mantiene el paneo dentro de la grilla."""
+        max_x = max(0, self._cols * self._pitch - self.CANVAS_WIDTH)
+        max_y = max(0, self._rows * self._pitch - self.CANVAS_HEIGHT)
+        self._view_x = min(max(0, self._view_x), max_x)
+        self._view_y = min(max(0, self._view_y), max_y)
+
+    def _schedule_redraw(self):
+        """Junta varios eventos de zoom/paneo en un solo redibujo."""
+        if self._redraw_pending is None:
+            self._redraw_pending = self.root.after_idle(self._redraw)
+
+    def _redraw(self):
+        """Redibuja solo los espacios que caen dentro del canvas."""
+        self._redraw_pending = None
         self.canvas.delete("all")
-        self.spaces.clear()
-
-        # Calcular posiciones centradas
-        # Canvas tiene ancho fijo de 950px
-        canvas_width = 950
-        total_width = capacidad * 140
-        start_x = (canvas_width - total_width) // 2
-        start_y = 20  # Más arriba para aprovechar el espacio
-
-        for i in range(capacidad):
-            x0 = start_x + i * 140 + 20
-            y0 = start_y
-
-            shadow = self.canvas.create_rectangle(
-                x0 + 4, y0 + 4, x0 + 114, y0 + 124,
-                fill="#2C3E50", outline=""
-            )
-
-            # Rectángulo principal del espacio
-            rect = self.canvas.create_rectangle(
-                x0, y0, x0 + 110, y0 + 120,
-                fill=self.COLOR_SUCCESS,  # Verde para LIBRE
-                outline="#1E8449",
-                width=3
-            )
-
-            # Líneas de parqueo (decorativas)
-            self.canvas.create_line(
-                x0 + 10, y0, x0 + 10, y0 + 120,
-                fill="#7F8C8D", width=2, dash=(5, 5)
-            )
-            self.canvas.create_line(
-                x0 + 100, y0, x0 + 100, y0 + 120,
-                fill="#7F8C8D", width=2, dash=(5, 5)
-            )
-
-            # Número del espacio
-            text = self.canvas.create_text(
-                x0 + 55, y0 + 60,
-                text=f"#{i+1}",
-                font=("Segoe UI", 20, "bold"),
-                fill=self.COLOR_TEXT_LIGHT  # Blanco para mejor contraste
-            )
-
-            # Etiqueta "LIBRE"
-            status_text = self.canvas.create_text(
-                x0 + 55, y0 + 90,
-                text="LIBRE",
-                font=("Segoe UI", 10, "bold"),
-                fill=self.COLOR_TEXT_LIGHT  # Blanco sobre verde
-            )
-
-            self.spaces.append((rect, text, status_text))
-
-    def update_spaces(self, ocupados, capacidad):
-        """
-        Actualiza visualmente los espacios ocupados con animación de color.
-        """
-        for i, space_tuple in enumerate(self.spaces):
-            rect = space_tuple[0]
-            number_text = space_tuple[1]
-            status_text = space_tuple[2] if len(space_tuple) > 2 else None
-
-            if i < ocupados:
-                # Espacio OCUPADO - rojo (como semáforo en rojo = detenerse)
-                self.canvas.itemconfig(rect, fill=self.COLOR_DANGER, outline="#C0392B", width=3)
-                if status_text:
-                    self.canvas.itemconfig(status_text, text="OCUPADO", fill=self.COLOR_TEXT_LIGHT)
-                if number_text:
-                    self.canvas.itemconfig(number_text, fill=self.COLOR_TEXT_LIGHT)
-            else:
-                # Espacio LIBRE - verde (como semáforo en verde = puede pasar)
-                self.canvas.itemconfig(rect, fill=self.COLOR_SUCCESS, outline="#1E8449", width=3)
-                if status_text:
-                    self.canvas.itemconfig(status_text, text="LIBRE", fill=self.COLOR_TEXT_LIGHT)
-                if number_text:
-                    self.canvas.itemconfig(number_text, fill=self.COLOR_TEXT_LIGHT)
+        self._tiles.clear()
+        self._heatmap = None
+        if not self._slots:
+            return
+
+        self._clamp_view()
+        pitch = self._pitch
+        ox, oy = self._origin()
+
+        if self._mode() == "mapa":
+            self._draw_heatmap(ox, oy)
+            return
+
+        # Rango de filas/columnas visibles
+        c0 = max(0, -ox // pitch)
+        c1 = min(self._cols, (self.CANVAS_WIDTH - ox) // pitch + 1)
+        r0 = max(0, -oy // pitch)
+        r1 = min(self._rows, (self.CANVAS_HEIGHT - oy) // pitch + 1)
+        draw = self._draw_detail_tile if self._mode() == "detalle" else self._draw_grid_tile
+        n = len(self._slots)
+        for row in range(r0, r1):
+            base = row * self._cols
+            for col in range(c0, c1):
+                i = base + col
+                if i >= n:
+                    break
+                self._tiles[i] = draw(i, ox + col * pitch, oy + row * pitch)
+
+    def _draw_detail_tile(self, i, x, y):
+        """Espacio completo (sombra, líneas, número, ubicación y estado)."""
+        s = self._pitch / self.TILE_MAX
+        x0, y0 = x + 15 * s, y + 5 * s
+        w, h = 110 * s, 120 * s
+        occupied = self._states[i] == OCUPADO
+        fill, outline = self._tile_colors(occupied)
+
+        self.canvas.create_rectangle(x0 + 4 * s, y0 + 4 * s, x0 + w + 4 * s, y0 + h + 4 * s,
+                                     fill="#2C3E50", outline="")
+        rect = self.canvas.create_rectangle(x0, y0, x0 + w, y0 + h,
+                                            fill=fill, outline=outline, width=3)
+        # Líneas de parqueo (decorativas)
+        for lx in (x0 + 10 * s, x0 + 100 * s):
+            self.canvas.create_line(lx, y0, lx, y0 + h, fill="#7F8C8D", width=2, dash=(5, 5))
+
+        text = self.canvas.create_text(x0 + 55 * s, y0 + 60 * s, text=f"#{i+1}",
+                                       font=("Segoe UI", max(8, int(20 * s)), "bold"),
+                                       fill=self.COLOR_TEXT_LIGHT)
+        status_text = None
+        if s >= 0.6:
+            # Nivel y zona (y tipo, si no es estándar)
+            slot = self._slots[i]
+            location = f"N{slot.level}-{slot.zone}"
+            if ABREVIATURAS[slot.type]:
+                location += f" · {ABREVIATURAS[slot.type]}"
+            self.canvas.create_text(x0 + 55 * s, y0 + 22 * s, text=location,
+                                    font=("Segoe UI", max(7, int(9 * s)), "bold"),
+                                    fill=self.COLOR_TEXT_LIGHT)
+            status_text = self.canvas.create_text(x0 + 55 * s, y0 + 90 * s,
+                                                  text="OCUPADO" if occupied else "LIBRE",
+                                                  font=("Segoe UI", max(7, int(10 * s)), "bold"),
+                                                  fill=self.COLOR_TEXT_LIGHT)
+        return rect, status_text
+
+    def _draw_grid_tile(self, i, x, y):
+        """Espacio como un cuadro de color, sin texto."""
+        gap = max(1, self._pitch // 8)
+        fill, outline = self._tile_colors(self._states[i] == OCUPADO)
+        rect = self.canvas.create_rectangle(x, y, x + self._pitch - gap, y + self._pitch - gap,
+                                            fill=fill, outline=outline)
+        return rect, None
+
+    def _draw_heatmap(self, ox, oy):
+        """
+        Mapa de calor: un pixel por espacio en una PhotoImage base, ampliada
+        con zoom() (en C, dentro de Tk) y paneada moviendo la imagen.
+        """
+        if self._heat_base is None:
+            colors = (self.COLOR_SUCCESS, self.COLOR_DANGER)
+            states = self._states
+            cols = self._cols
+            n = len(states)
+            rows = []
+            for start in range(0, n, cols):
+                row = [colors[state == OCUPADO] for state in states[start:start + cols]]
+                row.extend([self.COLOR_SECONDARY] * (cols - len(row)))
+                rows.append("{" + " ".join(row) + "}")
+            self._heat_base = tk.PhotoImage(width=cols, height=self._rows)
+            self._heat_base.put(" ".join(rows))
+
+        base = self._heat_base
+        self._heatmap = base.zoom(self._pitch) if self._pitch > 1 else base
+        self._heatmap_item = self.canvas.create_image(ox, oy, image=self._heatmap, anchor="nw")
+
+    def _tile_colors(self, occupied):
+        if occupied:
+            return self.COLOR_DANGER, "#C0392B"   # Rojo (como semáforo en rojo = detenerse)
+        return self.COLOR_SUCCESS, "#1E8449"      # Verde (como semáforo en verde = puede pasar)
+
+    def _on_zoom(self, event, factor=None):
+        """Zoom con la rueda del mouse, manteniendo fijo el punto bajo el cursor."""
+        if not self._slots:
+            return
+        if factor is None:
+            up = getattr(event, "delta", 0) > 0 or getattr(event, "num", 0) == 4
+            factor = 1.25 if up else 0.8
+        old = self._pitch
+        new = int(round(old * factor))
+        if new == old:
+            new = old + (1 if factor > 1 else -1)
+        new = max(self.TILE_MIN, min(self.TILE_MAX, new))
+        if new == old:
+            return
+
+        ox, oy = self._origin()
+        # Coordenada de grilla bajo el cursor, antes y después del zoom
+        gx = (event.x - ox) / old
+        gy = (event.y - oy) / old
+        self._pitch = new
+        self._view_x = int(gx * new - event.x)
+        self._view_y = int(gy * new - event.y)
+        self._schedule_redraw()
+
+    def _on_pan_start(self, event):
+        self._drag = (event.x, event.y, self._view_x, self._view_y)
+
+    def _on_pan_move(self, event):
+        """Paneo arrastrando con el mouse."""
+        if self._drag is None:
+            return
+        x, y, vx, vy = self._drag
+        self._view_x = vx - (event.x - x)
+        self._view_y = vy - (event.y - y)
+        if self._heatmap is not None:
+            # Mapa de calor: basta con mover la imagen
+            self._clamp_view()
+            self.canvas.coords(self._heatmap_item, *self._origin())
+        else:
+            self._schedule_redraw()
+
+    def update_spaces(self, slot_states):
+        """
+        Actualiza visualmente solo los espacios que cambiaron desde el último
+        frame (conjunto sucio) y que además están visibles.
+
+        Parámetros:
+        - slot_states: Estado de cada espacio (ParkingLot.get_slot_states())
+        """
+        old = self._states
+        if slot_states == old:
+            return
+        dirty = [i for i, (new, prev) in enumerate(zip(slot_states, old)) if new != prev]
+        self._states = bytearray(slot_states)
+
+        if self._heat_base is not None:
+            pitch = self._pitch
+            cols = self._cols
+            zoomed = self._heatmap if self._heatmap is not self._heat_base else None
+            for i in dirty:
+                x, y = i % cols, i // cols
+                color = self.COLOR_DANGER if slot_states[i] == OCUPADO else self.COLOR_SUCCESS
+                self._heat_base.put(color, to=(x, y))
+                if zoomed is not None:
+                    zoomed.put(color, to=(x * pitch, y * pitch, (x + 1) * pitch, (y + 1) * pitch))
+        if self._heatmap is not None:
+            return
+
+        tiles = self._tiles
+        for i in dirty:
+            tile = tiles.get(i)
+            if tile is None:
+                continue  # Fuera de la vista: se dibuja con su estado al volver a verse
+            rect, status_text = tile
+            occupied = slot_states[i] == OCUPADO
+            fill, outline = self._tile_colors(occupied)
+            self.canvas.itemconfig(rect, fill=fill, outline=outline)
+            if status_text is not None:
+                self.canvas.itemconfig(status_text, text="OCUPADO" if occupied else "LIBRE")
 
     def log_event(self, message):
         """
-        Muestra mensajes de eventos en el log.
+        Agrega un aviso al historial; el log se redibuja una sola vez cuando
+        Tk queda libre, aunque lleguen varios avisos seguidos.
         """
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
+        self.history.add_text(message)
+        if self._log_refresh_pending is None:
+            self._log_refresh_pending = self.root.after_idle(self.refresh_log)
 
-        self.log_box.insert(tk.END, formatted_message)
-        self.log_box.yview(tk.END)  # Auto-scroll al final
-
-        # Opcional: Limitar a 100 mensajes para no saturar
-        if self.log_box.size() > 100:
-            self.log_box.delete(0, 0)  # Eliminar el más antiguo
+    def refresh_log(self):
+        """
+        Incorpora al log los eventos nuevos del historial y redibuja las filas
+        visibles. Se llama una vez por refresco: cuesta lo mismo con 1 o con
+        10.000 eventos nuevos.
+        """
+        self._log_refresh_pending = None
+        self._log_view.refresh()
+        if self._log_follow:
+            self._log_top = max(0, len(self._log_view) - self.LOG_FILAS)
+        self._render_log()
+
+    def clear_log(self):
+        """Vacía el historial y el log."""
+        self.history.clear()
+        self._log_top = 0
+        self._log_follow = True
+        self._log_shown = None  # Las secuencias vuelven a empezar en 0
+        self.refresh_log()
+
+    def _render_log(self):
+        """Escribe en el Listbox solo las filas visibles (si cambiaron)."""
+        view = self._log_view
+        total = len(view)
+        top = self._log_top = min(self._log_top, max(0, total - self.LOG_FILAS))
+        rows = min(self.LOG_FILAS, total - top)
+
+        shown = (view.seq(top) if rows else -1, rows)
+        if shown != self._log_shown:
+            self._log_shown = shown
+            fmt = self.history.format
+            self.log_box.delete(0, tk.END)
+            if rows:
+                self.log_box.insert(tk.END, *(fmt(view.seq(top + k)) for k in range(rows)))
+
+        scroll = (top, total)
+        if scroll != self._log_scroll_shown:
+            self._log_scroll_shown = scroll
+            if total:
+                self.log_scrollbar.set(top / total, (top + rows) / total)
+            else:
+                self.log_scrollbar.set(0, 1)
+            if view.filtered:
+                self.log_count_label.config(text=f"{total:,} de {len(self.history):,} eventos")
+            else:
+                self.log_count_label.config(text=f"{total:,} eventos")
+
+    def _set_log_top(self, top):
+        last = max(0, len(self._log_view) - self.LOG_FILAS)
+        self._log_top = min(max(0, top), last)
+        self._log_follow = self._log_top >= last  # Al final: volver a seguir los nuevos
+        self._render_log()
+
+    def _on_log_scroll(self, *args):
+        """Comando de la scrollbar ("moveto f" o "scroll n units|pages")."""
+        if args[0] == "moveto":
+            self._set_log_top(int(float(args[1]) * len(self._log_view)))
+        else:
+            step = int(args[1]) * (self.LOG_FILAS if args[2] == "pages" else 1)
+            self._set_log_top(self._log_top + step)
+
+    def _on_log_wheel(self, event):
+        up = getattr(event, "delta", 0) > 0 or getattr(event, "num", 0) == 4
+        self._set_log_top(self._log_top + (-3 if up else 3))
+        return "break"  # Que el Listbox no haga su propio scroll
+
+    def _schedule_log_filter(self):
+        """Aplica el filtro cuando se deja de escribir (no en cada tecla)."""
+        if self._log_filter_pending is not None:
+            self.root.after_cancel(self._log_filter_pending)
+        self._log_filter_pending = self.root.after(150, self._apply_log_filter)
+
+    def _apply_log_filter(self):
+        """Filtra el log por número de vehículo y/o tipo de evento."""
+        self._log_filter_pending = None
+        digits = "".join(ch for ch in self.log_vehicle_var.get() if ch.isdigit())
+        vehicle_id = int(digits) if digits else None
+        kind = self.LOG_TIPOS.get(self.log_kind_var.get())
+        self._log_view = HistoryView(self.history, vehicle_id, kind)
+        self._log_follow = True
+        self._log_shown = None
+        self.refresh_log()
+
+    def update_event_lag(self, pending, lag_seconds, dropped):
+        """
+        Muestra cuántos eventos esperan en la cola, qué tan atrasada va la GUI
+        y cuántos eventos se descartaron por desborde.
+        """
+        text = f"Cola: {pending}  |  Retraso: {lag_seconds * 1000:.0f} ms"
+        if dropped:
+            text += f"  |  Descartados: {dropped}"
+        self.lag_label.config(text=text)
 
     def update_statistics(self, total_vehicles, successful_parks, waiting_now):
         """
@@ -489,3 +934,42 @@ class ParkingLotGUI:
         # Actualizar status bar
         status_msg = f"⚡ Activo  |  Vehículos: {total_vehicles}  |  Esperando: {waiting_now}  |  Estacionados: {successful_parks}"
         self.status_label.config(text=status_msg)
+
+    def update_clock(self, elapsed, speed, paused):
+        """
+        Muestra el tiempo simulado transcurrido, la velocidad y si está en pausa.
+        """
+        if self.clock_label is None:
+            return
+        minutes, seconds = divmod(int(elapsed), 60)
+        hours, minutes = divmod(minutes, 60)
+        state = "en pausa" if paused else f"x{speed:g}"
+        self.clock_label.config(text=f"Tiempo simulado: {hours:02d}:{minutes:02d}:{seconds:02d} ({state})")
+        self.pause_button.config(text="▶ Reanudar" if paused else "⏯ Pausar")
+        if self.speed_var.get() != speed:
+            self.speed_var.set(speed)  # Velocidad cambiada fuera de los botones
+
+    def update_metrics(self, snapshot):
+        """
+        Muestra las métricas de SimulationStats.snapshot(): percentiles de
+        espera y estadía, ocupación promedio, rechazos y throughput.
+        """
+        self.metrics_label.config(text=(
+            f"Espera p50/p95/p99: {snapshot['espera_p50']:.1f} / {snapshot['espera_p95']:.1f} / "
+            f"{snapshot['espera_p99']:.1f} s  |  "
+            f"Estadía p50/p95/p99: {snapshot['estadia_p50']:.1f} / {snapshot['estadia_p95']:.1f} / "
+            f"{snapshot['estadia_p99']:.1f} s  |  "
+            f"Utilización: {snapshot['utilizacion']:.0%}  |  "
+            f"Rechazos: {snapshot['rechazos']}  |  "
+            f"Salidas/min: {snapshot['salidas_por_minuto']:.1f}"
+        ))
+
+    def update_gates(self, gates):
+        """
+        Muestra las métricas de cada barrera (ParkingLot.get_gate_stats()):
+        utilización, fila actual y promedio. Una barrera cerca del 100% con
+        fila creciente limita el throughput antes que los espacios.
+        """
+        self.gates_label.config(text="  |  ".join(
+            f"{g['puerta']}: {g['utilizacion']:.0%} ocupada, fila {g['en_fila']} "
+            f"(prom. {g['fila_promedio']:.1f})" for g in gates))
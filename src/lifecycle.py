@@ -0,0 +1,118 @@
+import time
+
+# Cada cuánto se revisa (ms reales) un reloj en pausa o una generación que termina
+_REVISION_MS = 100
+
+
+class LifecycleController:
+    """
+    Arranque y detención de la simulación sin bloquear el mainloop de Tk.
+
+    - spawn(): crea los vehículos iniciales escalonados con root.after (en
+      tiempo simulado: respeta la velocidad y la pausa del reloj), en lugar de
+      time.sleep() entre uno y otro en el hilo de la GUI
+    - retire(): cierra la generación en curso. Cada corrida es una generación
+      con su propio número; al reiniciar, la anterior queda desacoplada (sus
+      vehículos publican en un canal cerrado y sus callbacks pendientes ven
+      que la generación cambió) y se revisa en segundo plano, con un único
+      plazo para todos sus vehículos, si terminó a tiempo
+
+    Nada espera a los hilos en el hilo de Tk: reiniciar cuesta lo mismo con
+    5 vehículos que con 5.000. Todos los métodos se llaman desde el hilo de Tk.
+    """
+
+    def __init__(self, root, clock):
+        self.root = root
+        self.clock = clock
+        self.generation = 0
+        self._spawn_job = None
+        self._retiring = []     # (generación, vivos(), plazo, report)
+        self._retire_job = None
+
+    # === ARRANQUE ===
+
+    def spawn(self, count, interval, submit):
+        """
+        Crea 'count' vehículos, uno cada 'interval' segundos simulados.
+
+        Parámetros:
+        - submit: Callback sin argumentos que crea y encola un vehículo
+        """
+        self.cancel_spawn()
+        generation = self.generation
+
+        def tick(remaining):
+            self._spawn_job = None
+            if generation != self.generation or remaining <= 0:
+                return
+            submit()
+            self._schedule_spawn(tick, remaining - 1, interval)
+
+        tick(count)
+
+    def _schedule_spawn(self, tick, remaining, interval):
+        if remaining <= 0:
+            return
+        delay = self.clock.to_real(interval)
+        if delay is None:
+            # Reloj en pausa: el próximo vehículo espera a que se reanude
+            self._spawn_job = self.root.after(
+                _REVISION_MS, lambda: self._schedule_spawn(tick, remaining, interval))
+            return
+        self._spawn_job = self.root.after(max(1, round(delay * 1000)), lambda: tick(remaining))
+
+    def cancel_spawn(self):
+        """Deja de crear los vehículos escalonados que faltan."""
+        if self._spawn_job is not None:
+            self.root.after_cancel(self._spawn_job)
+            self._spawn_job = None
+
+    @property
+    def spawning(self):
+        return self._spawn_job is not None
+
+    # === DETENCIÓN ===
+
+    def retire(self, live, deadline, report):
+        """
+        Cierra la generación en curso y empieza una nueva (no bloquea).
+
+        Quien llama ya pidió a los vehículos que terminen (stop_event, fila
+        cancelada, reloj despertado); aquí solo se vigila que lo hagan.
+
+        Parámetros:
+        - live: Callback que dice cuántos vehículos de la generación siguen vivos
+        - deadline: Segundos reales para que terminen todos (un solo plazo colectivo)
+        - report: Callback report(generación, rezagados) cuando terminan o vence el plazo
+
+        Retorna:
+        - Número de la nueva generación
+        """
+        self.cancel_spawn()
+        self._retiring.append((self.generation, live, time.monotonic() + deadline, report))
+        self.generation += 1
+        if self._retire_job is None:
+            self._retire_job = self.root.after(_REVISION_MS, self._check_retiring)
+        return self.generation
+
+    def _check_retiring(self):
+        self._retire_job = None
+        now = time.monotonic()
+        pending = []
+        for generation, live, deadline, report in self._retiring:
+            remaining = live()
+            if remaining and now < deadline:
+                pending.append((generation, live, deadline, report))
+            else:
+                report(generation, remaining)
+        self._retiring = pending
+        if pending:
+            self._retire_job = self.root.after(_REVISION_MS, self._check_retiring)
+
+    def cancel(self):
+        """Cancela todo lo programado (al cerrar la ventana)."""
+        self.cancel_spawn()
+        if self._retire_job is not None:
+            self.root.after_cancel(self._retire_job)
+            self._retire_job = None
+        self._retiring = []
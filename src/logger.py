@@ -1,7 +1,223 @@
 import csv
 import datetime
+import gzip
+import os
+import queue
+import struct
+import threading
+import time
+from events import EventKind, ParkingEvent, format_event
 
 def log_to_csv(filename, event):
     with open(filename, "a", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow([datetime.datetime.now().isoformat(), event])
+
+
+# Formatos soportados por EventLogger
+FORMATOS = ("csv", "csv.gz", "bin")
+
+# Columnas del log CSV; el texto libre va con tipo TEXTO y el mensaje en 'detalle'
+CABECERA_CSV = ("timestamp", "tipo", "vehiculo", "espacio", "detalle")
+TIPO_TEXTO = "TEXTO"
+
+# Registro binario: timestamp (float64) + tipo de registro (uint8), seguido de
+# - texto: largo (uint16) + texto UTF-8
+# - evento: kind (uint8) + vehicle_id (int64) + slot (int32) + timestamp monotónico (float64)
+_BIN_HEADER = struct.Struct("<dB")
+_BIN_TEXT = struct.Struct("<H")
+_BIN_EVENT = struct.Struct("<Bqid")
+_REG_TEXTO = 0
+_REG_EVENTO = 1
+
+
+class EventLogger:
+    """
+    Logger de eventos con un solo archivo abierto y escritura por lotes.
+
+    log() no toca el disco: deja (timestamp, evento) en una cola y retorna.
+    Los ParkingEvent se guardan como columnas (tipo, vehículo, espacio); el
+    texto libre (avisos de la simulación) se guarda tal cual.
+    Un hilo escritor en segundo plano junta los eventos y los escribe en lotes
+    cuando se acumulan 'batch_size' o cuando pasan 'flush_interval' segundos.
+
+    Formatos:
+    - "csv": Tabla con CABECERA_CSV (timestamp ISO, tipo, vehículo, espacio,
+      detalle); el texto libre es una fila de tipo TEXTO con el mensaje en detalle
+    - "csv.gz": CSV comprimido con gzip, para corridas largas
+    - "bin": Registros binarios compactos (ver read_binary_log)
+
+    Un CSV existente se continúa solo si empieza con CABECERA_CSV; si tiene
+    otra cabecera (p. ej. el formato viejo de dos columnas de log_to_csv) se
+    rota a 'archivo.1' (o el primer número libre) y se empieza uno nuevo, para
+    no mezclar esquemas en una misma tabla. El nombre queda en 'rotated'.
+
+    Con 'metrics' (metrics.MetricsRegistry) se mide cuánto tarda cada escritura
+    a disco (lote + flush) y se cuentan las filas escritas.
+    """
+
+    def __init__(self, filename, fmt="csv", batch_size=500, flush_interval=1.0, metrics=None):
+        if fmt not in FORMATOS:
+            raise ValueError(f"Formato de log desconocido: {fmt} (use {', '.join(FORMATOS)})")
+        self.filename = filename
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.SimpleQueue()  # Handoff sin bloqueo entre hilos
+        self._closed = False
+        self.rows_written = 0
+        self.batches_written = 0
+        self._flush_seconds = None
+        if metrics is not None:
+            self._flush_seconds = metrics.histogram(
+                "log_flush_segundos", "Duración de cada escritura del log a disco (lote + flush)")
+            metrics.counter("log_filas_total", "Filas escritas en el log de eventos",
+                            lambda: self.rows_written)
+
+        # La cabecera solo en un archivo nuevo: al agregar se continúa la tabla
+        new_file = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        self.rotated = None
+        if fmt != "bin" and not new_file and _csv_header(filename, fmt) != list(CABECERA_CSV):
+            self.rotated = _rotate(filename)
+            new_file = True
+        if fmt == "csv":
+            self._file = open(filename, "a", newline="", encoding="utf-8")
+        elif fmt == "csv.gz":
+            self._file = gzip.open(filename, "at", newline="", encoding="utf-8")
+        else:
+            self._file = open(filename, "ab")
+        self._csv = csv.writer(self._file) if fmt != "bin" else None
+        if self._csv is not None and new_file:
+            self._csv.writerow(CABECERA_CSV)
+
+        self._writer = threading.Thread(target=self._run, name="EventLogger", daemon=True)
+        self._writer.start()
+
+    def log(self, event):
+        """Encola un evento para escribirlo (no bloquea)."""
+        if not self._closed:
+            self._queue.put((time.time(), event))
+
+    def flush(self, timeout=5):
+        """
+        Espera a que todo lo encolado hasta ahora quede escrito en disco.
+
+        Con timeout=0 solo pide la escritura (el hilo escritor la hace en
+        segundo plano) y retorna enseguida, sin bloquear el hilo de Tk.
+        """
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout=5):
+        """Escribe lo pendiente, detiene el hilo escritor y cierra el archivo."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join(timeout)
+
+    def _run(self):
+        """Hilo escritor: junta lotes por tamaño o por tiempo."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = ()  # Se cumplió el intervalo: escribir lo acumulado
+
+            if isinstance(item, tuple) and item:
+                batch.append(item)
+                if len(batch) < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            # Lote lleno, intervalo cumplido, flush() o close()
+            started = time.perf_counter()
+            if batch:
+                self._write_batch(batch)
+            self._file.flush()
+            if batch and self._flush_seconds is not None:
+                self._flush_seconds.observe(time.perf_counter() - started)
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+
+            if item is None:
+                self._file.close()
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _write_batch(self, batch):
+        if self._csv is not None:
+            fromtimestamp = datetime.datetime.fromtimestamp
+            rows = []
+            for ts, event in batch:
+                if isinstance(event, ParkingEvent):
+                    rows.append((fromtimestamp(ts).isoformat(), event.kind.name,
+                                 event.vehicle_id, event.slot, event.detail or ""))
+                else:
+                    rows.append((fromtimestamp(ts).isoformat(), TIPO_TEXTO, "", "", event))
+            self._csv.writerows(rows)
+        else:
+            chunks = []
+            for ts, event in batch:
+                if isinstance(event, ParkingEvent) and event.detail is None:
+                    chunks.append(_BIN_HEADER.pack(ts, _REG_EVENTO))
+                    chunks.append(_BIN_EVENT.pack(event.kind, event.vehicle_id,
+                                                  event.slot, event.timestamp))
+                else:
+                    data = format_event(event).encode("utf-8")[:0xFFFF]
+                    chunks.append(_BIN_HEADER.pack(ts, _REG_TEXTO))
+                    chunks.append(_BIN_TEXT.pack(len(data)))
+                    chunks.append(data)
+            self._file.write(b"".join(chunks))
+        self.rows_written += len(batch)
+        self.batches_written += 1
+
+
+def _csv_header(filename, fmt):
+    """Primera fila de un log CSV existente (None si no se puede leer como CSV)."""
+    opener = gzip.open if fmt == "csv.gz" else open
+    try:
+        with opener(filename, "rt", newline="", encoding="utf-8") as f:
+            return next(csv.reader(f), None)
+    except (OSError, EOFError, UnicodeDecodeError, csv.Error):
+        return None
+
+
+def _rotate(filename):
+    """Renombra 'filename' al primer 'filename.N' libre y retorna el nombre nuevo."""
+    n = 1
+    while os.path.exists(f"{filename}.{n}"):
+        n += 1
+    rotated = f"{filename}.{n}"
+    os.replace(filename, rotated)
+    return rotated
+
+
+def read_binary_log(filename):
+    """
+    Lee un log en formato "bin" de EventLogger.
+
+    Retorna:
+    - Generador de tuplas (datetime, ParkingEvent o texto)
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + _BIN_HEADER.size <= len(data):
+        ts, tipo = _BIN_HEADER.unpack_from(data, offset)
+        offset += _BIN_HEADER.size
+        if tipo == _REG_EVENTO:
+            kind, vehicle_id, slot, mono = _BIN_EVENT.unpack_from(data, offset)
+            offset += _BIN_EVENT.size
+            yield datetime.datetime.fromtimestamp(ts), ParkingEvent(EventKind(kind), vehicle_id, mono, slot)
+        else:
+            (length,) = _BIN_TEXT.unpack_from(data, offset)
+            offset += _BIN_TEXT.size
+            yield datetime.datetime.fromtimestamp(ts), data[offset:offset + length].decode("utf-8", "replace")
+            offset += length
@@ -1,151 +1,610 @@
-import tkinter as tk
+import argparse
 import threading
-import queue
 import random
 import time
-from config import CAPACIDAD, VEHICULOS_INICIALES, REFRESCO_UI
+from clock import SimulationClock
 from parking_lot import ParkingLot
-from vehicle import Vehicle
-from gui import ParkingLotGUI
-from logger import log_to_csv
+from vehicle import Vehicle, vehicle_rng
+from vehicle_pool import VehiclePool
+from logger import EventLogger
+from events import EventChannel, EventKind, ParkingEvent, SIN_ESPACIO
+from gates import ESTRATEGIAS, build_gates
+from event_history import EventHistory
+from event_trace import TraceRecorder, TraceReplayer, load_trace, trace_capacity
+from lifecycle import LifecycleController
+from metrics import MetricsRegistry, MetricsServer
+from session_store import SessionStore
+from settings import SETTINGS, SOLO_AL_INICIO
+from slots import LIBRE, OCUPADO, build_slots, default_layout
+from stats import SimulationStats
+from traffic import ESTADIAS, PERFILES, TrafficFeeder, TrafficGenerator
+
+try:
+    import tkinter as tk
+    from gui import ParkingLotGUI
+except ImportError:
+    # El modo --headless no necesita Tk
+    tk = None
+    ParkingLotGUI = None
 
 class ParkingSimulator:
-    def __init__(self, root):
+    def __init__(self, root, replay=None, config=SETTINGS):
+        """
+        Parámetros:
+        - replay: Traza a reproducir en lugar de simular (None = simular)
+        - config: settings.Settings con la configuración (semilla, velocidad,
+          trazas, sesión...); se vigila y se aplica en caliente
+        """
         self.root = root
-        self.event_queue = queue.Queue()
+        self.config = config
+        self.replay_file = replay
+        self.recorder = None
+        self.feeder = None         # traffic.TrafficFeeder de la corrida en curso
+        self.session = open_session(config)
+        self.run_id = None         # Corrida en curso dentro de la sesión
+        self.replay_states = None  # Estado de los espacios según la traza reproducida
+        self.event_queue = EventChannel(config.TAMANO_COLA_EVENTOS, config.POLITICA_DESBORDE)
         self.stop_event = threading.Event()
-        self.parking_lot = ParkingLot(CAPACIDAD)
-        self.vehicles = []
+        # Reloj simulado: vehículos, timeouts del parqueadero y estadísticas
+        # usan su tiempo, así que la velocidad no cambia los resultados
+        self.clock = SimulationClock(config.VELOCIDAD_SIMULACION, config.VELOCIDAD_MAXIMA)
+        # Arranque escalonado y reinicio sin esperar hilos en el hilo de Tk
+        self.lifecycle = LifecycleController(root, self.clock)
+        # Métricas en /metrics: sin METRICAS_PUERTO no se instrumenta nada
+        self.metrics = MetricsRegistry() if config.METRICAS_PUERTO is not None else None
+        self.parking_lot = self._build_lot()
+        # Hilos fijos que ejecutan los vehículos; los que terminan no se guardan
+        self.pool = VehiclePool(config.HILOS_POOL)
+        self.logger = EventLogger(config.LOG_ARCHIVO, config.LOG_FORMATO, config.LOG_LOTE,
+                                  config.LOG_INTERVALO_FLUSH, metrics=self.metrics)
+
+        # Estadísticas incrementales (O(1) por evento): contadores, percentiles
+        # de espera y estadía, ocupación promedio, rechazos, throughput y
+        # vehículos vivos. Los vehículos en espera se leen de la fila FIFO de ParkingLot
+        self.stats = SimulationStats(self.parking_lot.capacidad)
+
+        # Últimos HISTORIAL_EVENTOS eventos, que el log de la GUI muestra y filtra
+        self.history = EventHistory(config.HISTORIAL_EVENTOS, clock=self.clock)
+
+        self.gui = ParkingLotGUI(root, self.start_simulation, self.add_vehicle, self.stop_simulation, self.reset_simulation,
+                                 self.set_speed, self.toggle_pause, self.step, config.VELOCIDADES,
+                                 history=self.history)
+        self.gui.init_spaces(self.parking_lot.slots)
+        self.root.after(config.REFRESCO_UI, self.update_ui)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        if self.logger.rotated is not None:
+            self.gui.log_event(f"🗂 Log con otro formato movido a {self.logger.rotated}")
+
+        self.metrics_server = None
+        if self.metrics is not None:
+            self._frame_seconds = self.metrics.histogram(
+                "ui_frame_segundos", "Duración de cada update_ui en el hilo de Tk")
+            self.metrics.add_collector(self._collect_metrics)
+            self.metrics_server = MetricsServer(self.metrics, config.METRICAS_PUERTO, config.METRICAS_HOST)
+            self.gui.log_event(f"📈 Métricas en {self.metrics_server.url}")
+
+        # Recarga en caliente: los cambios se aplican sobre la simulación viva
+        config.subscribe(self.apply_settings)
+        if config.filename is not None:
+            self.root.after(config.CONFIG_REVISION_MS, self._watch_config)
+
+    def _build_lot(self):
+        """Parqueadero nuevo con los espacios y las barreras de la configuración."""
+        entry_gates, exit_gates = build_gates(self.config, self.clock.now())
+        return ParkingLot(self.config.CAPACIDAD, self.config.DISTRIBUCION_ESPACIOS, clock=self.clock,
+                          entry_gates=entry_gates, exit_gates=exit_gates, metrics=self.metrics)
 
-        # Variables para rastrear estadísticas
-        # Estas variables guardan información sobre lo que pasa en la simulación
-        self.total_vehicles_created = 0    # Contador: cuántos vehículos hemos creado en total
-        self.successful_parks = 0          # Contador: cuántos vehículos lograron estacionarse
-        self.vehicles_exited = 0           # NUEVO: cuántos vehículos salieron completamente
-        self.waiting_vehicles = set()      # CORREGIDO: Set de vehículos únicos esperando (evita duplicados)
+    def _collect_metrics(self):
+        """
+        Valores que se leen en cada scrape (hilo del servidor de métricas).
 
-        self.gui = ParkingLotGUI(root, self.start_simulation, self.add_vehicle, self.stop_simulation, self.reset_simulation)
-        self.gui.init_spaces(CAPACIDAD)
-        self.root.after(REFRESCO_UI, self.update_ui)
+        Todo lo del parqueadero sale de un mismo snapshot(): no toma el lock
+        ni frena a los vehículos. Después de Reiniciar se lee el parqueadero
+        nuevo, así que los contadores de la corrida se exportan como gauges
+        (vuelven a 0) y no como counters de Prometheus.
+        """
+        lot = self.parking_lot.snapshot()
+        channel = self.event_queue
+        samples = [
+            ("parqueadero_capacidad", "gauge", "Espacios del parqueadero", lot.capacidad),
+            ("parqueadero_ocupados", "gauge", "Espacios ocupados", lot.occupied),
+            ("parqueadero_en_fila", "gauge", "Vehículos esperando espacio", lot.waiting),
+            ("parqueadero_max_en_fila", "gauge", "Fila de espera más larga de la corrida", lot.max_waiting),
+            ("parqueadero_entradas", "gauge", "Vehículos que entraron en la corrida actual", lot.entries),
+            ("parqueadero_salidas", "gauge", "Vehículos que salieron en la corrida actual", lot.exits),
+            ("cola_eventos_profundidad", "gauge", "Eventos pendientes hacia la GUI", channel.qsize()),
+            ("cola_eventos_descartados", "gauge", "Eventos descartados por desborde en la corrida actual",
+             channel.dropped),
+            ("vehiculos_vivos", "gauge", "Vehículos de la corrida que todavía no terminaron",
+             self.stats.live_vehicles),
+        ]
+        gates = self.parking_lot.get_gate_stats()
+        if gates:
+            samples.append(("puerta_en_fila", "gauge", "Vehículos en la fila de cada barrera",
+                            [({"puerta": g["puerta"]}, g["en_fila"]) for g in gates]))
+            samples.append(("puerta_utilizacion", "gauge", "Fracción del tiempo ocupada de cada barrera",
+                            [({"puerta": g["puerta"]}, g["utilizacion"]) for g in gates]))
+        return samples
 
     def start_simulation(self):
         # Verificar si ya hay una simulación en curso
-        active_vehicles = sum(1 for v in self.vehicles if v.is_alive())
-        if active_vehicles > 0:
+        if self.stats.live_vehicles > 0 or self._feeding():
             self.gui.log_event("⚠️ Ya hay una simulación en curso")
             return
 
-        self.stop_event.clear()
-        for i in range(VEHICULOS_INICIALES):
-            v = Vehicle(i + 1, self.parking_lot, self.event_queue, self.stop_event)
-            self.vehicles.append(v)
-            v.start()
+        # Señal nueva para la corrida nueva: la anterior queda activada para
+        # cualquier hilo rezagado que todavía la mire
+        self.stop_event = threading.Event()
+        if self.replay_file:
+            self._start_replay()
+            return
+        config = self.config
+        if config.TRAZA_GRABAR and self.recorder is None:
+            self.recorder = TraceRecorder(config.TRAZA_GRABAR, seed=config.SEMILLA,
+                                          capacidad=self.parking_lot.capacidad)
+        if self.session is not None and self.run_id is None:
+            self.run_id = self.session.start_run("gui", config.SEMILLA, self.parking_lot.capacidad,
+                                                 trafico=config.TRAFICO_PERFIL, velocidad=self.clock.speed)
+        if config.TRAFICO_PERFIL:
+            self._start_traffic()
+            return
+        # Uno cada INTERVALO_INICIAL segundos simulados, desde el mainloop (sin sleep)
+        self.lifecycle.spawn(config.VEHICULOS_INICIALES, config.INTERVALO_INICIAL, self._submit_vehicle)
+        self.gui.log_event("🚦 Simulación iniciada")
 
-            # Incrementar contador cada vez que creamos un vehículo
-            self.total_vehicles_created += 1
+    def _start_replay(self):
+        """Reproduce una traza grabada: mismos eventos, en el mismo orden."""
+        meta, events = load_trace(self.replay_file)
+        # Los espacios salen de la traza y no del parqueadero actual: una traza
+        # grabada con más espacios no cabría en su arreglo
+        capacidad = trace_capacity(meta, events)
+        if capacidad != len(self.parking_lot.slots):
+            self.gui.init_spaces(build_slots(default_layout(capacidad)))
+        self.stats.capacidad = capacidad
+        self.replay_states = bytearray(capacidad)
+        # La reproducción sigue al reloj: se puede pausar, adelantar o acelerar
+        self.clock.set_speed(min(self.config.VELOCIDAD_REPRODUCCION, self.config.VELOCIDAD_MAXIMA))
+        TraceReplayer(events, self.event_queue, self.stop_event, clock=self.clock).start()
+        self.gui.log_event(f"▶ Reproduciendo {self.replay_file}: {len(events)} eventos "
+                           f"(seed {meta.get('seed')}, x{self.clock.speed:g})")
 
-            time.sleep(0.5)
-        self.gui.log_event("🚦 Simulación iniciada")
+    def _close_run(self):
+        """Cierra la traza y la corrida de la sesión en curso guardando el resumen."""
+        if self.recorder is not None:
+            self.recorder.close(self.stats.snapshot())
+            self.recorder = None
+        if self.run_id is not None:
+            self.session.end_run(self.run_id, self.stats.snapshot())
+            self.run_id = None
 
-    def add_vehicle(self):
-        v = Vehicle(len(self.vehicles) + 1, self.parking_lot, self.event_queue, self.stop_event)
-        self.vehicles.append(v)
-        v.start()
+    def _start_traffic(self):
+        """Llegadas continuas del generador de tráfico, desde la hora actual del día."""
+        config = self.config
+        generator = TrafficGenerator(traffic_profile(config), traffic_dwell(config),
+                                     config.SEMILLA)
+        now = time.localtime()
+        start = now.tm_hour * 3600 + now.tm_min * 60 + now.tm_sec
+        arrivals = generator.generate(24 * 3600, start=start)
+        # El feeder crea vehículos desde su propio hilo, siempre en esta corrida
+        # aunque un Reiniciar reemplace el parqueadero mientras tanto
+        submit = self._run_submitter()
+        self.feeder = TrafficFeeder(arrivals, lambda when, dwell: submit(initial_wait=0, dwell=dwell),
+                                    self.stop_event, clock=self.clock)
+        self.feeder.start()
+        self.gui.log_event(f"🚦 Tráfico '{config.TRAFICO_PERFIL}' iniciado: {len(arrivals)} llegadas en 24 h")
+
+    def _feeding(self):
+        """True mientras el generador de tráfico todavía tiene llegadas por entregar."""
+        return self.feeder is not None and self.feeder.is_alive()
 
-        # Incrementar contador cuando agregamos un vehículo manualmente
-        self.total_vehicles_created += 1
+    def _stop_feeder(self):
+        """Espera al feeder (ya se le pidió detenerse: se despierta enseguida)."""
+        if self.feeder is not None:
+            self.feeder.join(timeout=1.0)
+            self.feeder = None
 
+    def add_vehicle(self):
+        v = self._submit_vehicle()
         self.gui.log_event(f"Nuevo vehículo agregado: {v.name}")
 
-    def stop_simulation(self):
+    def _submit_vehicle(self, **kwargs):
+        """Crea un vehículo y lo encola en el pool de hilos (kwargs van a Vehicle)."""
+        return self._run_submitter()(**kwargs)
+
+    def _run_submitter(self):
+        """
+        submit(**kwargs) ligado a la corrida actual: su parqueadero, canal,
+        señal de detención y estadísticas. Se puede llamar desde otro hilo
+        (el del feeder) aunque el hilo de Tk esté reiniciando.
+        """
+        lot, channel, stop_event, stats = self.parking_lot, self.event_queue, self.stop_event, self.stats
+        seed, clock, pool = self.config.SEMILLA, self.clock, self.pool
+
+        def submit(**kwargs):
+            # Contar el vehículo como vivo antes de que un hilo del pool pueda
+            # terminarlo; el número sale del mismo lock (no se repite entre hilos)
+            vehicle_id = stats.vehicle_started()
+            v = Vehicle(vehicle_id, lot, channel, stop_event, on_finish=stats.vehicle_finished,
+                        rng=vehicle_rng(seed, vehicle_id), clock=clock, **kwargs)
+            pool.submit(v)
+            return v
+        return submit
+
+    def _cancel_pending_vehicles(self):
+        """Descarta los vehículos que el pool todavía no empezó a ejecutar."""
+        for v in self.pool.cancel_pending():
+            v.on_finish(v.vehicle_id)  # Nunca corrieron: ya no cuentan como vivos
+
+    def set_speed(self, speed):
+        """Cambia la velocidad del reloj (los vehículos dormidos recalculan su plazo)."""
+        self.clock.set_speed(speed)
+        self.gui.log_event(f"⏩ Velocidad x{speed:g}")
+
+    def toggle_pause(self):
+        if self.clock.paused:
+            self.clock.resume()
+            self.gui.log_event("▶ Simulación reanudada")
+        else:
+            self.clock.pause()
+            self.gui.log_event("⏸ Simulación en pausa")
+
+    def step(self):
+        """Avanza el reloj PASO_SIMULACION segundos simulados (útil en pausa)."""
+        self.clock.step(self.config.PASO_SIMULACION)
+
+    def _signal_stop(self):
+        """Pide a todos los hilos de la corrida que terminen (no espera a ninguno)."""
+        self.lifecycle.cancel_spawn()
         self.stop_event.set()
+        self._cancel_pending_vehicles()
+        self.parking_lot.cancel_waiting()  # Despertar a los que hacen fila
+        self.clock.wake()                  # Y a los que duermen (aunque el reloj esté en pausa)
+
+    def stop_simulation(self):
+        self._signal_stop()
         self.gui.log_event("Simulación detenida")
 
     def reset_simulation(self):
         # PASO 1: Señalar a todos los hilos que deben detenerse
-        self.stop_event.set()
-        self.gui.log_event("⏳ Deteniendo hilos...")
+        self._signal_stop()
 
-        # PASO 2: Esperar a que TODOS los hilos terminen correctamente
-        # Esto se llama "thread cleanup" o "limpieza de hilos"
-        # Sin esto, los hilos viejos podrían seguir ejecutándose y causar problemas
-        for vehicle in self.vehicles:
-            if vehicle.is_alive():  # ¿El hilo todavía está corriendo?
-                vehicle.join(timeout=3)  # Esperar máximo 3 segundos a que termine
-                # join() = "espérame, no sigas hasta que yo termine"
+        # PASO 2: Desacoplar la corrida anterior sin esperarla. Sus vehículos
+        # publican en un canal cerrado (no se bloquean ni llegan a la nueva
+        # corrida) y terminan contra su propio parqueadero y estadísticas; el
+        # controlador revisa en segundo plano que lo hagan dentro de
+        # PLAZO_DETENCION, el mismo plazo para todos
+        # Lo que la GUI todavía no procesó va igual al log, que se escribe
+        # a disco ya (en el hilo escritor, sin esperarlo aquí)
+        for event in self.event_queue.close():
+            self.logger.log(event)
+        self.logger.flush(timeout=0)
+        self.lifecycle.retire(lambda stats=self.stats: stats.live_vehicles,
+                              self.config.PLAZO_DETENCION, self._report_retired)
+        self.event_queue = EventChannel(self.config.TAMANO_COLA_EVENTOS, self.config.POLITICA_DESBORDE)
 
-        # PASO 3: Ahora sí es seguro resetear todo
-        self.parking_lot = ParkingLot(CAPACIDAD)
-        self.vehicles.clear()
+        # PASO 3: Corrida nueva
+        self._stop_feeder()
+        self._close_run()
+        self.replay_states = None
+        self.parking_lot = self._build_lot()
 
         # Resetear todas las estadísticas a cero
-        self.total_vehicles_created = 0
-        self.successful_parks = 0
-        self.vehicles_exited = 0
-        self.waiting_vehicles = set()  # Limpiar el set
+        self.stats = SimulationStats(self.parking_lot.capacidad)
 
         # Limpiar interfaz
-        self.gui.init_spaces(CAPACIDAD)
-        self.gui.log_box.delete(0, tk.END)
+        self.gui.init_spaces(self.parking_lot.slots)
+        self.gui.clear_log()
         self.gui.log_event("Simulación reiniciada")
 
+    def _report_retired(self, generation, stragglers):
+        """La corrida anterior terminó, o venció su plazo con vehículos todavía activos."""
+        if stragglers:
+            self.gui.log_event(f"⚠️ {stragglers} vehículos de la corrida {generation + 1} no terminaron "
+                               f"en {self.config.PLAZO_DETENCION:g} s; quedan desacoplados")
+
+    def on_close(self):
+        """Cierre de la ventana: detener hilos y escribir el log pendiente."""
+        self._signal_stop()
+        self.lifecycle.cancel()
+        self.pool.shutdown(timeout=0)  # Hilos daemon: no bloquear el cierre
+        self._stop_feeder()
+        self._close_run()
+        self.logger.close()
+        if self.session is not None:
+            self.session.close()
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+        self.root.destroy()
+
     def update_ui(self):
         """Actualiza visualmente los espacios y eventos."""
-        while not self.event_queue.empty():
-            event = self.event_queue.get()
-            self.gui.log_event(event)
-            log_to_csv("event_log.csv", event)
-
-            # Analizar cada evento para actualizar estadísticas
-            # Extraer el nombre del vehículo del evento
-            vehicle_name = event.split()[0] if event else ""  # Ejemplo: "Vehículo-1" de "Vehículo-1 ingresó..."
-
-            if "ingresó al parqueadero" in event:
-                # Un vehículo logró estacionarse exitosamente
-                self.successful_parks += 1
-                # Remover del set de esperando (si estaba ahí)
-                self.waiting_vehicles.discard(vehicle_name)
-
-            elif "esperando espacio" in event:
-                # Agregar vehículo al set de esperando (set evita duplicados automáticamente)
-                # Si el mismo vehículo espera 10 veces, solo cuenta como 1
-                self.waiting_vehicles.add(vehicle_name)
-
-            elif "salió del parqueadero" in event:
-                # Un vehículo completó su ciclo (entró y salió)
-                self.vehicles_exited += 1
-                # Asegurar que no esté en el set de esperando
-                self.waiting_vehicles.discard(vehicle_name)
-
-        # Usar el método get_occupied_count() en lugar de acceso directo
-        # Esto respeta la encapsulación de la clase ParkingLot
-        self.gui.update_spaces(self.parking_lot.get_occupied_count(), CAPACIDAD)
+        # Procesar eventos con presupuesto por frame (cantidad y tiempo): una
+        # ráfaga de miles de eventos se reparte entre varios refrescos en lugar
+        # de congelar el mainloop de Tk. Lo que no alcanza queda en la cola.
+        config = self.config.values  # Una sola configuración para todo el frame
+        max_events = config["MAX_EVENTOS_POR_FRAME"]
+        started = time.perf_counter()
+        deadline = started + config["PRESUPUESTO_FRAME_MS"] / 1000
+        processed = 0
+
+        while processed < max_events and time.perf_counter() < deadline:
+            batch = self.event_queue.drain(min(64, max_events - processed))
+            if not batch:
+                break
+            processed += len(batch)
+
+            for event in batch:
+                self.logger.log(event)  # Se escribe por lotes en segundo plano
+                # Al historial del log va tal cual: se convierte en texto solo
+                # si llega a verse en pantalla
+                self.history.append(event)
+
+                # Actualizar estadísticas según el tipo de evento (sin analizar texto)
+                if isinstance(event, ParkingEvent):
+                    self.stats.record_event(event)
+                    if self.recorder is not None:
+                        self.recorder.record(event)  # Mismo orden en que lo vieron las estadísticas
+                    if self.run_id is not None:
+                        self.session.log(self.run_id, event)
+                    if self.replay_states is not None and event.slot != SIN_ESPACIO:
+                        if event.kind == EventKind.INGRESO:
+                            self.replay_states[event.slot] = OCUPADO
+                        elif event.kind == EventKind.SALIDA:
+                            self.replay_states[event.slot] = LIBRE
+
+        # Log: solo las filas visibles, sin importar cuántos eventos llegaron
+        self.gui.refresh_log()
+
+        # Retraso de la cola: edad del evento más antiguo aún sin procesar,
+        # en segundos reales (los timestamps están en tiempo simulado)
+        oldest = self.event_queue.peek()
+        lag = 0.0
+        if isinstance(oldest, ParkingEvent) and not self.clock.paused:
+            lag = self.clock.to_real(self.clock.now() - oldest.timestamp)
+        self.gui.update_event_lag(self.event_queue.qsize(), lag, self.event_queue.dropped)
+
+        # Una sola lectura del parqueadero para todo el frame: espacios, fila
+        # y salidas de la misma versión (snapshot() no bloquea a los vehículos)
+        lot = self.parking_lot.snapshot()
+        exits = lot.exits
+        if self.replay_states is not None:
+            # Reproducción: el parqueadero no se usa, los espacios y las
+            # salidas salen de los eventos de la traza
+            self.gui.update_spaces(bytes(self.replay_states))
+            exits = self.stats.exits
+        else:
+            self.gui.update_spaces(lot.slot_states)
 
         # Actualizar el panel de estadísticas
         # Llamamos al nuevo método de la GUI para mostrar los números actualizados
         self.gui.update_statistics(
-            self.total_vehicles_created,
-            self.vehicles_exited,  # Cambiado: mostrar salidas en lugar de estacionados
-            len(self.waiting_vehicles)  # Tamaño del set = vehículos únicos esperando
+            self.stats.vehicles_created,
+            exits,        # Salidas (no estacionados)
+            lot.waiting   # Profundidad actual de la fila FIFO
         )
+        self.gui.update_metrics(self.stats.snapshot(self.clock.now()))
+        self.gui.update_gates(self.parking_lot.get_gate_stats())
+        self.gui.update_clock(self.clock.elapsed(), self.clock.speed, self.clock.paused)
 
         # Detener automáticamente cuando todos los vehículos terminen
-        # Verificar si todos los hilos han terminado (vehículos completaron su ciclo)
-        if self.vehicles and not self.stop_event.is_set():
-            # Contar cuántos vehículos siguen activos
-            active_vehicles = sum(1 for v in self.vehicles if v.is_alive())
-
+        # El contador de vivos se lleva al crear/terminar cada hilo (sin recorrerlos).
+        # Con tráfico el parqueadero se vacía entre dos llegadas: la corrida
+        # termina recién cuando el feeder entregó todas las suyas
+        if (self.stats.vehicles_created and not self.stop_event.is_set() and self.event_queue.empty()
+                and not self.lifecycle.spawning and not self._feeding()):
             # Si no hay vehículos activos, la simulación terminó naturalmente
-            if active_vehicles == 0:
+            if self.stats.live_vehicles == 0:
                 self.gui.log_event("✅ Simulación completada - Todos los vehículos finalizaron")
+                self._close_run()
                 self.stop_event.set()  # Marcar como detenida
-                return  # No seguir actualizando
 
-        # Llamar esta función de nuevo después de REFRESCO_UI milisegundos
-        self.root.after(REFRESCO_UI, self.update_ui)
+        if self.metrics is not None:
+            self._frame_seconds.observe(time.perf_counter() - started)
+
+        # Llamar esta función de nuevo después de REFRESCO_UI milisegundos (también
+        # con la simulación detenida: Reiniciar e Iniciar no necesitan relanzar el ciclo)
+        self.root.after(config["REFRESCO_UI"], self.update_ui)
+
+    # === CONFIGURACIÓN EN CALIENTE ===
+
+    def _watch_config(self):
+        """Revisa periódicamente si el archivo de configuración cambió (hilo de Tk)."""
+        try:
+            self.config.check_file()  # Los cambios llegan a apply_settings()
+        except ValueError as e:
+            self.gui.log_event(f"⚠️ Configuración rechazada: {e}")
+        self.root.after(self.config.CONFIG_REVISION_MS, self._watch_config)
+
+    def apply_settings(self, changes):
+        """
+        Aplica una configuración nueva sobre la simulación en curso, sin
+        reiniciarla (los hilos de los vehículos siguen corriendo).
+
+        - CAPACIDAD / DISTRIBUCION_ESPACIOS: redimensiona el ParkingLot vivo
+        - VELOCIDAD_SIMULACION: cambia la velocidad del reloj
+        - PUERTAS_* / PUERTA_*: barreras nuevas (con sus métricas desde cero)
+        - Tiempos, refresco y presupuesto por frame, tráfico, semilla: se leen
+          de la configuración en cada uso, así que valen desde ya
+        - SOLO_AL_INICIO: se avisa que requieren reiniciar la aplicación
+        """
+        config = self.config
+        if ("CAPACIDAD" in changes or "DISTRIBUCION_ESPACIOS" in changes) and self.replay_states is None:
+            slots = self.parking_lot.resize(config.CAPACIDAD, config.DISTRIBUCION_ESPACIOS)
+            self.stats.capacidad = self.parking_lot.capacidad
+            self.gui.init_spaces(slots)
+        if "VELOCIDAD_SIMULACION" in changes:
+            self.clock.set_speed(config.VELOCIDAD_SIMULACION)
+        if any(name.startswith("PUERTA") for name in changes):
+            # Barreras nuevas para los que llegan; los que ya hacen fila terminan en las anteriores
+            lot = self.parking_lot
+            lot.entry_gates, lot.exit_gates = build_gates(config, self.clock.now())
+        applied = sorted(name for name in changes if name not in SOLO_AL_INICIO)
+        pending = sorted(name for name in changes if name in SOLO_AL_INICIO)
+        if applied:
+            self.gui.log_event("⚙️ Configuración aplicada: "
+                               + ", ".join(f"{name}={changes[name]}" for name in applied))
+        if pending:
+            self.gui.log_event(f"⚙️ Requieren reiniciar la aplicación: {', '.join(pending)}")
+
+# Opciones de línea de comandos que reemplazan un parámetro de la configuración
+OPCIONES_CONFIG = {
+    "vehiculos": "VEHICULOS_INICIALES",
+    "capacidad": "CAPACIDAD",
+    "seed": "SEMILLA",
+    "rapidez": "VELOCIDAD_SIMULACION",
+    "grabar": "TRAZA_GRABAR",
+    "velocidad": "VELOCIDAD_REPRODUCCION",
+    "perfil": "TRAFICO_PERFIL",
+    "tasa": "TRAFICO_TASA",
+    "tasa_pico": "TRAFICO_TASA_PICO",
+    "estadia": "TRAFICO_ESTADIA",
+    "sesion": "SESION_DB",
+    "puertas_entrada": "PUERTAS_ENTRADA",
+    "puertas_salida": "PUERTAS_SALIDA",
+    "estrategia": "PUERTA_ESTRATEGIA",
+    "metricas": "METRICAS_PUERTO",
+}
+
+
+def open_session(config):
+    """SessionStore de SESION_DB con el lote y el modo de eventos de la configuración (None si no hay)."""
+    if not config.SESION_DB:
+        return None
+    return SessionStore(config.SESION_DB, config.SESION_LOTE, config.SESION_EVENTOS)
+
+
+def traffic_profile(config):
+    """Perfil de llegadas de la configuración (TRAFICO_PERFIL con sus tasas)."""
+    if config.TRAFICO_PERFIL == "pico":
+        return PERFILES["pico"](config.TRAFICO_TASA, config.TRAFICO_TASA_PICO)
+    return PERFILES[config.TRAFICO_PERFIL](config.TRAFICO_TASA)
+
+
+def traffic_dwell(config):
+    """Distribución de estadías TRAFICO_ESTADIA con los tiempos de la configuración."""
+    low, high = config.TIEMPO_MIN_ESTACIONADO, config.TIEMPO_MAX_ESTACIONADO
+    if config.TRAFICO_ESTADIA == "uniforme":
+        return ESTADIAS["uniforme"](low, high)
+    return ESTADIAS[config.TRAFICO_ESTADIA]((low + high) / 2)
+
+
+def parse_args(argv=None):
+    """
+    Lee la línea de comandos y carga SETTINGS: config.py, el archivo de
+    --config (o CONFIG_ARCHIVO), el entorno y las opciones dadas (--capacidad,
+    --seed, --set CLAVE=VALOR...). Las opciones que no se dan no pisan nada.
+    """
+    parser = argparse.ArgumentParser(description="Simulador de Parqueadero Inteligente")
+    parser.add_argument("--config", metavar="ARCHIVO",
+                        help="Archivo JSON de configuración (se recarga en caliente al cambiar)")
+    parser.add_argument("--set", action="append", default=[], metavar="CLAVE=VALOR",
+                        help="Reemplaza un parámetro de config.py (se puede repetir)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Simular con el motor de eventos discretos (sin threads ni Tk)")
+    parser.add_argument("--vehiculos", type=int, help="Vehículos a simular (VEHICULOS_INICIALES)")
+    parser.add_argument("--capacidad", type=int, help="Espacios del parqueadero (CAPACIDAD)")
+    parser.add_argument("--intervalo", type=float, default=0.5,
+                        help="Segundos simulados entre vehículos en modo headless")
+    parser.add_argument("--seed", type=int, help="Semilla aleatoria (SEMILLA)")
+    parser.add_argument("--rapidez", type=float,
+                        help="Veces el tiempo real de la simulación en la GUI (1 a 1000)")
+    parser.add_argument("--grabar", metavar="TRAZA",
+                        help="Grabar la traza de eventos de la corrida (GUI)")
+    parser.add_argument("--reproducir", metavar="TRAZA",
+                        help="Reproducir una traza (GUI); con --headless, solo recalcular sus estadísticas")
+    parser.add_argument("--velocidad", type=float,
+                        help="Veces el tiempo real al reproducir una traza en la GUI")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="Procesos del modo headless (0 = uno por núcleo)")
+    parser.add_argument("--independientes", action="store_true",
+                        help="Con --procesos: cada proceso simula su propio parqueadero")
+    parser.add_argument("--perfil", choices=sorted(PERFILES),
+                        help="Generador de tráfico (en lugar de un número fijo de vehículos)")
+    parser.add_argument("--horas", type=float, default=24, help="Horas simuladas con --perfil (headless)")
+    parser.add_argument("--tasa", type=float, help="Vehículos por hora")
+    parser.add_argument("--tasa-pico", type=float, help="Vehículos por hora en horas pico (--perfil pico)")
+    parser.add_argument("--estadia", choices=sorted(ESTADIAS),
+                        help="Distribución del tiempo estacionado con --perfil")
+    parser.add_argument("--sesion", metavar="DB",
+                        help="Guardar corridas, vehículos y eventos en esta base SQLite")
+    parser.add_argument("--puertas-entrada", type=int, help="Barreras de entrada (PUERTAS_ENTRADA)")
+    parser.add_argument("--puertas-salida", type=int, help="Barreras de salida (PUERTAS_SALIDA)")
+    parser.add_argument("--estrategia", choices=sorted(ESTRATEGIAS),
+                        help="Cómo elige barrera cada vehículo (PUERTA_ESTRATEGIA)")
+    parser.add_argument("--metricas", type=int, metavar="PUERTO",
+                        help="Servir métricas Prometheus en http://127.0.0.1:PUERTO/metrics (GUI)")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    for item in args.set:
+        name, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"--set espera CLAVE=VALOR, no {item!r}")
+        overrides[name.strip().upper()] = value.strip()  # Texto: se interpreta como JSON al validar
+    for option, name in OPCIONES_CONFIG.items():
+        if getattr(args, option) is not None:
+            overrides[name] = getattr(args, option)
+    try:
+        SETTINGS.load(args.config or SETTINGS.CONFIG_ARCHIVO, overrides)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if (args.headless and args.procesos != 1 and not args.reproducir and not SETTINGS.TRAFICO_PERFIL
+            and (SETTINGS.PUERTAS_ENTRADA or SETTINGS.PUERTAS_SALIDA)):
+        parser.error("--procesos no simula barreras: use --procesos 1 o PUERTAS_ENTRADA/PUERTAS_SALIDA en 0")
+    return args
+
 
 if __name__ == "__main__":
-    random.seed(42)
-    root = tk.Tk()
-    app = ParkingSimulator(root)
-    root.mainloop()
+    args = parse_args()
+    config = SETTINGS
+    random.seed(config.SEMILLA)
+
+    if args.headless:
+        from engine import run_headless, print_summary
+        session = open_session(config)
+        run_id = on_event = on_events = None
+        if session is not None and not args.reproducir:
+            run_id = session.start_run("headless", config.SEMILLA, config.CAPACIDAD,
+                                       vehiculos=config.VEHICULOS_INICIALES, perfil=config.TRAFICO_PERFIL,
+                                       procesos=args.procesos)
+            on_event = session.recorder(run_id)
+
+            def on_events(batch):
+                # Lotes de los procesos de --procesos: (tipo, vehicle_id, tiempo, espacio)
+                for event in batch:
+                    on_event(*event)
+        summary = None
+        if args.reproducir:
+            from event_trace import replay_stats
+            meta, snapshot, mismatches = replay_stats(args.reproducir)
+            print_summary(snapshot)
+            if "resumen" in meta:
+                print("Reproducción idéntica a la corrida grabada" if not mismatches
+                      else f"Difiere de la corrida grabada en: {', '.join(mismatches)}")
+        elif config.TRAFICO_PERFIL:
+            from traffic import run_traffic_headless
+            generator = TrafficGenerator(traffic_profile(config), traffic_dwell(config),
+                                         config.SEMILLA)
+            summary = run_traffic_headless(generator, args.horas, config.CAPACIDAD, config.SEMILLA, on_event,
+                                           *build_gates(config))
+        elif args.procesos == 1:
+            summary = run_headless(config.VEHICULOS_INICIALES, config.CAPACIDAD, args.intervalo,
+                                   config.SEMILLA, on_event, *build_gates(config))
+        else:
+            from multiprocess import run_multiprocess
+            summary = run_multiprocess(config.VEHICULOS_INICIALES, args.procesos or None, config.CAPACIDAD,
+                                       args.intervalo, config.SEMILLA, shared=not args.independientes,
+                                       on_events=on_events)
+        if summary is not None:
+            print_summary(summary)
+        if session is not None:
+            if run_id is not None:
+                session.end_run(run_id, summary)
+                print(f"Corrida {run_id} guardada en {config.SESION_DB}")
+            session.close()
+    else:
+        if tk is None:
+            raise SystemExit("Tkinter no está disponible. Use --headless para simular sin GUI.")
+        root = tk.Tk()
+        app = ParkingSimulator(root, replay=args.reproducir)
+        root.mainloop()
@@ -0,0 +1,320 @@
+"""
+Métricas estilo Prometheus: contadores, gauges e histogramas, expuestos en
+un endpoint HTTP local /metrics en el formato de texto de Prometheus.
+
+Sin METRICAS_PUERTO no se crea nada: ParkingLot, EventLogger y la GUI
+reciben metrics=None y no miden nada (ni un perf_counter de más en try_enter).
+
+Para probar el endpoint sin un Prometheus, este mismo módulo hace de scraper:
+    python src/main.py --metricas 9464
+    python src/metrics.py http://127.0.0.1:9464/metrics --cada 2
+    python src/metrics.py http://127.0.0.1:9464/metrics --filtro parqueadero_
+"""
+import argparse
+import bisect
+import http.server
+import math
+import threading
+import time
+import urllib.request
+
+# Límites superiores (segundos) de los histogramas de latencia
+BUCKETS_LATENCIA = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Counter:
+    """
+    Contador monótono (solo sube). Thread-safe.
+
+    Con 'function' el valor se lee en cada scrape de un contador que ya
+    existe en otro objeto (p. ej. EventLogger.rows_written) y no se usa inc().
+    """
+    kind = "counter"
+
+    def __init__(self, name, help, function=None):
+        self.name = name
+        self.help = help
+        self.function = function
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def samples(self):
+        return [(self.name, None, self.function() if self.function is not None else self._value)]
+
+
+class Gauge:
+    """Valor que sube y baja (o que se lee de 'function' en cada scrape)."""
+    kind = "gauge"
+
+    def __init__(self, name, help, function=None):
+        self.name = name
+        self.help = help
+        self.function = function
+        self._value = 0
+
+    def set(self, value):
+        self._value = value
+
+    def samples(self):
+        return [(self.name, None, self.function() if self.function is not None else self._value)]
+
+
+class Histogram:
+    """
+    Distribución de valores por buckets acumulativos (más suma y cantidad).
+
+    observe() cuesta una búsqueda binaria y un lock; solo se llama cuando
+    las métricas están activas.
+    """
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=BUCKETS_LATENCIA):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # El último es +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def time(self, function):
+        """
+        Envuelve 'function' para observar cuánto tarda cada llamada.
+
+        Retorna:
+        - La función envuelta
+        """
+        perf_counter = time.perf_counter
+        observe = self.observe
+
+        def timed(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(perf_counter() - started)
+        return timed
+
+    def samples(self):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            samples.append((self.name + "_bucket", {"le": _format_value(float(bound))}, cumulative))
+        samples.append((self.name + "_sum", None, total))
+        samples.append((self.name + "_count", None, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas de un proceso.
+
+    counter()/gauge()/histogram() crean la métrica o devuelven la ya
+    registrada con ese nombre (un ParkingLot nuevo después de Reiniciar
+    sigue sumando a los mismos histogramas).
+
+    Los collectors son funciones que se llaman en cada scrape y devuelven
+    [(nombre, tipo, ayuda, valor)], donde valor es un número o una lista de
+    (labels, número). Sirven para leer varios valores de una sola vez (p. ej.
+    todo de un mismo ParkingLot.snapshot()) sin costo en el camino caliente.
+    Un collector que falla no tumba el scrape: se omiten sus valores y se
+    cuenta en metricas_errores_collector_total.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._collector_errors = self.counter(
+            "metricas_errores_collector_total", "Collectors que fallaron durante un scrape")
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"La métrica {name} ya existe con otro tipo ({metric.kind})")
+            return metric
+
+    def counter(self, name, help, function=None):
+        return self._get_or_create(Counter, name, help, function)
+
+    def gauge(self, name, help, function=None):
+        return self._get_or_create(Gauge, name, help, function)
+
+    def histogram(self, name, help, buckets=BUCKETS_LATENCIA):
+        return self._get_or_create(Histogram, name, help, buckets)
+
+    def add_collector(self, collector):
+        """collector() -> [(nombre, tipo, ayuda, valor)], llamado en cada scrape."""
+        self._collectors.append(collector)
+
+    def render(self):
+        """Todas las métricas en el formato de texto de Prometheus."""
+        # Primero los collectors, así un error ya cuenta en este mismo scrape
+        collected = []
+        for collector in list(self._collectors):
+            try:
+                own = []
+                for name, kind, help, value in collector():
+                    if isinstance(value, list):
+                        samples = [(name, labels, v) for labels, v in value]
+                    else:
+                        samples = [(name, None, value)]
+                    own.append((name, kind, help, samples))
+            except Exception:
+                self._collector_errors.inc()
+                continue
+            collected.extend(own)
+        families = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            families.append((metric.name, metric.kind, metric.help, metric.samples()))
+        families.extend(collected)
+
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample, labels, value in samples:
+                lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# === ENDPOINT HTTP ===
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    registry = None  # Se asigna en la subclase que crea MetricsServer
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404, "Solo /metrics")
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", TIPO_CONTENIDO)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Un scrape cada pocos segundos no va a la consola
+
+
+class MetricsServer:
+    """
+    Sirve GET /metrics en un hilo propio (daemon), fuera del hilo de Tk.
+
+    Cada scrape llama registry.render() en el hilo del servidor: los
+    collectors leen sin tomar locks de la simulación.
+    """
+
+    def __init__(self, registry, port, host="127.0.0.1"):
+        """
+        Parámetros:
+        - port: Puerto TCP (0 = uno libre; ver self.port)
+        - host: Interfaz donde escuchar (por defecto solo local)
+        """
+        handler = type("MetricsHandler", (_Handler,), {"registry": registry})
+        self._server = http.server.ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer",
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# === SCRAPER LOCAL ===
+
+def parse(text):
+    """
+    Lee el formato de texto de Prometheus.
+
+    Retorna:
+    - dict muestra -> valor, con la muestra tal como aparece (con labels),
+      p. ej. 'parqueadero_ocupados' o 'ui_frame_segundos_bucket{le="0.01"}'
+    """
+    values = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        sample, _, value = line.rpartition(" ")
+        values[sample] = float(value)
+    return values
+
+
+def scrape(url, timeout=5):
+    """Hace un GET a 'url' (un /metrics) y retorna parse() de la respuesta."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return parse(response.read().decode("utf-8"))
+
+
+def main(argv=None):
+    """Scraper de prueba: lee el endpoint cada tantos segundos y muestra los valores."""
+    parser = argparse.ArgumentParser(description="Scraper local del endpoint /metrics")
+    parser.add_argument("url", nargs="?", default="http://127.0.0.1:9464/metrics")
+    parser.add_argument("--cada", type=float, default=0, help="Segundos entre scrapes (0 = uno solo)")
+    parser.add_argument("--filtro", default="", help="Mostrar solo las muestras que empiezan así")
+    args = parser.parse_args(argv)
+
+    while True:
+        try:
+            values = scrape(args.url)
+        except OSError as e:
+            raise SystemExit(f"No se pudo leer {args.url}: {e}")
+        print(f"--- {time.strftime('%H:%M:%S')} {args.url}")
+        for sample, value in values.items():
+            if sample.startswith(args.filtro):
+                print(f"{sample} {_format_value(value)}")
+        if not args.cada:
+            return
+        time.sleep(args.cada)
+
+
+if __name__ == "__main__":
+    main()
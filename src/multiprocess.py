@@ -0,0 +1,355 @@
+import math
+import multiprocessing
+import random
+import time
+from array import array
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from config import CAPACIDAD
+from engine import DiscreteEventEngine
+from events import EventKind
+from parking_lot import ParkingLot
+from settings import SETTINGS
+from slots import LIBRE, OCUPADO
+
+# Tiempo virtual (segundos simulados) que avanza cada proceso antes de sincronizarse
+VENTANA_SINCRONIZACION = 1.0
+
+# Estructura del bloque de memoria compartida (n = procesos, c = capacidad):
+#   [0:16]  int64    capacidad, procesos
+#   float64[3n]      por proceso: espacios libres, vehículos en su fila, próximo evento
+#   float64[n*c]     por proceso: desde cuándo esperan los primeros de su fila
+#   int32[n*c]       por proceso: índices de los espacios libres que tiene
+#   uint8[c]         estado de cada espacio (slots.LIBRE / slots.OCUPADO)
+# Cada proceso escribe solo su parte; entre barreras todos leen
+_HEADER = 16
+
+
+def _distribute(free_lists, waiting_lists, turn=0):
+    """
+    Reparte los espacios libres de todos los procesos (igual en todos ellos).
+
+    Primero a los vehículos que esperan, en orden de llegada entre todos los
+    procesos (empate: el proceso de menor número); lo que sobra se reparte
+    parejo, empezando por el proceso 'turn' para no favorecer siempre al mismo.
+
+    Parámetros:
+    - free_lists: Índices libres de cada proceso
+    - waiting_lists: Desde cuándo espera cada vehículo de la fila de cada proceso
+
+    Retorna:
+    - Lista con los índices libres que le tocan a cada proceso
+    """
+    workers = len(free_lists)
+    pool = sorted(index for free in free_lists for index in free)
+    oldest = sorted((since, worker) for worker, waiting in enumerate(waiting_lists)
+                    for since in waiting)[:len(pool)]
+    grants = [0] * workers
+    for _, worker in oldest:
+        grants[worker] += 1
+    for k in range(len(pool) - len(oldest)):
+        grants[(turn + k) % workers] += 1
+    shares, start = [], 0
+    for count in grants:
+        shares.append(pool[start:start + count])
+        start += count
+    return shares
+
+
+class SharedParkingLot:
+    """
+    Parqueadero repartido entre procesos en multiprocessing.shared_memory.
+
+    Cada espacio pertenece en todo momento a un solo proceso, así que entrar
+    y salir son operaciones locales O(1), sin lock. Los procesos avanzan su
+    reloj virtual de a una ventana (VENTANA_SINCRONIZACION) y se encuentran
+    en una barrera: cada uno publica sus espacios libres y su fila, y todos
+    calculan el mismo reparto con _distribute(). Como ningún proceso toma
+    un espacio de otro mientras corre, el resultado no depende de cómo el
+    sistema operativo reparte los procesos: con la misma semilla, la misma
+    corrida. El costo es que un espacio liberado en un proceso llega a la
+    fila de otro recién en el siguiente cruce (a lo sumo una ventana).
+
+    Misma interfaz básica que ParkingLot para el motor; try_enter() nunca
+    bloquea (la espera la maneja el motor de eventos).
+    """
+
+    def __init__(self, capacidad, workers=1, name=None, worker_id=None):
+        """
+        Parámetros:
+        - capacidad: Número de espacios
+        - workers: Procesos que comparten el parqueadero
+        - name: Nombre de un bloque existente (None = crear uno nuevo)
+        - worker_id: Número de este proceso (None = solo crea/elimina el bloque)
+        """
+        self.capacidad = capacidad
+        self.workers = workers
+        self.worker_id = worker_id
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner,
+                                               size=_HEADER + 8 * 3 * workers + 12 * workers * capacidad
+                                               + capacidad)
+        buf = self._shm.buf
+        offset = _HEADER
+        self._header = buf[:offset].cast("q")
+        self._control = buf[offset:offset + 24 * workers].cast("d")
+        offset += 24 * workers
+        self._since = buf[offset:offset + 8 * workers * capacidad].cast("d")
+        offset += 8 * workers * capacidad
+        self._free_lists = buf[offset:offset + 4 * workers * capacidad].cast("i")
+        offset += 4 * workers * capacidad
+        self._state = buf[offset:offset + capacidad]
+        self._assigned = {}  # Espacios de los vehículos de ESTE proceso
+        self._free = []      # Espacios libres que tiene ESTE proceso
+
+        if self._owner:
+            self._header[0] = capacidad
+            self._header[1] = workers
+        if worker_id is not None:
+            # Reparto inicial: parejo, sin filas todavía
+            shares = _distribute([list(range(capacidad))] + [[]] * (workers - 1), [[]] * workers)
+            self._free = shares[worker_id][::-1]  # pop() entrega primero los índices bajos
+
+    @property
+    def name(self):
+        """Nombre del bloque compartido (para conectarse desde otro proceso)."""
+        return self._shm.name
+
+    def try_enter(self, vehicle_name, timeout=0, stop_event=None, vehicle_type=None):
+        """
+        Toma uno de los espacios libres de este proceso, si tiene.
+
+        Retorna:
+        - True si logró entrar
+        - False si este proceso no tiene espacios libres
+        """
+        if not self._free:
+            return False
+        index = self._free.pop()
+        self._state[index] = OCUPADO
+        self._assigned[vehicle_name] = index
+        return True
+
+    def exit(self, vehicle_name):
+        """El espacio del vehículo queda libre en este proceso hasta el próximo reparto."""
+        index = self._assigned.pop(vehicle_name, None)
+        if index is None:
+            return
+        self._state[index] = LIBRE
+        self._free.append(index)
+
+    def slot_of(self, vehicle_name):
+        """Índice del espacio que ocupa el vehículo (None si no está adentro)."""
+        return self._assigned.get(vehicle_name)
+
+    def get_slot_states(self):
+        """Estado de todos los espacios (de todos los procesos)."""
+        return bytes(self._state)
+
+    def get_occupied_count(self):
+        """Espacios ocupados en total (de todos los procesos)."""
+        return self.capacidad - bytes(self._state).count(LIBRE)
+
+    # === SINCRONIZACIÓN ENTRE VENTANAS ===
+
+    def publish(self, waiting_since, next_event):
+        """
+        Deja en el bloque los espacios libres y la fila de este proceso.
+
+        Parámetros:
+        - waiting_since: Desde cuándo esperan los primeros de la fila (hasta 'capacidad')
+        - next_event: Tiempo virtual de su próximo evento (math.inf si no tiene)
+        """
+        base = self.worker_id * self.capacidad
+        self._free_lists[base:base + len(self._free)] = array("i", self._free)
+        self._since[base:base + len(waiting_since)] = array("d", waiting_since)
+        control = 3 * self.worker_id
+        self._control[control] = len(self._free)
+        self._control[control + 1] = len(waiting_since)
+        self._control[control + 2] = next_event
+
+    def rebalance(self, turn):
+        """
+        Lee lo que publicaron todos, calcula el reparto (el mismo en todos los
+        procesos) y se queda con lo que le toca. Llamar entre dos barreras:
+        después de que todos publicaron y antes de que alguno vuelva a publicar.
+
+        Retorna:
+        - (espacios libres de este proceso después del reparto,
+           próximo evento entre todos los procesos: math.inf si no queda ninguno)
+        """
+        free_lists, waiting_lists, next_events = [], [], []
+        for worker in range(self.workers):
+            base = worker * self.capacidad
+            free, waiting, next_event = self._control[3 * worker:3 * worker + 3]
+            free_lists.append(self._free_lists[base:base + int(free)].tolist())
+            waiting_lists.append(self._since[base:base + int(waiting)].tolist())
+            # Un proceso con fila y sin eventos sigue esperando un espacio de otro
+            next_events.append(next_event if not waiting else -math.inf)
+        self._free = _distribute(free_lists, waiting_lists, turn)[self.worker_id][::-1]
+        return len(self._free), min(next_events)
+
+    def close(self):
+        """Se desconecta del bloque; el proceso que lo creó además lo elimina."""
+        for view in (self._header, self._control, self._since, self._free_lists, self._state):
+            view.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _worker(worker_id, workers, vehicles, capacidad, interval, seed, shm_name, barrier,
+            window, conn, batch_size, wait_range, dwell_range):
+    """
+    Proceso trabajador: simula con su propio motor de eventos los vehículos
+    worker_id, worker_id + workers, worker_id + 2*workers, ... y envía sus
+    eventos al proceso principal por el pipe, en lotes de 'batch_size'.
+
+    Con parqueadero compartido avanza de a 'window' segundos simulados y en
+    cada cruce de la barrera reparte los espacios libres con los demás
+    (ver SharedParkingLot).
+
+    Los tiempos llegan como argumentos (no se leen de SETTINGS): un proceso
+    iniciado con "spawn" no hereda la configuración del principal.
+    """
+    if shm_name is not None:
+        lot = SharedParkingLot(capacidad, workers, shm_name, worker_id)
+    else:
+        lot = ParkingLot(capacidad)  # Parqueadero independiente por proceso
+
+    batch = []
+    last_event = 0.0
+
+    def on_event(kind, vehicle_id, when, slot):
+        nonlocal last_event
+        last_event = when
+        batch.append((kind, vehicle_id, when, slot))
+        if len(batch) >= batch_size:
+            conn.send(("eventos", batch))
+            batch.clear()
+
+    engine = DiscreteEventEngine(seed=seed + worker_id, on_event=on_event, parking_lot=lot,
+                                 wait_range=wait_range, dwell_range=dwell_range)
+    rng = random.Random(seed + worker_id)
+    for i in range(worker_id, vehicles, workers):
+        engine.add_vehicle(i + 1, i * interval + rng.uniform(*wait_range))
+
+    try:
+        if shm_name is None:
+            summary = engine.run()
+        else:
+            until, turn = window, 0
+            while True:
+                summary = engine.run(until)
+                lot.publish(engine.waiting_since(capacidad), engine.next_event_time())
+                barrier.wait()
+                free, next_event = lot.rebalance(turn)
+                barrier.wait()  # Nadie publica de nuevo hasta que todos leyeron
+                if next_event == math.inf:
+                    break
+                engine.admit_waiting(free)
+                turn += 1
+                # Sin filas en ningún proceso, las ventanas sin eventos se saltan
+                skipped = math.ceil((next_event - until) / window) if next_event > until else 1
+                until += window * max(1, skipped)
+            # run(until) deja el reloj en el fin de la ventana; el tiempo simulado es el del último evento
+            summary["tiempo_simulado"] = last_event
+    except BaseException:
+        if barrier is not None:
+            barrier.abort()  # Los demás procesos no se quedan esperando en la barrera
+        raise
+    finally:
+        if shm_name is not None:
+            lot.close()
+
+    if batch:
+        conn.send(("eventos", batch))
+    conn.send(("resumen", summary))
+    conn.close()
+
+
+def run_multiprocess(vehicles, workers=None, capacidad=CAPACIDAD, interval=0.5, seed=42,
+                     shared=True, batch_size=5000, on_events=None, window=VENTANA_SINCRONIZACION):
+    """
+    Simula en varios procesos (uno por núcleo por defecto).
+
+    Parámetros:
+    - workers: Número de procesos (None = os.cpu_count())
+    - shared: True = todos comparten un parqueadero en memoria compartida;
+              False = cada proceso simula su propio parqueadero independiente
+    - batch_size: Eventos por mensaje del pipe
+    - on_events: Callback opcional on_events(lista de (tipo, vehicle_id, tiempo, espacio))
+    - window: Segundos simulados entre repartos de espacios (solo con shared)
+
+    Retorna:
+    - dict con el resumen combinado de todos los procesos
+    """
+    workers = workers or multiprocessing.cpu_count()
+    wait_range = (SETTINGS.TIEMPO_MIN_ESPERA, SETTINGS.TIEMPO_MAX_ESPERA)
+    dwell_range = (SETTINGS.TIEMPO_MIN_ESTACIONADO, SETTINGS.TIEMPO_MAX_ESTACIONADO)
+    lot = SharedParkingLot(capacidad, workers) if shared else None
+    barrier = multiprocessing.Barrier(workers) if shared else None
+    started = time.perf_counter()
+
+    conns, processes = [], []
+    for worker_id in range(workers):
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        p = multiprocessing.Process(
+            target=_worker,
+            args=(worker_id, workers, vehicles, capacidad, interval, seed,
+                  lot.name if lot else None, barrier, window,
+                  child_conn, batch_size, wait_range, dwell_range),
+            name=f"SimWorker-{worker_id}")
+        p.start()
+        child_conn.close()
+        conns.append(parent_conn)
+        processes.append(p)
+
+    event_counts = dict.fromkeys(EventKind, 0)
+    summaries = []
+    finished = set()
+    pending = list(conns)
+    while pending:
+        for conn in wait(pending):
+            try:
+                tag, payload = conn.recv()
+            except EOFError:
+                pending.remove(conn)
+                if barrier is not None and conn not in finished:
+                    barrier.abort()  # Un proceso terminó sin resumen: los demás no lo esperan
+                continue
+            if tag == "eventos":
+                for kind, _, _, _ in payload:
+                    event_counts[kind] += 1
+                if on_events is not None:
+                    on_events(payload)
+            else:
+                summaries.append(payload)
+                finished.add(conn)
+
+    for p in processes:
+        p.join()
+    elapsed = time.perf_counter() - started
+    if lot is not None:
+        lot.close()
+    if len(summaries) < workers:
+        raise RuntimeError(f"{workers - len(summaries)} de {workers} procesos terminaron con error")
+
+    parked = sum(s["estacionados"] for s in summaries)
+    return {
+        "procesos": workers,
+        "modo": "compartido" if shared else "independiente",
+        "capacidad": capacidad if shared else capacidad * workers,
+        "vehiculos_creados": sum(s["vehiculos_creados"] for s in summaries),
+        "estacionados": parked,
+        "completados": sum(s["completados"] for s in summaries),
+        "vehiculos_que_esperaron": sum(s["vehiculos_que_esperaron"] for s in summaries),
+        "max_en_espera": max((s["max_en_espera"] for s in summaries), default=0),
+        "rechazos": sum(s["rechazos"] for s in summaries),
+        "espera_promedio": (sum(s["espera_promedio"] * s["estacionados"] for s in summaries) / parked
+                            if parked else 0.0),
+        "eventos_recibidos": sum(event_counts.values()),
+        "tiempo_simulado": max((s["tiempo_simulado"] for s in summaries), default=0.0),
+        "tiempo_real": elapsed,
+        "vehiculos_por_segundo": vehicles / elapsed if elapsed else 0.0,
+    }
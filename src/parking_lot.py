@@ -1,55 +1,459 @@
+import asyncio
+import bisect
 import threading
+import time
+from collections import deque
+from typing import NamedTuple
+from clock import WALL_CLOCK
+from slots import SlotAllocator, SlotType, build_slots, default_layout
+
+# Límites superiores (segundos) de los buckets del histograma de espera
+WAIT_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60, float("inf"))
+
+
+class LotSnapshot(NamedTuple):
+    """
+    Estado del parqueadero en un instante, consistente: todos los campos
+    corresponden a la misma versión (ver ParkingLot.snapshot()).
+    """
+    version: int         # Escrituras hasta este estado (crece con cada una)
+    capacidad: int
+    occupied: int
+    waiting: int         # Vehículos en la fila
+    slot_states: bytes   # slots.LIBRE / slots.OCUPADO por espacio
+    entries: int         # Entradas desde que se creó el parqueadero
+    exits: int           # Salidas
+    waits: int           # Entradas que tuvieron que hacer fila
+    max_waiting: int     # Fila más larga
+
+
+class _Waiter:
+    """Un vehículo bloqueado en la fila de entrada (uno por hilo en espera)."""
+    __slots__ = ("name", "vehicle_type", "event", "granted", "slot", "since", "priority")
+
+    def __init__(self, name, vehicle_type, since=None, priority=0):
+        self.name = name
+        self.vehicle_type = vehicle_type
+        self.priority = priority        # Clase de prioridad (AdmissionPolicy)
+        self.event = threading.Event()  # Se activa al recibir espacio o al cancelar
+        self.granted = False            # True si exit() le entregó un espacio
+        self.slot = None                # Índice del espacio entregado
+        self.since = time.monotonic() if since is None else since
+
 
 class ParkingLot:
     """
     Clase que representa el recurso compartido (parqueadero).
-    Controla concurrencia con semáforo y lock.
+    Controla concurrencia con un lock y una fila FIFO de espera.
+
+    Funciona como un semáforo justo: 'occupied' cuenta los permisos tomados y
+    los vehículos que encuentran el parqueadero lleno esperan en orden de
+    llegada. Cuando uno sale, el espacio se entrega directamente al primero de
+    la fila y solo ese hilo se despierta (una sola señal por espacio liberado,
+    sin sondeo con timeout).
+
+    Cada vehículo recibe un espacio concreto (nivel, zona, tipo) de un
+    SlotAllocator; slot_of() dice cuál tiene y get_slot_states() da el estado
+    de todos los espacios para la GUI.
+
+    Los timeouts y tiempos de espera se miden con 'clock' (por defecto el
+    reloj real; con un clock.SimulationClock, en tiempo simulado).
+
+    Lectores sin lock: snapshot() da ocupación, estado de cada espacio, fila
+    y contadores de una misma versión (seqlock). Los escritores (con el lock)
+    marcan una versión impar mientras cambian el estado; el lector copia sin
+    tomar el lock y reintenta si la versión cambió en el medio. Así la GUI y
+    los exportadores nunca frenan a los vehículos ni ven un estado a medias.
+
+    Con una 'policy' (policies.AdmissionPolicy) la entrada deja de ser solo
+    por orden de llegada: la política decide quién puede tomar un espacio
+    libre (reservas), en qué orden se atiende la fila (prioridades) y qué
+    pasa al entrar y salir (tarifas). Sin política no se consulta nada.
+
+    Con puertas (gates.GateBank de entrada y de salida) cada vehículo cruza
+    una barrera antes de pedir espacio y otra antes de liberarlo: las
+    barreras atienden de a uno, así que con mucho tráfico pueden limitar el
+    throughput antes que los espacios. Sin puertas entrar y salir es instantáneo.
+
+    Con 'metrics' (metrics.MetricsRegistry) try_enter y exit se miden: cada
+    llamada alimenta un histograma de duración y los rechazos se cuentan.
+    Sin métricas se usan los métodos de la clase tal cual, sin costo extra.
 
     Tiene métodos propios para entrada/salida para esconder los detalles internos
     """
 
-    def __init__(self, capacidad):
-        self.capacidad = capacidad
+    def __init__(self, capacidad, layout=None, clock=None, policy=None,
+                 entry_gates=None, exit_gates=None, metrics=None):
+        """
+        Parámetros:
+        - capacidad: Número de espacios estándar (si no se da 'layout')
+        - layout: Distribución opcional [(nivel, zona, tipo, cantidad), ...]
+        - clock: Reloj de los timeouts y esperas (None = tiempo real)
+        - policy: policies.AdmissionPolicy opcional (None = FIFO sin restricciones)
+        - entry_gates / exit_gates: gates.GateBank opcionales (None = sin barreras)
+        - metrics: metrics.MetricsRegistry opcional (None = sin instrumentación)
+        """
+        self.clock = clock or WALL_CLOCK
+        self.policy = policy
+        self.entry_gates = entry_gates
+        self.exit_gates = exit_gates
+        self.slots = build_slots(layout or default_layout(capacidad))
+        self.capacidad = len(self.slots)
         self.occupied = 0
         # NOTA: Estos son "privados" (conceptualmente) - no acceder directamente
         self.lock = threading.Lock()
-        self.semaphore = threading.Semaphore(capacidad)
+        self._waiters = deque()  # Fila FIFO de _Waiter
+        self._allocator = SlotAllocator(self.slots)
+        self._assigned = {}      # vehicle_name -> índice del espacio que ocupa
+        # Versión del seqlock: impar mientras un escritor cambia el estado
+        self._version = 0
+
+        # Contadores (se leen juntos con snapshot())
+        self.entries = 0
+        self.exits = 0
+
+        # Métricas de la fila de espera
+        self.max_queue_depth = 0
+        self.wait_count = 0          # Vehículos que entraron después de esperar
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.wait_histogram = [0] * len(WAIT_BUCKETS)
+
+        if metrics is not None:
+            self._instrument(metrics)
 
-    def try_enter(self, vehicle_name, timeout=2):
+    def _instrument(self, metrics):
+        """
+        Reemplaza try_enter y exit de esta instancia por versiones medidas.
+
+        Los atributos de instancia tapan a los métodos de la clase, así que
+        un parqueadero sin métricas no paga ni una comprobación por llamada.
+        """
+        enter_seconds = metrics.histogram(
+            "parqueadero_try_enter_segundos", "Duración de try_enter en segundos reales (incluye la fila)")
+        rejections = metrics.counter(
+            "parqueadero_rechazos_total", "Llamadas a try_enter que no consiguieron espacio")
+        try_enter = self.try_enter
+        perf_counter = time.perf_counter
+
+        def timed_try_enter(*args, **kwargs):
+            started = perf_counter()
+            entered = try_enter(*args, **kwargs)
+            enter_seconds.observe(perf_counter() - started)
+            if not entered:
+                rejections.inc()
+            return entered
+
+        self.try_enter = timed_try_enter
+        self.exit = metrics.histogram(
+            "parqueadero_exit_segundos", "Duración de exit en segundos reales").time(self.exit)
+
+    def try_enter(self, vehicle_name, timeout=2, stop_event=None, vehicle_type=SlotType.ESTANDAR):
         """
         Intenta que un vehículo entre al parqueadero.
 
+        Si está lleno, el vehículo hace fila (FIFO) hasta que le entreguen un
+        espacio, se cumpla el timeout o se cancele la espera con
+        cancel_waiting() (usado junto con stop_event.set()).
+
         Parámetros:
         - vehicle_name: Nombre del vehículo (para logging)
-        - timeout: Segundos a esperar si está lleno
+        - timeout: Segundos a esperar si está lleno (0 = no esperar, None = sin límite)
+        - stop_event: threading.Event opcional; si está activo no se hace fila
+        - vehicle_type: SlotType que necesita el vehículo
 
         Retorna:
-        - True si logró entrar
+        - True si logró entrar (el espacio asignado se consulta con slot_of())
         - False si está lleno y no pudo entrar
         """
+        policy = self.policy
+        if policy is not None:
+            # Con política un espacio puede quedar libre con fila sin que nadie
+            # salga: una reserva que vence sin que llegue su vehículo suelta el
+            # espacio que retenía. Ese espacio es de la fila, no del que llega
+            self.readmit()
+        with self.lock:
+            self._version += 1  # Impar: escritura en curso (ver snapshot())
+            try:
+                # Un espacio compatible solo puede estar libre si nadie en la fila
+                # lo puede usar (exit() o readmit() se lo habrían entregado), así
+                # que tomarlo directamente no le quita el turno a nadie. Con
+                # política, los espacios retenidos por reservas solo los toma
+                # quien la política admite.
+                if policy is None or policy.admit(vehicle_name, self.capacidad - self.occupied,
+                                                  self.capacidad, self.clock.now()):
+                    index = self._allocator.allocate(vehicle_type)
+                    if index is not None:
+                        self.occupied += 1
+                        self.entries += 1
+                        self._assigned[vehicle_name] = index
+                        if policy is not None:
+                            policy.on_enter(vehicle_name, self.occupied, self.capacidad, self.clock.now())
+                        return True  # ✅ Logró entrar
+                if timeout == 0 or (stop_event is not None and stop_event.is_set()):
+                    return False  # ❌ No había espacio
+                now = self.clock.now()
+                if policy is None:
+                    waiter = _Waiter(vehicle_name, vehicle_type, now)
+                    self._waiters.append(waiter)
+                else:
+                    waiter = _Waiter(vehicle_name, vehicle_type, now, policy.priority(vehicle_name, now))
+                    self._enqueue(waiter)
+                if len(self._waiters) > self.max_queue_depth:
+                    self.max_queue_depth = len(self._waiters)
+            finally:
+                self._version += 1
 
-        # Intentar adquirir el semáforo (limita cuántos pueden entrar)
-        if self.semaphore.acquire(timeout=timeout):
-            # Adquirimos el lock para modificar 'occupied' de forma segura
-            with self.lock:
-                self.occupied += 1
-            return True  # ✅ Logró entrar
-        else:
-            return False  # ❌ No había espacio
+        self.clock.wait_event(waiter.event, timeout)
+
+        with self.lock:
+            self._version += 1
+            try:
+                if waiter.granted:
+                    self._record_wait(self.clock.now() - waiter.since)
+                    return True  # ✅ exit() nos entregó su espacio
+                # Timeout o cancelación: salir de la fila
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass  # cancel_waiting() ya vació la fila
+                return False
+            finally:
+                self._version += 1
+
+    def _enqueue(self, waiter):
+        """Pone al vehículo en la fila detrás de los de su clase de prioridad o mayor."""
+        waiters = self._waiters
+        position = len(waiters)
+        # Casi siempre llega a la cola (misma clase que el último): O(1)
+        while position and waiters[position - 1].priority < waiter.priority:
+            position -= 1
+        waiters.insert(position, waiter)
+
+    def _record_wait(self, waited):
+        """Registra un tiempo de espera (llamar con el lock tomado)."""
+        self.wait_count += 1
+        self.total_wait_time += waited
+        if waited > self.max_wait_time:
+            self.max_wait_time = waited
+        self.wait_histogram[bisect.bisect_left(WAIT_BUCKETS, waited)] += 1
 
     def exit(self, vehicle_name):
         """
         Un vehículo sale del parqueadero.
 
+        Si hay fila, el espacio pasa directamente al primer vehículo en espera
+        que pueda usarlo (sin pasar por 'libre', así nadie se puede colar).
+        Con un solo tipo de espacio siempre es el primero de la fila.
+
+        Un vehículo que no está estacionado (nunca entró o ya salió) no
+        cambia nada.
+
         Parámetros:
-        - vehicle_name: Nombre del vehículo (para logging futuro)
+        - vehicle_name: Nombre del vehículo que libera su espacio
         """
 
         # Adquirir lock para modificar 'occupied' de forma segura
         with self.lock:
-            self.occupied -= 1
-        # Liberar el semáforo (permite que otro vehículo entre)
-        self.semaphore.release()
+            index = self._assigned.pop(vehicle_name, None)
+            if index is None:
+                return
+            self._version += 1
+            try:
+                self.exits += 1
+                if self.policy is not None:
+                    self.policy.on_exit(vehicle_name, self.clock.now())
+                if index >= len(self.slots):
+                    # Espacio eliminado por resize(): desaparece al quedar vacío
+                    self.occupied -= 1
+                    return
+                waiter = self._take_waiter_for(index)
+                if waiter is None:
+                    self._allocator.release(index)
+                    self.occupied -= 1
+                    return
+                waiter.granted = True
+                waiter.slot = index
+                self._assigned[waiter.name] = index
+                self.entries += 1
+                if self.policy is not None:
+                    self.policy.on_enter(waiter.name, self.occupied, self.capacidad, self.clock.now())
+            finally:
+                self._version += 1
+        # Despertar solo al vehículo que recibió el espacio
+        waiter.event.set()
+
+    def _take_waiter_for(self, index):
+        """Saca de la fila al primer vehículo que puede usar el espacio 'index'."""
+        waiters = self._waiters
+        policy = self.policy
+        if policy is not None:
+            # El espacio que se libera cuenta como libre para la admisión
+            free = self.capacidad - self.occupied + 1
+            now = self.clock.now()
+        for position, waiter in enumerate(waiters):
+            if self._allocator.accepts(index, waiter.vehicle_type) and (
+                    policy is None or policy.admit(waiter.name, free, self.capacidad, now)):
+                if position == 0:
+                    return waiters.popleft()
+                del waiters[position]
+                return waiter
+        return None
+
+    def resize(self, capacidad, layout=None):
+        """
+        Cambia los espacios del parqueadero en caliente, sin detener la simulación.
+
+        Los vehículos que están adentro conservan su espacio. Si el parqueadero
+        se achica y un espacio ocupado deja de existir, su vehículo sale
+        normalmente y el espacio ya no se vuelve a entregar. Si crece, los
+        espacios nuevos se entregan a la fila en orden de llegada.
+
+        Parámetros:
+        - capacidad: Número de espacios estándar (si no se da 'layout')
+        - layout: Distribución opcional [(nivel, zona, tipo, cantidad), ...]
+
+        Retorna:
+        - La nueva lista de slots (para la GUI)
+        """
+        slots = build_slots(layout or default_layout(capacidad))
+        allocator = SlotAllocator(slots)
+        with self.lock:
+            allocator.reserve(index for index in self._assigned.values() if index < len(slots))
+            self._version += 1
+            try:
+                self.slots = slots
+                self.capacidad = len(slots)
+                self._allocator = allocator
+                if self.policy is not None:
+                    self.policy.resize(self.capacidad)
+                granted = self._grant_waiting()
+            finally:
+                self._version += 1
+        for waiter in granted:
+            waiter.event.set()
+        return slots
+
+    def readmit(self):
+        """
+        Entrega a la fila los espacios libres que la política ahora admite
+        (p. ej. cuando vence o se cancela una reserva que retenía un espacio).
+        try_enter() lo llama antes de admitir a alguien nuevo; con la
+        simulación corriendo también se puede llamar después de cancelar una
+        reserva. Sin política nunca hay espacios libres con fila, así que no
+        hace nada.
+
+        Retorna:
+        - Número de vehículos que entraron
+        """
+        with self.lock:
+            if self.policy is not None:
+                self.policy.expire(self.clock.now())
+            if not self._waiters:
+                return 0
+            self._version += 1
+            try:
+                granted = self._grant_waiting()
+            finally:
+                self._version += 1
+        for waiter in granted:
+            waiter.event.set()
+        return len(granted)
+
+    def _grant_waiting(self):
+        """Entrega espacios libres a la fila en orden (llamar con el lock tomado)."""
+        granted = []
+        policy = self.policy
+        for waiter in list(self._waiters):
+            if policy is not None and not policy.admit(waiter.name, self.capacidad - self.occupied,
+                                                       self.capacidad, self.clock.now()):
+                continue
+            index = self._allocator.allocate(waiter.vehicle_type)
+            if index is None:
+                continue
+            self._waiters.remove(waiter)
+            waiter.granted = True
+            waiter.slot = index
+            self._assigned[waiter.name] = index
+            self.occupied += 1
+            self.entries += 1
+            if policy is not None:
+                policy.on_enter(waiter.name, self.occupied, self.capacidad, self.clock.now())
+            granted.append(waiter)
+        return granted
+
+    def cancel_waiting(self):
+        """
+        Despierta a todos los vehículos en la fila (y en las filas de las
+        puertas) sin darles espacio.
+        Se llama después de stop_event.set() para un shutdown ordenado.
+        """
+        with self.lock:
+            waiters = list(self._waiters)
+            self._version += 1
+            self._waiters.clear()
+            self._version += 1
+        for waiter in waiters:
+            waiter.event.set()
+        for gates in (self.entry_gates, self.exit_gates):
+            if gates is not None:
+                gates.cancel_waiting(self.clock.now())
+
+    # === PUERTAS ===
+
+    def pass_entry_gate(self, rng, stop_event=None):
+        """
+        Cruza una barrera de entrada (antes de try_enter).
+
+        Parámetros:
+        - rng: Generador aleatorio del vehículo (tiempo de servicio)
+
+        Retorna:
+        - False si la simulación se detuvo en la fila de la puerta
+        """
+        if self.entry_gates is None:
+            return True
+        return self.entry_gates.pass_through(rng, self.clock, stop_event)
+
+    def pass_exit_gate(self, rng, stop_event=None):
+        """Cruza una barrera de salida (antes de exit; el espacio sigue ocupado mientras tanto)."""
+        if self.exit_gates is None:
+            return True
+        return self.exit_gates.pass_through(rng, self.clock, stop_event)
+
+    def get_gate_stats(self):
+        """
+        Métricas de cada puerta (utilización, fila actual/máxima/promedio, espera).
+
+        Retorna:
+        - Lista de dicts (vacía si no hay puertas)
+        """
+        now = self.clock.now()
+        return [stats for gates in (self.entry_gates, self.exit_gates) if gates is not None
+                for stats in gates.stats(now)]
+
+    def snapshot(self):
+        """
+        Vista consistente del parqueadero sin tomar el lock (lectura de seqlock).
+
+        Copia ocupación, fila, estado de los espacios y contadores, y se
+        queda con la copia solo si la versión no cambió mientras copiaba (y
+        no había un escritor a mitad de camino); si cambió, vuelve a copiar.
+        Los escritores nunca esperan al lector.
+
+        Retorna:
+        - LotSnapshot
+        """
+        while True:
+            version = self._version
+            if version & 1:
+                time.sleep(0)  # Escritor a mitad de camino: cederle el GIL
+                continue
+            snapshot = LotSnapshot(version >> 1, self.capacidad, self.occupied, len(self._waiters),
+                                   bytes(self._allocator.state), self.entries, self.exits,
+                                   self.wait_count, self.max_queue_depth)
+            if self._version == version:
+                return snapshot
 
     def get_occupied_count(self):
         """
@@ -59,6 +463,119 @@ class ParkingLot:
         - int: Cantidad de espacios ocupados actualmente
 
         """
-        # Por ahora, leer un int es atómico en Python, pero es buena práctica
-        # usar un método en lugar de acceso directo
+        # Leer un int es atómico en Python; para leerlo junto con otros
+        # valores (fila, espacios, contadores) usar snapshot()
+        return self.occupied
+
+    def slot_of(self, vehicle_name):
+        """Índice del espacio que ocupa el vehículo (None si no está adentro)."""
+        return self._assigned.get(vehicle_name)
+
+    def get_slot_states(self):
+        """
+        Estado de cada espacio (slots.LIBRE / slots.OCUPADO), indexado igual
+        que self.slots.
+
+        Retorna:
+        - bytes (copia consistente, sin tomar el lock)
+        """
+        return self.snapshot().slot_states
+
+    def get_waiting_count(self):
+        """Número de vehículos haciendo fila en este momento."""
+        return len(self._waiters)
+
+    def get_queue_stats(self):
+        """
+        Métricas de la fila de espera.
+
+        Retorna:
+        - dict con profundidad actual/máxima de la fila, tiempos de espera
+          (promedio y máximo, en segundos) e histograma por buckets
+        """
+        with self.lock:
+            return {
+                "en_fila": len(self._waiters),
+                "max_en_fila": self.max_queue_depth,
+                "esperas": self.wait_count,
+                "espera_promedio": (self.total_wait_time / self.wait_count
+                                    if self.wait_count else 0.0),
+                "espera_max": self.max_wait_time,
+                "histograma_espera": dict(zip(WAIT_BUCKETS, self.wait_histogram)),
+            }
+
+
+class AsyncParkingLot:
+    """
+    Versión asyncio del parqueadero para el runtime de corrutinas.
+
+    Misma interfaz que ParkingLot, pero try_enter/exit son awaitables y la
+    capacidad se controla con un asyncio.Semaphore. Todas las corrutinas corren
+    en un solo hilo (el event loop), así que los contadores no necesitan lock.
+    """
+
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self.occupied = 0
+        self.waiting = 0      # Vehículos con un acquire pendiente en el semáforo
+        self.semaphore = asyncio.Semaphore(capacidad)
+        # Acquire pendiente de cada vehículo que agotó su timeout. Se reutiliza
+        # en el siguiente intento en lugar de cancelarlo: cancelar un waiter de
+        # asyncio.Semaphore lo saca de su deque en O(n).
+        self._pending = {}
+
+    async def try_enter(self, vehicle_name, timeout=2):
+        """
+        Intenta que un vehículo entre al parqueadero sin bloquear el event loop.
+
+        Parámetros:
+        - timeout: Segundos a esperar si está lleno (None = esperar su turno)
+
+        Retorna:
+        - True si logró entrar
+        - False si pasó el timeout sin espacio
+        """
+        acquire = self._pending.pop(vehicle_name, None)
+        if acquire is None:
+            if self.waiting == 0 and self.occupied < self.capacidad:
+                await self.semaphore.acquire()  # Hay espacio: no se suspende
+                self.occupied += 1
+                return True
+            acquire = asyncio.ensure_future(self.semaphore.acquire())
+            self.waiting += 1
+
+        try:
+            done, _ = await asyncio.wait((acquire,), timeout=timeout)
+        except asyncio.CancelledError:
+            self._pending[vehicle_name] = acquire  # Para que abandon() lo libere
+            raise
+        if not done:
+            self._pending[vehicle_name] = acquire  # Sigue en la fila del semáforo
+            return False
+
+        self.waiting -= 1
+        self.occupied += 1
+        return True
+
+    def abandon(self, vehicle_name):
+        """
+        Un vehículo deja de esperar (shutdown). Si su acquire pendiente ya había
+        conseguido espacio, lo devuelve.
+        """
+        acquire = self._pending.pop(vehicle_name, None)
+        if acquire is None:
+            return
+        self.waiting -= 1
+        if acquire.done() and not acquire.cancelled():
+            self.semaphore.release()
+        else:
+            acquire.cancel()
+
+    async def exit(self, vehicle_name):
+        """Un vehículo sale del parqueadero y libera su espacio."""
+        self.occupied -= 1
+        self.semaphore.release()
+
+    def get_occupied_count(self):
+        """Número de espacios ocupados actualmente."""
         return self.occupied
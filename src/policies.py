@@ -0,0 +1,323 @@
+import bisect
+import heapq
+import itertools
+import math
+
+# Clases de prioridad en la fila de entrada (mayor = se atiende antes)
+PRIORIDAD_NORMAL = 0
+PRIORIDAD_RESERVA = 10   # Vehículo que llega dentro de la ventana de su reserva
+
+# Reservas vencidas a partir de las cuales expire() reconstruye el arreglo de inicios
+_VENCIDAS_UNA_A_UNA = 64
+
+# Multiplicador de la tarifa según la ocupación: (ocupación hasta, multiplicador)
+TRAMOS_TARIFA = ((0.5, 1.0), (0.8, 1.5), (1.0, 2.0))
+
+
+class ReservationBook:
+    """
+    Reservas de espacio para ventanas de tiempo futuras [inicio, fin).
+
+    Guarda los inicios y los fines de las reservas pendientes en dos arreglos
+    ordenados. Las reservas vigentes en el instante t son las que empezaron y
+    todavía no terminaron:
+
+        vigentes(t) = #(inicios <= t) - #(fines <= t)
+
+    dos búsquedas binarias, O(log n) aunque haya 100.000+ reservas. Es lo que
+    consulta la admisión en cada try_enter. Agregar o quitar una reserva
+    cuesta O(log n) más el corrimiento del arreglo (un memmove).
+
+    Las reservas se identifican por número; cada una pertenece a un vehículo
+    (por nombre, el mismo que reciben try_enter y exit). Una reserva sale de
+    los arreglos cuando su vehículo entra (check_in), cuando se cancela o,
+    si nadie llegó, cuando expire() la limpia después de su fin (un heap por
+    fin: O(log n) por reserva vencida, sin recorrer las demás).
+
+    Los tiempos están en la misma escala que el reloj del parqueadero.
+    No es thread-safe por sí solo: ParkingLot lo usa con su lock tomado.
+    """
+
+    def __init__(self, limit=None):
+        """
+        Parámetros:
+        - limit: Reservas simultáneas máximas (None = sin límite); con
+          sobreventa puede ser mayor que la capacidad
+        """
+        self.limit = limit
+        self._starts = []         # Inicios de las reservas pendientes (ordenados)
+        self._ends = []           # Fines de las reservas pendientes (ordenados)
+        self._reservations = {}   # id -> (vehículo, inicio, fin)
+        self._by_vehicle = {}     # vehículo -> [id, ...]
+        self._expiry = []         # Heap de (fin, id); las ya canceladas se saltan al vencer
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._reservations)
+
+    def book(self, vehicle_name, start, end):
+        """
+        Reserva un espacio para 'vehicle_name' entre 'start' y 'end'.
+
+        Retorna:
+        - id de la reserva, o None si la ventana ya tiene 'limit' reservas
+        """
+        if end <= start:
+            raise ValueError(f"Reserva inválida: fin {end} <= inicio {start}")
+        if self.limit is not None and self.peak(start, end) >= self.limit:
+            return None
+        reservation_id = next(self._ids)
+        bisect.insort(self._starts, start)
+        bisect.insort(self._ends, end)
+        self._reservations[reservation_id] = (vehicle_name, start, end)
+        self._by_vehicle.setdefault(vehicle_name, []).append(reservation_id)
+        heapq.heappush(self._expiry, (end, reservation_id))
+        return reservation_id
+
+    def cancel(self, reservation_id):
+        """Anula una reserva pendiente (libera su lugar en la ventana)."""
+        start, end = self._forget(reservation_id)
+        self._remove(start, end)
+
+    def _forget(self, reservation_id):
+        """Saca la reserva de los diccionarios (no de los arreglos). Retorna (inicio, fin)."""
+        vehicle_name, start, end = self._reservations.pop(reservation_id)
+        ids = self._by_vehicle[vehicle_name]
+        ids.remove(reservation_id)
+        if not ids:
+            del self._by_vehicle[vehicle_name]
+        return start, end
+
+    # El vehículo llegó: su reserva ya no retiene un espacio libre
+    check_in = cancel
+
+    def _remove(self, start, end):
+        del self._starts[bisect.bisect_left(self._starts, start)]
+        del self._ends[bisect.bisect_left(self._ends, end)]
+
+    def held(self, now):
+        """Reservas vigentes en 'now' cuyo vehículo todavía no llegó. O(log n)."""
+        return bisect.bisect_right(self._starts, now) - bisect.bisect_right(self._ends, now)
+
+    def peak(self, start, end):
+        """
+        Máximo de reservas simultáneas dentro de [start, end).
+
+        O(log n + k), con k las reservas que empiezan o terminan dentro de la ventana.
+        """
+        starts, ends = self._starts, self._ends
+        current = peak = self.held(start)
+        i = bisect.bisect_right(starts, start)
+        j = bisect.bisect_right(ends, start)
+        stop_i = bisect.bisect_left(starts, end)
+        stop_j = bisect.bisect_left(ends, end)
+        # Recorrer en orden los bordes de la ventana; en un empate el fin va
+        # primero (las ventanas son semiabiertas)
+        while i < stop_i:
+            if j < stop_j and ends[j] <= starts[i]:
+                current -= 1
+                j += 1
+            else:
+                current += 1
+                i += 1
+                if current > peak:
+                    peak = current
+        return peak
+
+    def active_for(self, vehicle_name, now):
+        """id de la reserva de 'vehicle_name' vigente en 'now' (None si no tiene)."""
+        for reservation_id in self._by_vehicle.get(vehicle_name, ()):
+            _, start, end = self._reservations[reservation_id]
+            if start <= now < end:
+                return reservation_id
+        return None
+
+    def expire(self, now):
+        """
+        Olvida las reservas que terminaron sin que su vehículo llegara.
+
+        Retorna:
+        - Número de reservas eliminadas
+        """
+        expiry = self._expiry
+        starts = []
+        while expiry and expiry[0][0] <= now:
+            _, reservation_id = heapq.heappop(expiry)
+            if reservation_id in self._reservations:
+                starts.append(self._forget(reservation_id)[0])
+        if not starts:
+            return 0
+        # Todo fin <= now pendiente es de una reserva vencida: un solo corte
+        del self._ends[:bisect.bisect_right(self._ends, now)]
+        if len(starts) <= _VENCIDAS_UNA_A_UNA:
+            for start in starts:
+                del self._starts[bisect.bisect_left(self._starts, start)]
+        else:
+            # Muchas juntas (p. ej. después de un rato sin llegadas): una
+            # pasada O(n) en lugar de un corrimiento del arreglo por cada una
+            starts.sort()
+            kept, k = [], 0
+            for start in self._starts:
+                if k < len(starts) and start == starts[k]:
+                    k += 1
+                else:
+                    kept.append(start)
+            self._starts = kept
+        return len(starts)
+
+
+class DynamicPricing:
+    """
+    Tarifa por hora que sube con la ocupación.
+
+    La tarifa se fija al entrar (según la ocupación de ese momento) y se
+    cobra al salir por el tiempo estacionado. Los vehículos con reserva
+    pagan la tarifa base: su precio se acordó al reservar.
+    """
+
+    def __init__(self, base_rate, tiers=TRAMOS_TARIFA):
+        """
+        Parámetros:
+        - base_rate: Tarifa por hora con el parqueadero vacío
+        - tiers: Tramos (ocupación hasta, multiplicador) en orden creciente
+        """
+        self.base_rate = base_rate
+        self._limits = [limit for limit, _ in tiers]
+        self._factors = [factor for _, factor in tiers]
+        self.revenue = 0.0
+        self.charged = 0
+        self._quotes = {}   # vehículo -> (tarifa, hora de entrada)
+
+    def rate(self, occupancy):
+        """Tarifa por hora para una ocupación entre 0 y 1."""
+        index = min(bisect.bisect_left(self._limits, occupancy), len(self._factors) - 1)
+        return self.base_rate * self._factors[index]
+
+    def quote(self, vehicle_name, occupancy, now, reserved=False):
+        """Fija la tarifa de un vehículo que entra."""
+        rate = self.base_rate if reserved else self.rate(occupancy)
+        self._quotes[vehicle_name] = (rate, now)
+        return rate
+
+    def charge(self, vehicle_name, now):
+        """
+        Cobra la estadía de un vehículo que sale.
+
+        Retorna:
+        - Monto cobrado (0.0 si el vehículo no tenía tarifa)
+        """
+        quote = self._quotes.pop(vehicle_name, None)
+        if quote is None:
+            return 0.0
+        rate, since = quote
+        amount = rate * max(0.0, now - since) / 3600
+        self.revenue += amount
+        self.charged += 1
+        return amount
+
+
+class AdmissionPolicy:
+    """
+    Política de admisión de ParkingLot: primero en llegar, primero en entrar,
+    sin restricciones (el comportamiento sin política).
+
+    ParkingLot la consulta con su lock tomado:
+    - admit() antes de entregar un espacio libre (en try_enter, en exit al
+      pasar el espacio a la fila y en readmit)
+    - expire() al comienzo de cada try_enter y readmit, para olvidar lo vencido
+    - priority() al poner un vehículo en la fila
+    - on_enter() / on_exit() cuando un vehículo entra o sale
+
+    Las subclases redefinen lo que necesitan; todo debe ser O(log n) o
+    mejor, porque corre dentro de la sección crítica del parqueadero.
+    """
+
+    def admit(self, vehicle_name, free, capacidad, now):
+        """
+        ¿Puede 'vehicle_name' tomar uno de los 'free' espacios libres?
+
+        Un vehículo no admitido hace fila como si el parqueadero estuviera lleno.
+        """
+        return True
+
+    def priority(self, vehicle_name, now):
+        """Clase de prioridad en la fila (mayor = antes; FIFO dentro de la misma clase)."""
+        return PRIORIDAD_NORMAL
+
+    def expire(self, now):
+        """Olvida lo que venció hasta 'now' (p. ej. reservas a las que nadie llegó)."""
+
+    def on_enter(self, vehicle_name, occupied, capacidad, now):
+        pass
+
+    def on_exit(self, vehicle_name, now):
+        pass
+
+    def resize(self, capacidad):
+        """La capacidad del parqueadero cambió (ParkingLot.resize)."""
+
+
+class ReservationPolicy(AdmissionPolicy):
+    """
+    Reservas, clases de prioridad, sobreventa y tarifa dinámica.
+
+    - Reservas: cada reserva vigente retiene un espacio libre. Un vehículo
+      sin reserva solo entra si quedan más espacios libres que reservas
+      vigentes sin llegar; uno con reserva entra a cualquier espacio libre y,
+      si está lleno, hace fila con PRIORIDAD_RESERVA
+    - Sobreventa: el libro acepta hasta capacidad * overbooking reservas
+      simultáneas (contando con que algunas no llegan)
+    - Prioridades: set_priority(vehículo, clase) adelanta a un vehículo en la fila
+    - Tarifa: DynamicPricing opcional, fijada al entrar y cobrada al salir
+
+    Con la simulación corriendo, reservar o cancelar en 'book' con el lock
+    del parqueadero tomado (with lot.lock: ...) y luego llamar lot.readmit().
+    """
+
+    def __init__(self, capacidad, overbooking=1.0, pricing=None):
+        """
+        Parámetros:
+        - capacidad: Espacios del parqueadero (para el límite de reservas)
+        - overbooking: Reservas simultáneas por espacio (1.0 = sin sobreventa)
+        - pricing: DynamicPricing opcional
+        """
+        if overbooking <= 0:
+            raise ValueError("overbooking debe ser mayor que 0")
+        self.overbooking = overbooking
+        self.book = ReservationBook(math.floor(capacidad * overbooking))
+        self.pricing = pricing
+        self.classes = {}      # vehículo -> clase de prioridad
+
+    def set_priority(self, vehicle_name, priority):
+        self.classes[vehicle_name] = priority
+
+    def resize(self, capacidad):
+        self.book.limit = math.floor(capacidad * self.overbooking)
+
+    def expire(self, now):
+        self.book.expire(now)
+
+    def admit(self, vehicle_name, free, capacidad, now):
+        book = self.book
+        if book.active_for(vehicle_name, now) is not None:
+            return True
+        return free > min(book.held(now), capacidad)
+
+    def priority(self, vehicle_name, now):
+        priority = self.classes.get(vehicle_name, PRIORIDAD_NORMAL)
+        if self.book.active_for(vehicle_name, now) is not None:
+            priority = max(priority, PRIORIDAD_RESERVA)
+        return priority
+
+    def on_enter(self, vehicle_name, occupied, capacidad, now):
+        reservation_id = self.book.active_for(vehicle_name, now)
+        if reservation_id is not None:
+            self.book.check_in(reservation_id)
+        if self.pricing is not None:
+            self.pricing.quote(vehicle_name, occupied / capacidad, now,
+                               reserved=reservation_id is not None)
+
+    def on_exit(self, vehicle_name, now):
+        self.classes.pop(vehicle_name, None)
+        if self.pricing is not None:
+            self.pricing.charge(vehicle_name, now)
@@ -0,0 +1,350 @@
+import datetime
+import json
+import queue
+import sqlite3
+import threading
+from events import EventKind, ParkingEvent, SIN_ESPACIO
+from settings import SETTINGS
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS corridas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    inicio TEXT NOT NULL,
+    fin TEXT,
+    modo TEXT,
+    seed INTEGER,
+    capacidad INTEGER,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS metricas (
+    corrida INTEGER NOT NULL,
+    clave TEXT NOT NULL,
+    valor REAL,
+    PRIMARY KEY (corrida, clave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metricas_por_clave ON metricas (clave, valor);
+CREATE TABLE IF NOT EXISTS vehiculos (
+    corrida INTEGER NOT NULL,
+    vehiculo INTEGER NOT NULL,
+    llegada REAL,
+    ingreso REAL,
+    salida REAL,
+    espacio INTEGER,
+    espera REAL,
+    estadia REAL,
+    resultado INTEGER,
+    PRIMARY KEY (corrida, vehiculo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS asignaciones (
+    corrida INTEGER NOT NULL,
+    espacio INTEGER NOT NULL,
+    vehiculo INTEGER NOT NULL,
+    desde REAL NOT NULL,
+    hasta REAL
+);
+CREATE INDEX IF NOT EXISTS asignaciones_por_espacio ON asignaciones (corrida, espacio, desde);
+CREATE TABLE IF NOT EXISTS eventos (
+    corrida INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    tipo INTEGER NOT NULL,
+    vehiculo INTEGER NOT NULL,
+    espacio INTEGER NOT NULL,
+    detalle TEXT,
+    PRIMARY KEY (corrida, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS eventos_por_vehiculo ON eventos (corrida, vehiculo, ts);
+CREATE INDEX IF NOT EXISTS eventos_por_tiempo ON eventos (corrida, ts);
+"""
+
+_INGRESO = int(EventKind.INGRESO)
+_SALIDA = int(EventKind.SALIDA)
+_ESPERANDO = int(EventKind.ESPERANDO)
+_FINALES = (int(EventKind.SALIDA), int(EventKind.RECHAZADO), int(EventKind.ERROR))
+
+
+class _RunState:
+    """Lo que el hilo escritor sabe de una corrida en curso."""
+    __slots__ = ("seq", "vehicles")
+
+    def __init__(self):
+        self.seq = 0
+        self.vehicles = {}  # vehicle_id -> [llegada, ingreso, espacio] hasta su evento final
+
+
+class SessionStore:
+    """
+    Almacén persistente de sesiones en SQLite: corridas, vehículos,
+    asignaciones de espacio y eventos, para analizar y comparar corridas.
+
+    - Modo WAL: las consultas (de este u otro proceso) leen mientras se escribe
+    - record()/log() no tocan la base: juntan los eventos en lotes y un hilo
+      escritor inserta cada lote en una sola transacción
+    - Índices por (corrida, vehículo, tiempo) y (corrida, tiempo) para ver la
+      historia de un vehículo o un rango de tiempo en milisegundos, y métricas
+      por clave para comparar miles de corridas
+
+    Las filas de vehiculos y asignaciones se arman con los eventos y se
+    escriben cuando el vehículo termina (o al cerrar la corrida).
+
+    record()/log() se llaman desde un solo hilo (el de la GUI o el del motor).
+    """
+
+    def __init__(self, filename, batch_size=None, store_events=None, max_pending_batches=8):
+        """
+        Parámetros:
+        - filename: Archivo SQLite (se crea si no existe)
+        - batch_size: Eventos por transacción (None = SETTINGS.SESION_LOTE)
+        - store_events: False = solo corridas, métricas, vehículos y asignaciones
+          (None = SETTINGS.SESION_EVENTOS)
+        - max_pending_batches: Lotes en cola antes de que record() espere al escritor
+        """
+        if batch_size is None:
+            batch_size = SETTINGS.SESION_LOTE
+        if store_events is None:
+            store_events = SETTINGS.SESION_EVENTOS
+        self.filename = filename
+        self.batch_size = batch_size
+        self.store_events = store_events
+
+        self._write = self._connect(check_same_thread=False)
+        self._write.executescript(_ESQUEMA)
+        self._write_lock = threading.Lock()  # start_run() y el hilo escritor
+        self._read = None
+        self._read_lock = threading.Lock()
+
+        self._pending = []
+        self._queue = queue.Queue(max_pending_batches)  # Lotes: frena al productor si el disco no da abasto
+        self._runs = {}    # Solo el hilo escritor: run_id -> _RunState
+        self._closed = False
+        self.rows_written = 0
+
+        self._writer = threading.Thread(target=self._run, name="SessionStore", daemon=True)
+        self._writer.start()
+
+    def _connect(self, **kwargs):
+        conn = sqlite3.connect(self.filename, timeout=30, **kwargs)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # Con WAL: seguro ante caídas del proceso
+        return conn
+
+    # === ESCRITURA ===
+
+    def start_run(self, modo=None, seed=None, capacidad=None, **meta):
+        """
+        Registra una corrida nueva.
+
+        Retorna:
+        - id de la corrida (para record/log/end_run y las consultas)
+        """
+        with self._write_lock, self._write:
+            cursor = self._write.execute(
+                "INSERT INTO corridas (inicio, modo, seed, capacidad, meta) VALUES (?, ?, ?, ?, ?)",
+                (datetime.datetime.now().isoformat(timespec="seconds"), modo, seed, capacidad,
+                 json.dumps(meta, default=str)))
+        return cursor.lastrowid
+
+    def record(self, run_id, kind, vehicle_id, timestamp, slot=SIN_ESPACIO, detail=None):
+        """Registra un evento (tipo, vehículo, tiempo en segundos, espacio)."""
+        self._pending.append((run_id, int(kind), vehicle_id, timestamp, slot, detail))
+        if len(self._pending) >= self.batch_size:
+            self._queue.put(self._pending)
+            self._pending = []
+
+    def log(self, run_id, event):
+        """Registra un ParkingEvent (los avisos de texto no se guardan)."""
+        if isinstance(event, ParkingEvent):
+            self.record(run_id, event.kind, event.vehicle_id, event.timestamp, event.slot, event.detail)
+
+    def recorder(self, run_id):
+        """Callback on_event(tipo, vehicle_id, tiempo, espacio) para DiscreteEventEngine."""
+        def on_event(kind, vehicle_id, when, slot=SIN_ESPACIO):
+            self.record(run_id, kind, vehicle_id, when, slot)
+        return on_event
+
+    def end_run(self, run_id, summary=None):
+        """
+        Cierra una corrida: escribe sus eventos pendientes, los vehículos que no
+        terminaron y las métricas numéricas de 'summary' (p. ej. SimulationStats.snapshot()).
+        """
+        self._queue.put(self._take_pending())
+        self._queue.put(("fin", run_id, dict(summary or {})))
+
+    def flush(self, timeout=None):
+        """Espera a que todo lo registrado hasta ahora quede en la base."""
+        if self._closed:
+            return
+        self._queue.put(self._take_pending())
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout=None):
+        """Escribe lo pendiente, detiene el hilo escritor y cierra las conexiones."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._take_pending())
+        self._queue.put(None)
+        self._writer.join(timeout)
+        with self._read_lock:
+            if self._read is not None:
+                self._read.close()
+                self._read = None
+
+    def _take_pending(self):
+        pending, self._pending = self._pending, []
+        return pending
+
+    def _run(self):
+        """Hilo escritor: un lote por transacción."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._write.close()
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+            elif isinstance(item, tuple):
+                _, run_id, summary = item
+                self._finish_run(run_id, summary)
+            elif item:
+                self._write_batch(item)
+
+    def _write_batch(self, batch):
+        runs = self._runs
+        events = []
+        vehicles = []
+        assignments = []
+        for run_id, kind, vehicle_id, ts, slot, detail in batch:
+            state = runs.get(run_id)
+            if state is None:
+                state = runs[run_id] = _RunState()
+            if self.store_events:
+                events.append((run_id, state.seq, ts, kind, vehicle_id, slot, detail))
+            state.seq += 1
+
+            info = state.vehicles.get(vehicle_id)
+            if info is None:
+                info = state.vehicles[vehicle_id] = [ts, None, SIN_ESPACIO]
+            if kind == _INGRESO:
+                info[1] = ts
+                info[2] = slot
+            elif kind in _FINALES:
+                arrival, parked, space = state.vehicles.pop(vehicle_id)
+                departed = ts if kind == _SALIDA and parked is not None else None
+                vehicles.append(self._vehicle_row(run_id, vehicle_id, arrival, parked, departed,
+                                                  space, kind))
+                if parked is not None and space != SIN_ESPACIO:
+                    assignments.append((run_id, space, vehicle_id, parked, departed))
+
+        with self._write_lock, self._write:
+            if events:
+                self._write.executemany(
+                    "INSERT OR REPLACE INTO eventos VALUES (?, ?, ?, ?, ?, ?, ?)", events)
+            if vehicles:
+                self._write.executemany(
+                    "INSERT OR REPLACE INTO vehiculos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", vehicles)
+            if assignments:
+                self._write.executemany(
+                    "INSERT INTO asignaciones VALUES (?, ?, ?, ?, ?)", assignments)
+        self.rows_written += len(batch)
+
+    @staticmethod
+    def _vehicle_row(run_id, vehicle_id, arrival, parked, departed, space, result):
+        return (run_id, vehicle_id, arrival, parked, departed,
+                None if space == SIN_ESPACIO else space,
+                parked - arrival if parked is not None else None,
+                departed - parked if departed is not None else None,
+                result)
+
+    def _finish_run(self, run_id, summary):
+        state = self._runs.pop(run_id, None)
+        vehicles = []
+        assignments = []
+        if state is not None:
+            # Vehículos sin evento final (corrida detenida): sin resultado
+            for vehicle_id, (arrival, parked, space) in state.vehicles.items():
+                vehicles.append(self._vehicle_row(run_id, vehicle_id, arrival, parked, None,
+                                                  space, None))
+                if parked is not None and space != SIN_ESPACIO:
+                    assignments.append((run_id, space, vehicle_id, parked, None))
+        metrics = [(run_id, key, float(value)) for key, value in summary.items()
+                   if isinstance(value, (int, float))]
+        with self._write_lock, self._write:
+            self._write.executemany(
+                "INSERT OR REPLACE INTO vehiculos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", vehicles)
+            self._write.executemany("INSERT INTO asignaciones VALUES (?, ?, ?, ?, ?)", assignments)
+            self._write.executemany("INSERT OR REPLACE INTO metricas VALUES (?, ?, ?)", metrics)
+            self._write.execute("UPDATE corridas SET fin = ? WHERE id = ?",
+                                (datetime.datetime.now().isoformat(timespec="seconds"), run_id))
+
+    # === CONSULTAS ===
+
+    def query(self, sql, params=()):
+        """
+        Consulta de solo lectura (conexión propia: no espera al escritor).
+
+        Retorna:
+        - Lista de dicts (columna -> valor)
+        """
+        with self._read_lock:
+            if self._read is None:
+                self._read = self._connect(check_same_thread=False)
+                self._read.row_factory = sqlite3.Row
+            return [dict(row) for row in self._read.execute(sql, params)]
+
+    def runs(self):
+        """Corridas registradas, de la más nueva a la más vieja."""
+        rows = self.query("SELECT * FROM corridas ORDER BY id DESC")
+        for row in rows:
+            row["meta"] = json.loads(row["meta"]) if row["meta"] else {}
+        return rows
+
+    def run_metrics(self, run_id):
+        """Métricas guardadas al cerrar la corrida (dict clave -> valor)."""
+        return {row["clave"]: row["valor"]
+                for row in self.query("SELECT clave, valor FROM metricas WHERE corrida = ?", (run_id,))}
+
+    def compare_runs(self, clave, limit=None, descending=False):
+        """
+        Corridas ordenadas por una métrica (p. ej. "espera_p95").
+
+        Retorna:
+        - Lista de dicts con corrida, valor, modo, seed y capacidad
+        """
+        sql = ("SELECT m.corrida, m.valor, c.modo, c.seed, c.capacidad FROM metricas m "
+               "JOIN corridas c ON c.id = m.corrida WHERE m.clave = ? "
+               f"ORDER BY m.valor {'DESC' if descending else 'ASC'}")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self.query(sql, (clave,))
+
+    def vehicle(self, run_id, vehicle_id):
+        """Resumen de un vehículo (llegada, ingreso, salida, espacio, espera, estadía, resultado)."""
+        rows = self.query("SELECT * FROM vehiculos WHERE corrida = ? AND vehiculo = ?",
+                          (run_id, vehicle_id))
+        return rows[0] if rows else None
+
+    def vehicle_history(self, run_id, vehicle_id):
+        """Eventos de un vehículo en orden (ParkingEvent)."""
+        return self._events("WHERE corrida = ? AND vehiculo = ? ORDER BY ts, seq",
+                            (run_id, vehicle_id))
+
+    def events_between(self, run_id, start, end, kind=None):
+        """Eventos con timestamp en [start, end), opcionalmente de un solo tipo."""
+        if kind is None:
+            return self._events("WHERE corrida = ? AND ts >= ? AND ts < ? ORDER BY ts, seq",
+                                (run_id, start, end))
+        return self._events("WHERE corrida = ? AND ts >= ? AND ts < ? AND tipo = ? ORDER BY ts, seq",
+                            (run_id, start, end, int(kind)))
+
+    def slot_history(self, run_id, slot):
+        """Ocupantes de un espacio en orden: dicts con vehiculo, desde y hasta."""
+        return self.query("SELECT vehiculo, desde, hasta FROM asignaciones "
+                          "WHERE corrida = ? AND espacio = ? ORDER BY desde", (run_id, slot))
+
+    def _events(self, where, params):
+        rows = self.query(f"SELECT ts, tipo, vehiculo, espacio, detalle FROM eventos {where}", params)
+        return [ParkingEvent(EventKind(r["tipo"]), r["vehiculo"], r["ts"], r["espacio"], r["detalle"])
+                for r in rows]
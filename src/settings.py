@@ -0,0 +1,270 @@
+import json
+import os
+import threading
+from types import MappingProxyType
+import config
+
+PREFIJO_ENTORNO = "PARQUEADERO_"  # PARQUEADERO_CAPACIDAD=20 reemplaza CAPACIDAD
+
+# Tipo de los parámetros cuyo valor por defecto es None (el resto toma el del valor)
+_TIPOS = {
+    "DISTRIBUCION_ESPACIOS": list,
+    "TRAFICO_PERFIL": str,
+    "TRAZA_GRABAR": str,
+    "SESION_DB": str,
+    "CONFIG_ARCHIVO": str,
+    "METRICAS_PUERTO": int,
+    # Los tiempos aceptan decimales aunque el valor por defecto sea entero
+    "TIEMPO_MIN_ESPERA": float,
+    "TIEMPO_MAX_ESPERA": float,
+    "TIEMPO_MIN_ESTACIONADO": float,
+    "TIEMPO_MAX_ESTACIONADO": float,
+}
+
+# Parámetros que solo se leen al arrancar: un cambio en caliente se acepta
+# pero se aplica en el próximo inicio de la aplicación
+SOLO_AL_INICIO = frozenset({
+    "HILOS_POOL", "LOG_ARCHIVO", "LOG_FORMATO", "LOG_LOTE", "LOG_INTERVALO_FLUSH",
+    "HISTORIAL_EVENTOS", "TAMANO_COLA_EVENTOS", "POLITICA_DESBORDE", "VELOCIDADES",
+    "VELOCIDAD_MAXIMA", "SESION_DB", "SESION_EVENTOS", "SESION_LOTE", "CONFIG_ARCHIVO",
+    "METRICAS_PUERTO", "METRICAS_HOST",
+})
+
+
+def defaults():
+    """Valores por defecto: las constantes en mayúsculas de config.py."""
+    return {name: value for name, value in vars(config).items() if name.isupper()}
+
+
+def _coerce(name, value, default):
+    """Convierte 'value' al tipo del parámetro (los valores de entorno llegan como texto)."""
+    kind = _TIPOS.get(name, type(default))
+    if value is None or kind is type(None):
+        return value
+    if isinstance(value, str) and kind is not str:
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise ValueError(f"{name}: valor inválido {value!r}") from None
+    if kind is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"{name}: se esperaba true/false, no {value!r}")
+        return value
+    if kind is int and isinstance(value, float) and value.is_integer():
+        return int(value)
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if kind is list and isinstance(value, list):
+        # DISTRIBUCION_ESPACIOS, VELOCIDADES, TRAFICO_HORAS_PICO: JSON no tiene tuplas
+        return [tuple(item) if isinstance(item, list) else item for item in value]
+    if not isinstance(value, kind) or isinstance(value, bool) and kind is not bool:
+        raise ValueError(f"{name}: se esperaba {kind.__name__}, no {value!r}")
+    return value
+
+
+def validate(values):
+    """
+    Revisa la configuración completa.
+
+    Retorna:
+    - Lista de errores (vacía si es válida)
+    """
+    errors = []
+
+    def check(condition, message):
+        if not condition:
+            errors.append(message)
+
+    check(values["CAPACIDAD"] >= 1, "CAPACIDAD debe ser al menos 1")
+    layout = values["DISTRIBUCION_ESPACIOS"]
+    if layout is not None:
+        check(all(len(item) == 4 and item[3] >= 0 for item in layout) and sum(item[3] for item in layout) >= 1,
+              "DISTRIBUCION_ESPACIOS: se esperan (nivel, zona, tipo, cantidad) con al menos un espacio")
+    check(values["VEHICULOS_INICIALES"] >= 0, "VEHICULOS_INICIALES no puede ser negativo")
+    for name in ("PUERTAS_ENTRADA", "PUERTAS_SALIDA"):
+        check(values[name] >= 0, f"{name} no puede ser negativo")
+    check(values["INTERVALO_INICIAL"] >= 0, "INTERVALO_INICIAL no puede ser negativo")
+    check(values["PLAZO_DETENCION"] >= 0, "PLAZO_DETENCION no puede ser negativo")
+    check(values["METRICAS_PUERTO"] is None or 0 <= values["METRICAS_PUERTO"] <= 65535,
+          "METRICAS_PUERTO debe ser None o un puerto entre 0 y 65535")
+    for low, high in (("TIEMPO_MIN_ESPERA", "TIEMPO_MAX_ESPERA"),
+                      ("TIEMPO_MIN_ESTACIONADO", "TIEMPO_MAX_ESTACIONADO")):
+        check(0 <= values[low] <= values[high], f"Se necesita 0 <= {low} <= {high}")
+    for name in ("REFRESCO_UI", "HILOS_POOL", "LOG_LOTE", "HISTORIAL_EVENTOS", "TAMANO_COLA_EVENTOS",
+                 "MAX_EVENTOS_POR_FRAME", "PRESUPUESTO_FRAME_MS", "SESION_LOTE", "CONFIG_REVISION_MS",
+                 "PUERTA_SERVICIO_ENTRADA", "PUERTA_SERVICIO_SALIDA"):
+        check(values[name] > 0, f"{name} debe ser mayor que 0")
+    check(0 < values["VELOCIDAD_SIMULACION"] <= values["VELOCIDAD_MAXIMA"],
+          "Se necesita 0 < VELOCIDAD_SIMULACION <= VELOCIDAD_MAXIMA")
+    check(all(0 < v <= values["VELOCIDAD_MAXIMA"] for v in values["VELOCIDADES"]),
+          "VELOCIDADES debe estar entre 0 y VELOCIDAD_MAXIMA")
+    check(values["VELOCIDAD_REPRODUCCION"] > 0, "VELOCIDAD_REPRODUCCION debe ser mayor que 0")
+    check(values["TRAFICO_PERFIL"] in (None, "constante", "pico"),
+          "TRAFICO_PERFIL debe ser None, \"constante\" o \"pico\"")
+    check(values["TRAFICO_ESTADIA"] in ("uniforme", "exponencial", "lognormal"),
+          "TRAFICO_ESTADIA debe ser \"uniforme\", \"exponencial\" o \"lognormal\"")
+    check(values["PUERTA_DISTRIBUCION"] in ("uniforme", "exponencial", "lognormal"),
+          "PUERTA_DISTRIBUCION debe ser \"uniforme\", \"exponencial\" o \"lognormal\"")
+    check(values["PUERTA_ESTRATEGIA"] in ("cola_corta", "turno"),
+          "PUERTA_ESTRATEGIA debe ser \"cola_corta\" o \"turno\"")
+    check(values["LOG_FORMATO"] in ("csv", "csv.gz", "bin"),
+          "LOG_FORMATO debe ser \"csv\", \"csv.gz\" o \"bin\"")
+    check(values["POLITICA_DESBORDE"] in ("bloquear", "descartar_nuevo", "descartar_antiguo"),
+          "POLITICA_DESBORDE debe ser \"bloquear\", \"descartar_nuevo\" o \"descartar_antiguo\"")
+    return errors
+
+
+class Settings:
+    """
+    Configuración en tiempo de ejecución.
+
+    Combina, en orden de prioridad creciente: los valores por defecto de
+    config.py, un archivo JSON ({"CAPACIDAD": 20, ...}), variables de entorno
+    PARQUEADERO_<NOMBRE> y los valores dados por línea de comandos. Todo se
+    valida junto antes de aplicarse: una configuración inválida se rechaza
+    entera y la anterior sigue vigente.
+
+    Los valores se leen como atributos (SETTINGS.CAPACIDAD). Cada cambio
+    reemplaza el diccionario completo de una sola vez, así que un hilo que lee
+    nunca ve una mezcla de dos configuraciones a medio aplicar.
+
+    reload() y check_file() releen el archivo y el entorno en caliente; los
+    suscriptores (subscribe) reciben solo los parámetros que cambiaron y deciden
+    cómo aplicarlos (p. ej. ParkingSimulator redimensiona el ParkingLot vivo).
+    """
+
+    def __init__(self, filename=None, environ=None, overrides=None):
+        """
+        Parámetros:
+        - filename: Archivo JSON de configuración (None = solo config.py y entorno)
+        - environ: Variables de entorno (None = os.environ)
+        - overrides: dict de valores de línea de comandos (máxima prioridad)
+        """
+        self._lock = threading.RLock()  # Los suscriptores corren con el lock tomado
+        self._listeners = []
+        self._values = MappingProxyType(defaults())
+        self.filename = None
+        self.environ = environ
+        self.overrides = {}
+        self._mtime = None
+        self.load(filename, overrides)
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"Parámetro de configuración desconocido: {name}") from None
+
+    @property
+    def values(self):
+        """Vista inmutable de la configuración vigente (consistente aunque haya una recarga)."""
+        return self._values
+
+    # === CARGA ===
+
+    def load(self, filename=None, overrides=None):
+        """
+        Carga la configuración desde cero (por defecto, archivo, entorno y 'overrides').
+
+        Retorna:
+        - dict con los parámetros que cambiaron
+        """
+        with self._lock:
+            self.filename = filename
+            self.overrides = dict(overrides or {})
+            return self._apply(self._compose())
+
+    def reload(self):
+        """Relee el archivo y el entorno (los valores de línea de comandos se mantienen)."""
+        with self._lock:
+            return self._apply(self._compose())
+
+    def update(self, **changes):
+        """Cambia parámetros en caliente (se suman a los de línea de comandos)."""
+        with self._lock:
+            previous = dict(self.overrides)
+            self.overrides.update(changes)
+            try:
+                return self._apply(self._compose())
+            except ValueError:
+                self.overrides = previous
+                raise
+
+    def check_file(self):
+        """
+        Recarga si el archivo de configuración cambió desde la última lectura.
+
+        Retorna:
+        - dict con los parámetros que cambiaron (vacío si el archivo no cambió)
+
+        Lanza ValueError si el archivo nuevo es inválido (la configuración vigente no cambia).
+        """
+        if self.filename is None:
+            return {}
+        try:
+            mtime = os.stat(self.filename).st_mtime_ns
+        except OSError:
+            return {}
+        if mtime == self._mtime:
+            return {}
+        return self.reload()
+
+    def _compose(self):
+        base = defaults()
+        values = dict(base)
+        layers = []
+        if self.filename is not None:
+            self._mtime = os.stat(self.filename).st_mtime_ns
+            with open(self.filename, encoding="utf-8") as f:
+                try:
+                    layers.append(("archivo", json.load(f)))
+                except ValueError as e:
+                    raise ValueError(f"{self.filename}: JSON inválido ({e})") from None
+        environ = os.environ if self.environ is None else self.environ
+        layers.append(("entorno", {key[len(PREFIJO_ENTORNO):]: value for key, value in environ.items()
+                                   if key.startswith(PREFIJO_ENTORNO)}))
+        layers.append(("línea de comandos", self.overrides))
+
+        errors = []
+        for source, layer in layers:
+            for name, value in layer.items():
+                name = name.upper()
+                if name not in base:
+                    errors.append(f"{name} ({source}): parámetro desconocido")
+                    continue
+                try:
+                    values[name] = _coerce(name, value, base[name])
+                except ValueError as e:
+                    errors.append(f"{e} ({source})")
+        if not errors:
+            try:
+                errors = validate(values)
+            except (TypeError, IndexError) as e:
+                errors = [f"Valor con forma inesperada: {e}"]
+        if errors:
+            raise ValueError("Configuración inválida:\n  " + "\n  ".join(errors))
+        return values
+
+    def _apply(self, values):
+        old = self._values
+        changed = {name: value for name, value in values.items() if old.get(name) != value}
+        self._values = MappingProxyType(values)
+        if changed:
+            for listener in list(self._listeners):
+                listener(changed)
+        return changed
+
+    # === SUSCRIPTORES ===
+
+    def subscribe(self, callback):
+        """callback(cambios) después de cada cambio (cambios: dict nombre -> valor nuevo)."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+
+# Configuración del proceso: config.py más las variables de entorno. main.py
+# le agrega el archivo (--config) y los valores de la línea de comandos
+SETTINGS = Settings()
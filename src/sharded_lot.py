@@ -0,0 +1,174 @@
+import threading
+from collections import deque
+from parking_lot import _Waiter
+from slots import SlotAllocator, SlotType, build_slots, default_layout
+
+
+class _Stripe:
+    """Una franja del parqueadero: su parte de los espacios con su propio lock."""
+    __slots__ = ("lock", "allocator", "occupied", "size")
+
+    def __init__(self, slots, state):
+        self.lock = threading.Lock()
+        self.allocator = SlotAllocator(slots, state)
+        self.occupied = 0
+        self.size = len(slots)
+
+
+class ShardedParkingLot:
+    """
+    Parqueadero dividido en franjas (lock striping) para muchas entradas
+    concurrentes.
+
+    Los espacios se reparten entre N franjas, cada una con su propio lock, así
+    que dos vehículos que entran por franjas distintas no compiten por el mismo
+    lock. Cada vehículo empieza por su franja "de casa" (según su nombre) y, si
+    está llena, roba capacidad libre de las demás. La capacidad global se
+    respeta porque cada espacio pertenece a una sola franja.
+
+    Cuando todas las franjas están llenas, el vehículo hace fila en una cola
+    FIFO global; exit() le entrega el espacio liberado directamente.
+
+    Misma interfaz que ParkingLot (try_enter/exit/slot_of/get_slot_states...).
+    """
+
+    def __init__(self, capacidad, stripes=8, layout=None):
+        self.slots = build_slots(layout or default_layout(capacidad))
+        self.capacidad = len(self.slots)
+        stripes = max(1, min(stripes, self.capacidad))
+        self._state = bytearray(self.capacidad)  # Compartido por todas las franjas
+        # El espacio i pertenece a la franja i % N
+        self._stripes = [_Stripe(self.slots[k::stripes], self._state) for k in range(stripes)]
+        self._assigned = {}       # vehicle_name -> índice del espacio
+
+        self._wait_lock = threading.Lock()
+        self._waiters = deque()   # Fila FIFO global (solo cuando todo está lleno)
+        self.max_queue_depth = 0
+
+    def _stripe_of(self, index):
+        return self._stripes[index % len(self._stripes)]
+
+    def _allocate_any(self, vehicle_name, vehicle_type):
+        """Busca espacio empezando por la franja de casa y robando de las demás."""
+        stripes = self._stripes
+        n = len(stripes)
+        home = hash(vehicle_name) % n
+        for k in range(n):
+            stripe = stripes[(home + k) % n]
+            # Lectura sin lock como pista: evita tomar locks de franjas llenas
+            if stripe.occupied >= stripe.size:
+                continue
+            with stripe.lock:
+                index = stripe.allocator.allocate(vehicle_type)
+                if index is not None:
+                    stripe.occupied += 1
+                    self._assigned[vehicle_name] = index
+                    return index
+        return None
+
+    def try_enter(self, vehicle_name, timeout=2, stop_event=None, vehicle_type=SlotType.ESTANDAR):
+        """
+        Intenta que un vehículo entre al parqueadero (ver ParkingLot.try_enter).
+
+        Retorna:
+        - True si logró entrar
+        - False si está lleno y no pudo entrar
+        """
+        if self._allocate_any(vehicle_name, vehicle_type) is not None:
+            return True
+        if timeout == 0 or (stop_event is not None and stop_event.is_set()):
+            return False
+
+        waiter = _Waiter(vehicle_name, vehicle_type)
+        with self._wait_lock:
+            self._waiters.append(waiter)
+            if len(self._waiters) > self.max_queue_depth:
+                self.max_queue_depth = len(self._waiters)
+
+        # Volver a buscar ya registrados en la fila: si un exit() liberó un
+        # espacio antes de vernos en la fila, lo encontramos aquí
+        if self._allocate_any(vehicle_name, vehicle_type) is not None:
+            with self._wait_lock:
+                if not waiter.granted:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        pass  # cancel_waiting() ya vació la fila
+                    return True
+            # exit() también nos entregó un espacio: devolver el que tomamos
+            self._release(self._assigned.pop(vehicle_name))
+            self._assigned[vehicle_name] = waiter.slot
+            return True
+
+        waiter.event.wait(timeout)
+
+        with self._wait_lock:
+            if waiter.granted:
+                self._assigned[vehicle_name] = waiter.slot
+                return True
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass  # cancel_waiting() ya vació la fila
+            return False
+
+    def exit(self, vehicle_name):
+        """
+        Un vehículo sale; su espacio pasa al primero compatible de la fila.
+
+        Un vehículo que no está estacionado (nunca entró o ya salió) no
+        cambia nada, igual que en ParkingLot.exit.
+        """
+        index = self._assigned.pop(vehicle_name, None)
+        if index is None:
+            return
+        self._release(index)
+
+    def _release(self, index):
+        stripe = self._stripe_of(index)
+        waiter = None
+        with stripe.lock:
+            if self._waiters:  # Pista sin lock; se confirma con _wait_lock
+                with self._wait_lock:
+                    waiter = self._take_waiter_for(stripe, index)
+                    if waiter is not None:
+                        # El espacio cambia de dueño sin pasar por 'libre'
+                        waiter.granted = True
+                        waiter.slot = index
+            if waiter is None:
+                stripe.allocator.release(index)
+                stripe.occupied -= 1
+        if waiter is not None:
+            waiter.event.set()
+
+    def _take_waiter_for(self, stripe, index):
+        """Saca de la fila al primer vehículo que puede usar el espacio 'index'."""
+        for position, waiter in enumerate(self._waiters):
+            if stripe.allocator.accepts(index, waiter.vehicle_type):
+                del self._waiters[position]
+                return waiter
+        return None
+
+    def cancel_waiting(self):
+        """Despierta a todos los vehículos en la fila sin darles espacio."""
+        with self._wait_lock:
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for waiter in waiters:
+            waiter.event.set()
+
+    def slot_of(self, vehicle_name):
+        """Índice del espacio que ocupa el vehículo (None si no está adentro)."""
+        return self._assigned.get(vehicle_name)
+
+    def get_slot_states(self):
+        """Estado de cada espacio (copia; lecturas por franja sin bloquear escritores)."""
+        return bytes(self._state)
+
+    def get_occupied_count(self):
+        """Espacios ocupados (suma de las franjas)."""
+        return sum(stripe.occupied for stripe in self._stripes)
+
+    def get_waiting_count(self):
+        """Número de vehículos haciendo fila en este momento."""
+        return len(self._waiters)
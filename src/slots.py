@@ -0,0 +1,158 @@
+from enum import IntEnum
+from typing import NamedTuple
+
+
+class SlotType(IntEnum):
+    """Tipos de espacio (y, para los vehículos, el tipo de espacio que buscan)."""
+    ESTANDAR = 0
+    COMPACTO = 1
+    GRANDE = 2
+    ELECTRICO = 3      # Con cargador (EV)
+    DISCAPACIDAD = 4
+
+
+# Espacios que puede usar cada tipo de vehículo, en orden de preferencia.
+# Los espacios ELECTRICO y DISCAPACIDAD quedan reservados para quien los necesita.
+COMPATIBLES = {
+    SlotType.ESTANDAR: (SlotType.ESTANDAR, SlotType.GRANDE),
+    SlotType.COMPACTO: (SlotType.COMPACTO, SlotType.ESTANDAR, SlotType.GRANDE),
+    SlotType.GRANDE: (SlotType.GRANDE,),
+    SlotType.ELECTRICO: (SlotType.ELECTRICO, SlotType.ESTANDAR, SlotType.GRANDE),
+    SlotType.DISCAPACIDAD: (SlotType.DISCAPACIDAD, SlotType.ESTANDAR, SlotType.GRANDE),
+}
+
+# Abreviaturas para la GUI
+ABREVIATURAS = {
+    SlotType.ESTANDAR: "",
+    SlotType.COMPACTO: "C",
+    SlotType.GRANDE: "G",
+    SlotType.ELECTRICO: "EV",
+    SlotType.DISCAPACIDAD: "♿",
+}
+
+LIBRE = 0
+OCUPADO = 1
+
+
+class Slot(NamedTuple):
+    """Un espacio físico del parqueadero."""
+    index: int      # Posición global (0..capacidad-1)
+    level: int      # Nivel / piso
+    zone: str       # Zona dentro del nivel
+    type: SlotType
+
+
+def build_slots(layout):
+    """
+    Construye la lista de espacios a partir de una distribución.
+
+    Parámetros:
+    - layout: Lista de tuplas (nivel, zona, tipo, cantidad)
+
+    Retorna:
+    - list[Slot] numerados consecutivamente
+    """
+    slots = []
+    for level, zone, slot_type, count in layout:
+        for _ in range(count):
+            slots.append(Slot(len(slots), level, zone, SlotType(slot_type)))
+    return slots
+
+
+def default_layout(capacidad):
+    """Un solo nivel, una sola zona y 'capacidad' espacios estándar."""
+    return [(1, "A", SlotType.ESTANDAR, capacidad)]
+
+
+class SlotAllocator:
+    """
+    Asigna espacios concretos en O(1).
+
+    Mantiene una lista libre (pila de índices) por grupo (nivel, zona, tipo).
+    Buscar un espacio compatible recorre solo los grupos de los tipos
+    aceptados, no los espacios, así que el costo no depende de la capacidad
+    (10.000+ espacios cuestan lo mismo que 5).
+
+    No es thread-safe por sí solo: ParkingLot lo usa siempre con su lock tomado.
+    """
+
+    def __init__(self, slots, state=None):
+        """
+        Parámetros:
+        - slots: Espacios que administra este asignador
+        - state: bytearray compartido opcional, indexado por Slot.index (para
+          varios asignadores que se reparten un mismo parqueadero)
+        """
+        self.slots = {slot.index: slot for slot in slots}
+        # LIBRE/OCUPADO por espacio (para GUI y stats)
+        self.state = state if state is not None else bytearray(len(slots))
+        self._free = {}                     # (nivel, zona, tipo) -> pila de índices libres
+        self._groups_by_type = {t: [] for t in SlotType}
+        self._free_by_type = dict.fromkeys(SlotType, 0)
+
+        # Insertar al revés para que pop() entregue primero los índices bajos
+        for slot in reversed(slots):
+            key = (slot.level, slot.zone, slot.type)
+            if key not in self._free:
+                self._free[key] = []
+                self._groups_by_type[slot.type].append(key)
+            self._free[key].append(slot.index)
+            self._free_by_type[slot.type] += 1
+        for groups in self._groups_by_type.values():
+            groups.sort()
+
+    def can_allocate(self, vehicle_type=SlotType.ESTANDAR):
+        """¿Hay algún espacio libre compatible con este tipo de vehículo?"""
+        free_by_type = self._free_by_type
+        return any(free_by_type[t] for t in COMPATIBLES[vehicle_type])
+
+    def allocate(self, vehicle_type=SlotType.ESTANDAR, zone=None):
+        """
+        Toma un espacio libre compatible.
+
+        Parámetros:
+        - vehicle_type: SlotType que necesita el vehículo
+        - zone: Zona preferida (None = cualquiera)
+
+        Retorna:
+        - Índice del espacio, o None si no hay ninguno compatible
+        """
+        for slot_type in COMPATIBLES[vehicle_type]:
+            if not self._free_by_type[slot_type]:
+                continue
+            for key in self._groups_by_type[slot_type]:
+                if zone is not None and key[1] != zone:
+                    continue
+                free = self._free[key]
+                if free:
+                    index = free.pop()
+                    self._free_by_type[slot_type] -= 1
+                    self.state[index] = OCUPADO
+                    return index
+        if zone is not None:
+            return self.allocate(vehicle_type)  # Zona llena: cualquier otra
+        return None
+
+    def release(self, index):
+        """Devuelve un espacio a su lista libre."""
+        slot = self.slots[index]
+        self.state[index] = LIBRE
+        self._free[(slot.level, slot.zone, slot.type)].append(index)
+        self._free_by_type[slot.type] += 1
+
+    def reserve(self, indices):
+        """
+        Marca como ocupados los espacios 'indices' (p. ej. los de los vehículos
+        que ya estaban adentro al redimensionar el parqueadero).
+        """
+        taken = set(indices)
+        for (_, _, slot_type), free in self._free.items():
+            before = len(free)
+            free[:] = [index for index in free if index not in taken]
+            self._free_by_type[slot_type] -= before - len(free)
+        for index in taken:
+            self.state[index] = OCUPADO
+
+    def accepts(self, index, vehicle_type):
+        """¿Puede este tipo de vehículo usar el espacio 'index'?"""
+        return self.slots[index].type in COMPATIBLES[vehicle_type]
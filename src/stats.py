@@ -0,0 +1,294 @@
+import math
+import threading
+from collections import deque
+from events import EventKind, SIN_ESPACIO
+
+
+class QuantileSketch:
+    """
+    Histograma de memoria fija para percentiles (p50/p95/p99).
+
+    Los valores se agrupan en cubetas logarítmicas: la cubeta k cubre
+    (min_value * gamma^(k-1), min_value * gamma^k]. Cada percentil se estima
+    con error relativo menor a 'relative_error', sin guardar las muestras.
+    add() es O(1); quantile() recorre las cubetas (número fijo, ~900).
+    """
+
+    def __init__(self, min_value=0.001, max_value=86400.0, relative_error=0.01):
+        """
+        Parámetros:
+        - min_value: Valores menores o iguales caen en la primera cubeta (segundos)
+        - max_value: Valores mayores caen en la última cubeta (segundos)
+        - relative_error: Error relativo máximo de los percentiles
+        """
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self._min_value = min_value
+        self._buckets = int(math.ceil(math.log(max_value / min_value) / self._log_gamma)) + 1
+        self._counts = [0] * (self._buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value):
+        """Agrega una muestra."""
+        if value <= self._min_value:
+            index = 0
+        else:
+            index = min(self._buckets, 1 + int(math.log(value / self._min_value) / self._log_gamma))
+        self._counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """
+        Estima el percentil q (0..1).
+
+        Retorna:
+        - Valor estimado, o 0.0 si no hay muestras
+        """
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen > rank:
+                break
+        if index == 0:
+            value = self._min_value
+        else:
+            # Punto medio (en escala relativa) de la cubeta
+            value = 2 * self._min_value * self._gamma ** index / (self._gamma + 1)
+        return min(max(value, self.min), self.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class TimeWeightedGauge:
+    """
+    Valor que cambia en el tiempo (p. ej. espacios ocupados) con su promedio
+    ponderado por tiempo y una serie por minuto de ese promedio.
+
+    set() es O(1) (salvo al cerrar minutos, acotado por 'window_minutes').
+    """
+
+    def __init__(self, window_minutes=60):
+        self.value = 0
+        self.max = 0
+        self._start = None     # Momento de la primera muestra
+        self._since = None     # Momento del último cambio
+        self._area = 0.0       # Integral del valor desde _start
+        self._minute = None    # Minuto en curso de la serie
+        self._minute_area = 0.0
+        self.series = deque(maxlen=window_minutes)  # (minuto, promedio del minuto)
+
+    def set(self, value, now):
+        """Cambia el valor en el instante 'now' (segundos)."""
+        if self._start is None:
+            self._start = self._since = now
+            self._minute = int(now // 60)
+        else:
+            self._accumulate(now)
+        self.value = value
+        if value > self.max:
+            self.max = value
+
+    def add(self, delta, now):
+        self.set(self.value + delta, now)
+
+    def _accumulate(self, now):
+        """Suma el área del valor actual hasta 'now', cerrando los minutos que pasaron."""
+        minute = int(now // 60)
+        if minute != self._minute:
+            # Cerrar el minuto en curso y los minutos completos sin cambios
+            end = (self._minute + 1) * 60
+            self._minute_area += self.value * (end - self._since)
+            self.series.append((self._minute, self._minute_area / 60))
+            for m in range(max(self._minute + 1, minute - self.series.maxlen), minute):
+                self.series.append((m, float(self.value)))
+            self._area += self.value * (now - self._since)
+            self._minute = minute
+            self._minute_area = self.value * (now - minute * 60)
+        else:
+            delta = self.value * (now - self._since)
+            self._area += delta
+            self._minute_area += delta
+        self._since = now
+
+    def mean(self, now):
+        """Promedio ponderado por tiempo desde la primera muestra hasta 'now'."""
+        if self._start is None or now <= self._start:
+            return float(self.value)
+        return (self._area + self.value * (now - self._since)) / (now - self._start)
+
+
+class RateCounter:
+    """
+    Conteo de sucesos por minuto (throughput) en una ventana deslizante.
+
+    add() es O(1); per_minute() aproxima los últimos 60 s combinando el minuto
+    en curso con la fracción que sigue dentro de la ventana del minuto anterior.
+    """
+
+    def __init__(self, window_minutes=60):
+        self.total = 0
+        self.series = deque(maxlen=window_minutes)  # [minuto, conteo]
+
+    def add(self, now, count=1):
+        minute = int(now // 60)
+        if not self.series or self.series[-1][0] != minute:
+            self.series.append([minute, 0])
+        self.series[-1][1] += count
+        self.total += count
+
+    def per_minute(self, now):
+        """Sucesos en los últimos 60 segundos (aprox.)."""
+        minute = int(now // 60)
+        current = previous = 0
+        for m, count in reversed(self.series):
+            if m == minute:
+                current = count
+            elif m == minute - 1:
+                previous = count
+                break
+            elif m < minute - 1:
+                break
+        return current + previous * (1 - (now % 60) / 60)
+
+
+class SimulationStats:
+    """
+    Estadísticas incrementales de la simulación: O(1) por evento.
+
+    - Espera (hacer fila → ingresar) y estadía (ingresar → salir) en
+      QuantileSketch, para p50/p95/p99 con memoria fija
+    - Ocupación y utilización como promedio ponderado por tiempo
+    - Rechazos (vehículos que se fueron sin estacionar) y errores
+    - Throughput: salidas por minuto
+    - Vehículos vivos, llevados con un contador en lugar de recorrer los threads
+
+    record() recibe (tipo, vehicle_id, tiempo[, espacio]) así que sirve tanto para los
+    ParkingEvent de la GUI (record_event) como de callback on_event del motor
+    de eventos discretos. Se llama desde un solo hilo (el de la GUI);
+    vehicle_started/vehicle_finished sí son thread-safe.
+    """
+
+    def __init__(self, capacidad, window_minutes=60):
+        self.capacidad = capacidad
+        self.wait_times = QuantileSketch()
+        self.dwell_times = QuantileSketch()
+        self.occupancy = TimeWeightedGauge(window_minutes)
+        self.throughput = RateCounter(window_minutes)
+
+        self.vehicles_created = 0
+        self.parks = 0
+        self.exits = 0
+        self.waited = 0
+        self.rejections = 0
+        self.errors = 0
+        self.last_timestamp = None
+
+        self._live = 0
+        self._live_lock = threading.Lock()
+        self._waiting_since = {}  # vehicle_id -> momento en que empezó a hacer fila
+        self._parked_since = {}   # vehicle_id -> momento en que ingresó
+
+    # === VEHÍCULOS VIVOS ===
+
+    def vehicle_started(self):
+        """
+        Un vehículo nuevo empezó su ciclo de vida.
+
+        Retorna:
+        - Su número (1, 2, ...): se asigna con el lock, así que dos hilos que
+          crean vehículos a la vez nunca reciben el mismo
+        """
+        with self._live_lock:
+            self.vehicles_created += 1
+            self._live += 1
+            return self.vehicles_created
+
+    def vehicle_finished(self, vehicle_id=None):
+        """Un vehículo terminó (por cualquier camino). Se llama desde su hilo."""
+        with self._live_lock:
+            self._live -= 1
+
+    @property
+    def live_vehicles(self):
+        return self._live
+
+    # === EVENTOS ===
+
+    def record_event(self, event):
+        """Registra un ParkingEvent."""
+        self.record(event.kind, event.vehicle_id, event.timestamp)
+
+    def record(self, kind, vehicle_id, timestamp, slot=SIN_ESPACIO):
+        """Registra un evento (tipo, vehículo, tiempo en segundos; el espacio no se usa)."""
+        self.last_timestamp = timestamp
+
+        if kind == EventKind.ESPERANDO:
+            self.waited += 1
+            self._waiting_since[vehicle_id] = timestamp
+
+        elif kind == EventKind.INGRESO:
+            self.parks += 1
+            # Sin ESPERANDO previo entró directo: espera cero
+            self.wait_times.add(timestamp - self._waiting_since.pop(vehicle_id, timestamp))
+            self._parked_since[vehicle_id] = timestamp
+            self.occupancy.add(1, timestamp)
+
+        elif kind == EventKind.SALIDA:
+            self.exits += 1
+            since = self._parked_since.pop(vehicle_id, None)
+            if since is not None:
+                self.dwell_times.add(timestamp - since)
+            self.occupancy.add(-1, timestamp)
+            self.throughput.add(timestamp)
+
+        elif kind == EventKind.RECHAZADO:
+            self.rejections += 1
+            self._waiting_since.pop(vehicle_id, None)
+
+        elif kind == EventKind.ERROR:
+            self.errors += 1
+
+    def snapshot(self, now=None):
+        """
+        Resumen de las estadísticas en el instante 'now' (por defecto, el del
+        último evento).
+
+        Retorna:
+        - dict con claves en español (mismo estilo que el resumen del motor)
+        """
+        if now is None:
+            now = self.last_timestamp or 0.0
+        mean_occupancy = self.occupancy.mean(now)
+        return {
+            "vehiculos_creados": self.vehicles_created,
+            "vehiculos_vivos": self._live,
+            "estacionados": self.parks,
+            "completados": self.exits,
+            "vehiculos_que_esperaron": self.waited,
+            "rechazos": self.rejections,
+            "errores": self.errors,
+            "espera_p50": self.wait_times.quantile(0.50),
+            "espera_p95": self.wait_times.quantile(0.95),
+            "espera_p99": self.wait_times.quantile(0.99),
+            "estadia_p50": self.dwell_times.quantile(0.50),
+            "estadia_p95": self.dwell_times.quantile(0.95),
+            "estadia_p99": self.dwell_times.quantile(0.99),
+            "ocupacion_actual": self.occupancy.value,
+            "ocupacion_promedio": mean_occupancy,
+            "ocupacion_maxima": self.occupancy.max,
+            "utilizacion": mean_occupancy / self.capacidad if self.capacidad else 0.0,
+            "salidas_por_minuto": self.throughput.per_minute(now),
+        }
@@ -0,0 +1,269 @@
+"""
+Barrido de parámetros: corre en modo headless cada combinación de una grilla
+de valores de configuración, en paralelo en un ProcessPoolExecutor, y junta
+utilización, percentiles de espera y tasa de rechazo en una sola tabla.
+
+Los resultados se guardan en una caché (un JSON por línea) con clave = hash
+de la configuración completa del escenario: al repetir el barrido, los
+escenarios ya corridos no se vuelven a simular.
+
+Uso:
+    python src/sweep.py --capacidad 5 10 20 --intervalo 0.5 1 2
+    python src/sweep.py --capacidad 10 20 --tasa 600 1200 --perfil pico --horas 24
+    python src/sweep.py --capacidad 5 10 --paciencia 30 120 --seed 1 2 3 --csv barrido.csv
+    python src/sweep.py --perfil constante --tasa 900 --capacidad 40 80 --puertas-entrada 1 2 --puertas-salida 1 2
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import (CAPACIDAD, VEHICULOS_INICIALES, SEMILLA, BARRIDO_CACHE,
+                    TIEMPO_MIN_ESPERA, TIEMPO_MAX_ESPERA,
+                    TIEMPO_MIN_ESTACIONADO, TIEMPO_MAX_ESTACIONADO,
+                    TRAFICO_TASA, TRAFICO_TASA_PICO, TRAFICO_HORAS_PICO, TRAFICO_ESTADIA,
+                    PUERTA_SERVICIO_ENTRADA, PUERTA_SERVICIO_SALIDA,
+                    PUERTA_DISTRIBUCION, PUERTA_ESTRATEGIA)
+
+# Cambiar cuando cambie el modelo de simulación: invalida los resultados en caché
+VERSION_MODELO = 2
+
+# Parámetros de un escenario y su valor por defecto (los de config.py). Todo
+# lo que cambia el resultado de run_scenario tiene que estar aquí: es la clave de la caché
+PARAMETROS = {
+    "capacidad": CAPACIDAD,
+    "vehiculos": VEHICULOS_INICIALES,
+    "intervalo": 0.5,
+    "tiempo_min_espera": TIEMPO_MIN_ESPERA,
+    "tiempo_max_espera": TIEMPO_MAX_ESPERA,
+    "tiempo_min_estacionado": TIEMPO_MIN_ESTACIONADO,
+    "tiempo_max_estacionado": TIEMPO_MAX_ESTACIONADO,
+    "paciencia": None,   # Segundos máximos en la fila antes de irse (None = espera siempre)
+    "perfil": None,      # None = 'vehiculos' cada 'intervalo' s; "constante" o "pico" = generador de tráfico
+    "tasa": TRAFICO_TASA,
+    "tasa_pico": TRAFICO_TASA_PICO,
+    "horas_pico": TRAFICO_HORAS_PICO,  # [(hora_inicio, hora_fin)] (no se barre por línea de comandos)
+    "estadia": TRAFICO_ESTADIA,
+    "horas": 24,
+    "puertas_entrada": 0,   # Barreras (0 = sin barreras)
+    "puertas_salida": 0,
+    "servicio_entrada": PUERTA_SERVICIO_ENTRADA,
+    "servicio_salida": PUERTA_SERVICIO_SALIDA,
+    "distribucion_puerta": PUERTA_DISTRIBUCION,
+    "estrategia": PUERTA_ESTRATEGIA,
+    "seed": SEMILLA,
+}
+
+# Tipo de los valores por línea de comandos (el resto de los parámetros es float)
+_ENTEROS = ("capacidad", "vehiculos", "puertas_entrada", "puertas_salida", "seed")
+_TEXTOS = ("perfil", "estadia", "distribucion_puerta", "estrategia")
+
+# Columnas de resultados de la tabla
+METRICAS = ["utilizacion", "espera_p50", "espera_p95", "espera_p99",
+            "tasa_rechazo", "puerta_utilizacion_max", "completados", "tiempo_real"]
+
+
+def _normalize(value):
+    """600 y 600.0 son el mismo escenario: los float enteros se hashean como int."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def scenario_key(scenario):
+    """Hash de la configuración completa del escenario (clave de la caché)."""
+    normalized = {name: _normalize(value) for name, value in scenario.items()}
+    payload = json.dumps({"version": VERSION_MODELO, **normalized}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def grid(values):
+    """
+    Producto cartesiano de la grilla.
+
+    Parámetros:
+    - values: dict parámetro -> lista de valores (los que faltan toman su valor por defecto)
+
+    Retorna:
+    - Lista de escenarios (dict con todos los parámetros)
+    """
+    names = list(values)
+    scenarios = []
+    for combo in itertools.product(*(values[name] for name in names)):
+        scenario = dict(PARAMETROS)
+        scenario.update(zip(names, combo))
+        scenarios.append(scenario)
+    return scenarios
+
+
+def run_scenario(scenario):
+    """
+    Simula un escenario con el motor de eventos discretos (en un proceso del pool).
+
+    Retorna:
+    - dict con las métricas de METRICAS más el resumen del motor
+    """
+    from engine import DiscreteEventEngine
+    from gates import GateBank, service_time
+    from stats import SimulationStats
+    from traffic import (Exponencial, LogNormal, Uniforme, TrafficGenerator, feed_engine,
+                         perfil_constante, perfil_horas_pico)
+
+    started = time.perf_counter()
+    stats = SimulationStats(scenario["capacidad"])
+    dwell_range = (scenario["tiempo_min_estacionado"], scenario["tiempo_max_estacionado"])
+    gates = [GateBank.build(prefix, scenario[count], service_time(scenario["distribucion_puerta"], scenario[mean]),
+                            scenario["estrategia"]) if scenario[count] else None
+             for prefix, count, mean in (("E", "puertas_entrada", "servicio_entrada"),
+                                         ("S", "puertas_salida", "servicio_salida"))]
+    engine = DiscreteEventEngine(scenario["capacidad"], seed=scenario["seed"], on_event=stats.record,
+                                 wait_range=(scenario["tiempo_min_espera"], scenario["tiempo_max_espera"]),
+                                 dwell_range=dwell_range, max_wait=scenario["paciencia"],
+                                 entry_gates=gates[0], exit_gates=gates[1])
+    if scenario["perfil"] is None:
+        engine.add_vehicles(scenario["vehiculos"], scenario["intervalo"])
+    else:
+        profile = (perfil_horas_pico(scenario["tasa"], scenario["tasa_pico"], scenario["horas_pico"])
+                   if scenario["perfil"] == "pico" else perfil_constante(scenario["tasa"]))
+        mean_dwell = sum(dwell_range) / 2
+        dwell = {"uniforme": lambda: Uniforme(*dwell_range),
+                 "exponencial": lambda: Exponencial(mean_dwell),
+                 "lognormal": lambda: LogNormal(mean_dwell)}[scenario["estadia"]]()
+        generator = TrafficGenerator(profile, dwell, scenario["seed"])
+        feed_engine(engine, generator.generate(scenario["horas"] * 3600))
+
+    summary = engine.run()
+    result = stats.snapshot(engine.now)
+    result.update(summary)
+    created = summary["vehiculos_creados"]
+    result["tasa_rechazo"] = summary["rechazos"] / created if created else 0.0
+    result.setdefault("puerta_utilizacion_max", 0.0)
+    result["tiempo_real"] = time.perf_counter() - started
+    return result
+
+
+def load_cache(filename):
+    """Resultados ya calculados: dict clave -> resultado."""
+    cache = {}
+    if filename and os.path.exists(filename):
+        with open(filename, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Línea cortada por una corrida interrumpida
+                cache[entry["clave"]] = entry["resultado"]
+    return cache
+
+
+def sweep(scenarios, workers=None, cache_file=BARRIDO_CACHE, progress=None):
+    """
+    Corre los escenarios que no están en la caché en un pool de procesos.
+
+    Parámetros:
+    - workers: Procesos (None = uno por núcleo)
+    - cache_file: Archivo de la caché (None = sin caché)
+    - progress: Callback opcional progress(hechos, total, escenario, desde_cache)
+
+    Retorna:
+    - Lista de (escenario, resultado) en el orden de 'scenarios'
+    """
+    cache = load_cache(cache_file)
+    keys = [scenario_key(s) for s in scenarios]
+    results = {}
+    pending = {}
+    for key, scenario in zip(keys, scenarios):
+        if key in cache:
+            results[key] = cache[key]
+            if progress is not None:
+                progress(len(results), len(scenarios), scenario, True)
+        else:
+            pending[key] = scenario
+
+    if pending:
+        out = open(cache_file, "a", encoding="utf-8") if cache_file else None
+        try:
+            with ProcessPoolExecutor(workers) as pool:
+                futures = {pool.submit(run_scenario, s): key for key, s in pending.items()}
+                for future in as_completed(futures):
+                    key = futures[future]
+                    results[key] = future.result()
+                    if out is not None:
+                        # Una línea por escenario terminado: un barrido interrumpido no pierde lo hecho
+                        out.write(json.dumps({"clave": key, "escenario": pending[key],
+                                              "resultado": results[key]}) + "\n")
+                        out.flush()
+                    if progress is not None:
+                        progress(len(results), len(scenarios), pending[key], False)
+        finally:
+            if out is not None:
+                out.close()
+
+    return [(scenario, results[key]) for key, scenario in zip(keys, scenarios)]
+
+
+def table(rows, columns):
+    """Tabla de texto alineada: las columnas de parámetros y luego METRICAS."""
+    def cell(value):
+        if isinstance(value, float):
+            return f"{value:.3f}"
+        return "-" if value is None else str(value)
+
+    header = columns + METRICAS
+    body = [[cell(scenario[c]) for c in columns] + [cell(result[m]) for m in METRICAS]
+            for scenario, result in rows]
+    widths = [max(len(h), *(len(r[i]) for r in body)) for i, h in enumerate(header)]
+    lines = ["  ".join(h.rjust(w) for h, w in zip(header, widths)),
+             "  ".join("-" * w for w in widths)]
+    lines += ["  ".join(v.rjust(w) for v, w in zip(r, widths)) for r in body]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de parámetros en modo headless")
+    for name, default in PARAMETROS.items():
+        if name == "horas_pico":
+            continue
+        kind = int if name in _ENTEROS else str if name in _TEXTOS else float
+        parser.add_argument("--" + name.replace("_", "-"), dest=name, type=kind, nargs="+",
+                            help=f"Valores a barrer (por defecto {default})")
+    parser.add_argument("--procesos", type=int, default=0, help="Procesos del pool (0 = uno por núcleo)")
+    parser.add_argument("--cache", default=BARRIDO_CACHE, help="Archivo de caché de resultados")
+    parser.add_argument("--sin-cache", action="store_true", help="No leer ni escribir la caché")
+    parser.add_argument("--csv", help="Guardar la tabla en CSV")
+    parser.add_argument("--json", help="Guardar escenarios y resultados en JSON")
+    args = parser.parse_args(argv)
+
+    values = {name: getattr(args, name) for name in PARAMETROS if getattr(args, name, None)}
+    scenarios = grid(values)
+    # Columnas de la tabla: los parámetros que varían (o los dados, si ninguno varía)
+    swept = [name for name in values if len(values[name]) > 1] or list(values) or ["capacidad"]
+
+    def progress(done, total, scenario, cached):
+        label = ", ".join(f"{name}={scenario[name]}" for name in swept)
+        print(f"[{done}/{total}] {label}{' (caché)' if cached else ''}", file=sys.stderr)
+
+    started = time.perf_counter()
+    rows = sweep(scenarios, args.procesos or None, None if args.sin_cache else args.cache, progress)
+    print(table(rows, swept))
+    print(f"\n{len(rows)} escenarios en {time.perf_counter() - started:.2f} s", file=sys.stderr)
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(PARAMETROS) + METRICAS)
+            for scenario, result in rows:
+                writer.writerow([scenario[p] for p in PARAMETROS] + [result[m] for m in METRICAS])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([{"escenario": s, "resultado": r} for s, r in rows], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
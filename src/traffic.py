@@ -0,0 +1,289 @@
+import math
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from clock import WALL_CLOCK
+from config import (TIEMPO_MIN_ESTACIONADO, TIEMPO_MAX_ESTACIONADO,
+                    TRAFICO_TASA, TRAFICO_TASA_PICO, TRAFICO_HORAS_PICO)
+
+DIA = 24 * 3600  # Segundos de un día (los perfiles se repiten cada día)
+
+
+# === PERFILES DE LLEGADA (tasa según la hora del día) ===
+
+class RateProfile:
+    """
+    Curva de tasa de llegadas por hora del día, constante por tramos.
+
+    Parámetros:
+    - tramos: Lista de (hora_inicio, vehículos_por_hora), ordenada; cada tramo
+      dura hasta el inicio del siguiente y el último hasta medianoche
+    """
+
+    def __init__(self, tramos):
+        if not tramos or tramos[0][0] != 0:
+            raise ValueError("El perfil debe empezar a la hora 0")
+        self.tramos = [(float(hora), float(tasa)) for hora, tasa in tramos]
+
+    def segments(self, start, end):
+        """
+        Recorre los tramos de tasa constante entre 'start' y 'end' (segundos).
+
+        Retorna:
+        - Generador de (inicio, fin, vehículos_por_segundo)
+        """
+        bounds = [hora * 3600 for hora, _ in self.tramos] + [DIA]
+        t = start
+        while t < end:
+            day = math.floor(t / DIA) * DIA
+            offset = t - day
+            k = bisect_left(bounds, offset + 1e-9) - 1
+            seg_end = min(end, day + bounds[k + 1])
+            yield t, seg_end, self.tramos[k][1] / 3600
+            t = seg_end
+
+    def rate_at(self, t):
+        """Vehículos por hora en el instante 't' (segundos desde medianoche del día 0)."""
+        hora = (t % DIA) / 3600
+        rate = self.tramos[0][1]
+        for inicio, tasa in self.tramos:
+            if inicio > hora:
+                break
+            rate = tasa
+        return rate
+
+
+def perfil_constante(tasa=TRAFICO_TASA):
+    """La misma tasa todo el día."""
+    return RateProfile([(0, tasa)])
+
+
+def perfil_horas_pico(tasa=TRAFICO_TASA, tasa_pico=TRAFICO_TASA_PICO, horas_pico=TRAFICO_HORAS_PICO):
+    """
+    Tasa base con horas pico.
+
+    Parámetros:
+    - horas_pico: Lista de (hora_inicio, hora_fin) con tasa 'tasa_pico'
+    """
+    tramos = [(0, tasa)]
+    for inicio, fin in sorted(horas_pico):
+        if tramos[-1][0] == inicio:
+            tramos.pop()
+        tramos.append((inicio, tasa_pico))
+        tramos.append((fin, tasa))
+    return RateProfile([(h, t) for h, t in tramos if h < 24])
+
+
+PERFILES = {
+    "constante": perfil_constante,
+    "pico": perfil_horas_pico,
+}
+
+
+# === DISTRIBUCIONES DE ESTADÍA ===
+
+class Uniforme:
+    """Estadía uniforme entre 'minimo' y 'maximo' segundos (la de config.py)."""
+
+    def __init__(self, minimo=TIEMPO_MIN_ESTACIONADO, maximo=TIEMPO_MAX_ESTACIONADO):
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def sample(self, rng, n):
+        lo, span = self.minimo, self.maximo - self.minimo
+        rand = rng.random
+        return [lo + span * rand() for _ in range(n)]
+
+
+class Exponencial:
+    """Estadía exponencial con media 'media' segundos."""
+
+    def __init__(self, media=(TIEMPO_MIN_ESTACIONADO + TIEMPO_MAX_ESTACIONADO) / 2):
+        self.media = media
+
+    def sample(self, rng, n):
+        expo = rng.expovariate
+        lam = 1 / self.media
+        return [expo(lam) for _ in range(n)]
+
+
+class LogNormal:
+    """
+    Estadía lognormal dada su media y desviación estándar (en segundos, no
+    los parámetros de la normal subyacente).
+    """
+
+    def __init__(self, media=(TIEMPO_MIN_ESTACIONADO + TIEMPO_MAX_ESTACIONADO) / 2, desviacion=None):
+        if desviacion is None:
+            desviacion = media / 2
+        self.media = media
+        self.desviacion = desviacion
+        sigma2 = math.log(1 + (desviacion / media) ** 2)
+        self._mu = math.log(media) - sigma2 / 2
+        self._sigma = math.sqrt(sigma2)
+
+    def sample(self, rng, n):
+        lognorm = rng.lognormvariate
+        mu, sigma = self._mu, self._sigma
+        return [lognorm(mu, sigma) for _ in range(n)]
+
+
+class Empirica:
+    """Estadía tomada al azar de valores observados (p. ej. de un log real)."""
+
+    def __init__(self, muestras):
+        if not muestras:
+            raise ValueError("La distribución empírica necesita al menos una muestra")
+        self.muestras = list(muestras)
+
+    def sample(self, rng, n):
+        return rng.choices(self.muestras, k=n)
+
+
+ESTADIAS = {
+    "uniforme": Uniforme,
+    "exponencial": Exponencial,
+    "lognormal": LogNormal,
+}
+
+
+# === GENERADOR ===
+
+class Arrivals:
+    """
+    Llegadas pre-muestreadas: tiempos (segundos, ordenados) y estadías, en
+    arreglos compactos de floats (8 bytes por valor).
+    """
+
+    def __init__(self, times, dwells):
+        self.times = times
+        self.dwells = dwells
+
+    def __len__(self):
+        return len(self.times)
+
+    def __iter__(self):
+        return zip(self.times, self.dwells)
+
+
+class TrafficGenerator:
+    """
+    Generador de tráfico: llegadas de Poisson con tasa variable según la hora
+    y estadías según una distribución.
+
+    generate() pre-muestrea un período completo (p. ej. un día) de una vez: en
+    cada tramo de tasa constante saca todos los intervalos exponenciales en un
+    lote, los acumula y corta en el fin del tramo, en vez de ir evento por evento.
+    """
+
+    def __init__(self, profile=None, dwell=None, seed=None):
+        self.profile = profile or perfil_constante()
+        self.dwell = dwell or Uniforme()
+        self.rng = random.Random(seed)
+
+    def generate(self, duration, start=0.0):
+        """
+        Muestrea las llegadas entre 'start' y 'start + duration' (segundos).
+
+        Retorna:
+        - Arrivals con tiempos ordenados y sus estadías
+        """
+        rng = self.rng
+        times = array("d")
+        for seg_start, seg_end, rate in self.profile.segments(start, start + duration):
+            if rate <= 0:
+                continue
+            expected = rate * (seg_end - seg_start)
+            t = seg_start
+            while t < seg_end:
+                # Lote con margen (media + 4 desviaciones) para que casi
+                # siempre alcance con uno solo
+                batch = int(expected + 4 * math.sqrt(expected)) + 16
+                expo = rng.expovariate
+                points = list(accumulate([expo(rate) for _ in range(batch)], initial=t))[1:]
+                cut = bisect_left(points, seg_end)
+                times.extend(points[:cut])
+                if cut < batch:
+                    break
+                t = points[-1]
+        dwells = array("d", self.dwell.sample(rng, len(times)))
+        return Arrivals(times, dwells)
+
+
+# === ALIMENTAR LA SIMULACIÓN ===
+
+def feed_engine(engine, arrivals, first_id=1):
+    """
+    Agenda las llegadas en un DiscreteEventEngine (modo headless).
+
+    Retorna:
+    - Número de vehículos agregados
+    """
+    add = engine.add_vehicle
+    for k, (when, dwell) in enumerate(arrivals):
+        add(first_id + k, when, dwell)
+    return len(arrivals)
+
+
+def run_traffic_headless(generator, horas=24, capacidad=None, seed=None, on_event=None,
+                         entry_gates=None, exit_gates=None):
+    """
+    Simula 'horas' horas del generador en el motor de eventos discretos.
+    'on_event' y las barreras (gates.GateBank) se pasan al motor
+    (on_event(tipo, vehicle_id, tiempo, espacio)).
+
+    Retorna:
+    - dict con el resumen del motor (más el total de llegadas generadas)
+    """
+    from engine import DiscreteEventEngine
+    from config import CAPACIDAD
+
+    started = time.perf_counter()
+    arrivals = generator.generate(horas * 3600)
+    sampled = time.perf_counter() - started
+    engine = DiscreteEventEngine(capacidad or CAPACIDAD, seed=seed, on_event=on_event,
+                                 entry_gates=entry_gates, exit_gates=exit_gates)
+    feed_engine(engine, arrivals)
+    summary = engine.run()
+    summary["llegadas_generadas"] = len(arrivals)
+    summary["tiempo_muestreo"] = sampled
+    return summary
+
+
+class TrafficFeeder(threading.Thread):
+    """
+    Hilo que entrega las llegadas en tiempo real (escalado) a la simulación
+    con threads: en cada llegada llama submit(llegada, estadía).
+
+    Parámetros:
+    - submit: Callback que crea y encola el vehículo (p. ej. en VehiclePool)
+    - time_scale: Factor de los tiempos (1.0 = tiempo real)
+    - stop_event: threading.Event que detiene la entrega
+    - clock: Reloj con que se miden los intervalos (None = tiempo real)
+    """
+
+    def __init__(self, arrivals, submit, stop_event, time_scale=1.0, clock=None):
+        super().__init__(name="TrafficFeeder", daemon=True)
+        self.arrivals = arrivals
+        self.submit = submit
+        self.stop_event = stop_event
+        self.time_scale = time_scale
+        self.clock = clock or WALL_CLOCK
+        self.delivered = 0
+
+    def run(self):
+        clock = self.clock
+        started = clock.now()
+        first = self.arrivals.times[0] if len(self.arrivals) else 0.0
+        for when, dwell in self.arrivals:
+            delay = started + (when - first) * self.time_scale - clock.now()
+            # Se despierta apenas se detiene la simulación
+            if delay > 0 and not clock.sleep(delay, self.stop_event):
+                return
+            if self.stop_event.is_set():
+                return
+            self.submit(when, dwell)
+            self.delivered += 1
@@ -1,49 +1,119 @@
 import threading
-import time
 import random
-from config import TIEMPO_MIN_ESPERA, TIEMPO_MAX_ESPERA, TIEMPO_MIN_ESTACIONADO, TIEMPO_MAX_ESTACIONADO
+from clock import WALL_CLOCK
+from events import EventKind, ParkingEvent, vehicle_name
+from settings import SETTINGS
+from slots import SlotType
+
+def vehicle_rng(seed, vehicle_id):
+    """
+    Generador aleatorio propio de un vehículo, derivado de (seed, vehicle_id).
+
+    Con el módulo random global compartido, el orden en que el sistema
+    operativo reparte los hilos decide qué número le toca a cada vehículo; con
+    un generador por vehículo sus tiempos no dependen de los demás hilos.
+    """
+    return random.Random(f"{seed}:vehiculo:{vehicle_id}")
+
 
 class Vehicle(threading.Thread):
     """
     Clase que representa un vehículo (proceso).
     Cada vehículo es un hilo que compite por un recurso finito (espacio de parqueo).
+
+    También puede usarse como trabajo de un VehiclePool: un hilo del pool
+    llama run() directamente y el Vehicle nunca se inicia como thread propio.
+
+    Duerme y marca sus eventos con 'clock' (por defecto el reloj real; con un
+    clock.SimulationClock respeta la velocidad, la pausa y el paso a paso).
     """
 
-    def __init__(self, vehicle_id, parking_lot, event_queue, stop_event):
-        super().__init__(name=f"Vehículo-{vehicle_id}")
+    def __init__(self, vehicle_id, parking_lot, event_queue, stop_event,
+                 vehicle_type=SlotType.ESTANDAR, on_finish=None, time_scale=1.0,
+                 initial_wait=None, dwell=None, rng=None, clock=None):
+        super().__init__(name=vehicle_name(vehicle_id))
         self.vehicle_id = vehicle_id
         self.parking_lot = parking_lot
         self.event_queue = event_queue
         self.stop_event = stop_event
+        self.vehicle_type = vehicle_type  # Tipo de espacio que necesita
+        self.slot = None                  # Índice del espacio que ocupa (None = afuera)
+        self.on_finish = on_finish        # Callback on_finish(vehicle_id) al terminar el hilo
+        self.time_scale = time_scale      # Factor de los tiempos de la configuración (1.0 = tiempo real)
+        # Tiempos fijos (p. ej. del generador de tráfico); None = sortear con SETTINGS
+        self.initial_wait = initial_wait
+        self.dwell = dwell
+        self.rng = rng if rng is not None else random  # Ver vehicle_rng()
+        self.clock = clock or WALL_CLOCK
 
     def run(self):
         """Ciclo de vida del hilo (proceso)."""
-        # MEJORADO: Usar constantes de config.py en lugar de valores hardcoded
-        # Ahora si quieres cambiar el tiempo, solo editas config.py
-        time.sleep(random.uniform(TIEMPO_MIN_ESPERA, TIEMPO_MAX_ESPERA))
-
-        while not self.stop_event.is_set():
-            try:
-                # Usar el método try_enter() en lugar de acceder directamente al semáforo
-
-                if self.parking_lot.try_enter(self.name, timeout=2):
-                    # Logramos entrar al parqueadero
-                    self.event_queue.put(f"{self.name} ingresó al parqueadero.")
-
-                    # Simular tiempo estacionado (usando constantes de config)
-                    time.sleep(random.uniform(TIEMPO_MIN_ESTACIONADO, TIEMPO_MAX_ESTACIONADO))
-
-                    # Usar el método exit() en lugar de acceder directamente
-                    self.parking_lot.exit(self.name)
-                    self.event_queue.put(f"{self.name} salió del parqueadero.")
-                    break  # Terminamos el ciclo - este vehículo completó su tarea
-                else:
-                    # No había espacio disponible - seguimos esperando
-                    self.event_queue.put(f"{self.name} esperando espacio...")
-
-            # Capturar solo excepciones específicas, no todas
-            except (RuntimeError, ValueError) as e:
-                # RuntimeError: problemas con threading
-                # ValueError: problemas con semaphore
-                self.event_queue.put(f"Error en {self.name}: {e}")
-                break
+        try:
+            self._lifecycle()
+        finally:
+            # Avisar que el hilo terminó, por cualquier camino (contador de vivos)
+            if self.on_finish is not None:
+                self.on_finish(self.vehicle_id)
+
+    def _lifecycle(self):
+        # Tiempos de la configuración vigente (SETTINGS): se leen en cada
+        # vehículo, así que una recarga en caliente afecta a los que siguen
+        wait = self.initial_wait
+        if wait is None:
+            wait = self.rng.uniform(SETTINGS.TIEMPO_MIN_ESPERA, SETTINGS.TIEMPO_MAX_ESPERA)
+        if wait:
+            self.clock.sleep(wait * self.time_scale, self.stop_event)
+
+        if self.stop_event.is_set():
+            return
+
+        try:
+            # Barrera de entrada (si el parqueadero tiene puertas): fila y servicio
+            if not self.parking_lot.pass_entry_gate(self.rng, self.stop_event):
+                self.event_queue.put(ParkingEvent.now(EventKind.RECHAZADO, self.vehicle_id,
+                                                      clock=self.clock))
+                return
+
+            # Usar el método try_enter() en lugar de acceder directamente al semáforo
+            if not self.parking_lot.try_enter(self.name, timeout=0,
+                                              vehicle_type=self.vehicle_type):
+                # Lleno: avisar una sola vez y hacer fila (FIFO) hasta que nos toque.
+                # El hilo queda bloqueado sin sondear; solo se despierta cuando
+                # alguien le entrega su espacio o cuando se detiene la simulación.
+                self.event_queue.put(ParkingEvent.now(EventKind.ESPERANDO, self.vehicle_id,
+                                                      clock=self.clock))
+                if not self.parking_lot.try_enter(self.name, timeout=None,
+                                                  stop_event=self.stop_event,
+                                                  vehicle_type=self.vehicle_type):
+                    # Simulación detenida mientras esperaba
+                    self.event_queue.put(ParkingEvent.now(EventKind.RECHAZADO, self.vehicle_id,
+                                                          clock=self.clock))
+                    return
+
+            # Logramos entrar al parqueadero: saber qué espacio nos tocó
+            self.slot = self.parking_lot.slot_of(self.name)
+            self.event_queue.put(ParkingEvent.now(EventKind.INGRESO, self.vehicle_id, self.slot,
+                                                  clock=self.clock))
+
+            # Simular tiempo estacionado (con los tiempos de SETTINGS)
+            # Si se detiene la simulación, sale antes (el reloj puede estar en pausa)
+            stay = self.dwell
+            if stay is None:
+                stay = self.rng.uniform(SETTINGS.TIEMPO_MIN_ESTACIONADO, SETTINGS.TIEMPO_MAX_ESTACIONADO)
+            self.clock.sleep(stay * self.time_scale, self.stop_event)
+
+            # Barrera de salida: el espacio sigue ocupado hasta cruzarla
+            self.parking_lot.pass_exit_gate(self.rng, self.stop_event)
+
+            # Usar el método exit() en lugar de acceder directamente
+            self.parking_lot.exit(self.name)
+            self.event_queue.put(ParkingEvent.now(EventKind.SALIDA, self.vehicle_id, self.slot,
+                                                  clock=self.clock))
+            self.slot = None
+
+        # Capturar solo excepciones específicas, no todas
+        except (RuntimeError, ValueError) as e:
+            # RuntimeError: problemas con threading
+            # ValueError: problemas con semaphore
+            self.event_queue.put(ParkingEvent.now(EventKind.ERROR, self.vehicle_id, detail=str(e),
+                                                  clock=self.clock))
@@ -0,0 +1,153 @@
+import threading
+import traceback
+from collections import deque
+from config import HILOS_POOL
+
+# Segundos reales que un hilo extra espera trabajo antes de terminar
+_ESPERA_HILO_EXTRA = 5.0
+
+
+class VehiclePool:
+    """
+    Pool de hilos trabajadores que atienden una cola de vehículos.
+
+    En lugar de un thread nuevo por vehículo (que además quedaba para siempre
+    en la lista del simulador), los hilos del pool toman vehículos de la cola
+    y ejecutan su ciclo de vida con Vehicle.run(). Cuando un vehículo termina,
+    el pool suelta su referencia: no queda nada que recorrer ni que liberar,
+    así que una corrida continua de horas usa memoria constante.
+
+    Cada hilo atiende un vehículo durante toda su vida (espera, fila y
+    estadía son llamadas bloqueantes), así que el pool no puede tener menos
+    hilos que vehículos activos: si los hubiera, los demás esperarían en la
+    cola del pool y el parqueadero nunca se llenaría más allá de 'workers'.
+    Por eso el pool crece solo: 'workers' hilos fijos, y uno extra por cada
+    vehículo que llega sin un hilo libre. Los extra terminan después de
+    _ESPERA_HILO_EXTRA segundos sin trabajo, así que los hilos vivos siguen a
+    los vehículos activos y no al total de la corrida.
+    """
+
+    def __init__(self, workers=HILOS_POOL, name="Pool", max_workers=None):
+        """
+        Parámetros:
+        - workers: Hilos fijos (los que siempre están)
+        - max_workers: Tope de hilos (None = sin tope; con tope, los vehículos
+          que no tienen hilo esperan en la cola del pool)
+        """
+        self._jobs = deque()
+        self._lock = threading.Lock()
+        self._has_jobs = threading.Condition(self._lock)   # Para los hilos trabajadores
+        self._idle = threading.Condition(self._lock)       # Para wait_idle()
+        self._active = 0          # Vehículos ejecutándose ahora
+        self._waiting = 0         # Hilos esperando trabajo
+        self._closed = False
+        self.name = name
+        self.max_workers = max_workers
+        self.submitted = 0
+        self.completed = 0
+        self.peak_workers = workers
+        self._spawned = 0
+        self._threads = []
+        with self._lock:
+            for _ in range(workers):
+                self._spawn(fixed=True)
+
+    @property
+    def workers(self):
+        """Hilos vivos ahora (fijos + extra)."""
+        return len(self._threads)
+
+    def _spawn(self, fixed):
+        """Agrega un hilo trabajador (con el lock tomado)."""
+        self._spawned += 1
+        thread = threading.Thread(target=self._work, args=(fixed,), name=f"{self.name}-{self._spawned}",
+                                  daemon=True)
+        self._threads.append(thread)
+        if len(self._threads) > self.peak_workers:
+            self.peak_workers = len(self._threads)
+        thread.start()
+
+    def submit(self, vehicle):
+        """Encola un vehículo (cualquier objeto con run()); si no hay hilo libre, crea uno."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("El pool de vehículos ya fue cerrado")
+            self._jobs.append(vehicle)
+            self.submitted += 1
+            if len(self._jobs) > self._waiting and (self.max_workers is None
+                                                    or len(self._threads) < self.max_workers):
+                self._spawn(fixed=False)
+            else:
+                self._has_jobs.notify()
+
+    def _work(self, fixed):
+        """Hilo trabajador: ejecuta vehículos de la cola hasta el cierre (o, si es extra, hasta quedar ocioso)."""
+        while True:
+            with self._lock:
+                while not self._jobs and not self._closed:
+                    self._waiting += 1
+                    try:
+                        notified = self._has_jobs.wait(None if fixed else _ESPERA_HILO_EXTRA)
+                    finally:
+                        self._waiting -= 1
+                    if not notified and not self._jobs:
+                        self._threads.remove(threading.current_thread())
+                        return  # Hilo extra sin trabajo: el pool vuelve a achicarse
+                if not self._jobs:
+                    self._threads.remove(threading.current_thread())
+                    return  # Cerrado y sin trabajo pendiente
+                vehicle = self._jobs.popleft()
+                self._active += 1
+            try:
+                vehicle.run()
+            except Exception:
+                # Un vehículo con un error no debe matar al hilo del pool
+                traceback.print_exc()
+            finally:
+                vehicle = None  # Soltar la referencia: el vehículo queda libre
+                with self._lock:
+                    self._active -= 1
+                    self.completed += 1
+                    if not self._active and not self._jobs:
+                        self._idle.notify_all()
+
+    def pending(self):
+        """Vehículos en la cola que todavía no toma ningún hilo."""
+        return len(self._jobs)
+
+    def active(self):
+        """Vehículos que se están ejecutando ahora."""
+        return self._active
+
+    def cancel_pending(self):
+        """
+        Saca de la cola los vehículos que no empezaron.
+
+        Retorna:
+        - Lista de los vehículos descartados
+        """
+        with self._lock:
+            jobs = list(self._jobs)
+            self._jobs.clear()
+            if not self._active:
+                self._idle.notify_all()
+        return jobs
+
+    def wait_idle(self, timeout=None):
+        """
+        Espera a que no haya vehículos en ejecución ni en cola.
+
+        Retorna:
+        - True si el pool quedó libre, False si se cumplió el timeout
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._active and not self._jobs, timeout)
+
+    def shutdown(self, timeout=None):
+        """Cierra el pool: los hilos terminan lo pendiente y salen."""
+        with self._lock:
+            self._closed = True
+            self._has_jobs.notify_all()
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join(timeout)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos de src/ se importan por nombre, igual que al correr python src/main.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
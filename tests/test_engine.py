@@ -0,0 +1,60 @@
+import pytest
+from engine import DiscreteEventEngine, run_headless
+
+
+def _engine(**kwargs):
+    # Tiempos fijos: la regresión no depende de lo que diga config.py
+    return DiscreteEventEngine(12, seed=42, wait_range=(1, 3), dwell_range=(3, 8), **kwargs)
+
+
+def test_fixed_seed_regression():
+    engine = _engine()
+    engine.add_vehicles(2000, 0.5)
+    summary = engine.run()
+    assert summary["vehiculos_creados"] == 2000
+    assert summary["estacionados"] == summary["completados"] == 2000
+    assert summary["vehiculos_que_esperaron"] == 654
+    assert summary["max_en_espera"] == 4
+    assert summary["rechazos"] == 0
+    assert summary["espera_promedio"] == pytest.approx(0.1710292414, rel=1e-9)
+    assert summary["tiempo_simulado"] == pytest.approx(1007.7644049771, rel=1e-12)
+
+
+def test_same_seed_same_events():
+    def trace():
+        events = []
+        engine = _engine(on_event=lambda *event: events.append(event))
+        engine.add_vehicles(300, 0.2)
+        engine.run()
+        return events
+
+    assert trace() == trace()
+
+
+def test_run_until_resumes_where_it_stopped():
+    whole = _engine()
+    whole.add_vehicles(500, 0.2)
+    expected = whole.run()
+
+    split = _engine()
+    split.add_vehicles(500, 0.2)
+    split.run(until=30.0)
+    assert split.now == 30.0
+    summary = split.run()
+    for key in ("estacionados", "completados", "vehiculos_que_esperaron", "max_en_espera",
+                "espera_promedio", "tiempo_simulado"):
+        assert summary[key] == expected[key]
+
+
+def test_max_wait_rejects_from_the_queue():
+    engine = DiscreteEventEngine(3, seed=1, wait_range=(1, 3), dwell_range=(3, 8), max_wait=2.0)
+    engine.add_vehicles(200, 0.1)
+    summary = engine.run()
+    assert summary["rechazos"] > 0
+    assert summary["estacionados"] + summary["rechazos"] == 200
+    assert summary["esperando"] == 0
+
+
+def test_run_headless_parks_everyone():
+    summary = run_headless(100, capacidad=5, interval=0.5, seed=3)
+    assert summary["estacionados"] == summary["completados"] == 100
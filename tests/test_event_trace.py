@@ -0,0 +1,112 @@
+import random
+import pytest
+from engine import DiscreteEventEngine
+from event_trace import TraceRecorder, load_trace, replay, replay_stats, trace_capacity
+from events import EventKind, ParkingEvent
+from stats import SimulationStats
+from vehicle import vehicle_rng
+
+
+def _record_run(filename, capacidad=4, vehicles=300, seed=5):
+    """Corrida del motor grabada como en la GUI: cada evento a las estadísticas y a la traza."""
+    stats = SimulationStats(capacidad)
+    recorder = TraceRecorder(filename, seed=seed, capacidad=capacidad)
+
+    def on_event(kind, vehicle_id, when, slot):
+        event = ParkingEvent(EventKind(kind), vehicle_id, when, slot)
+        stats.record_event(event)
+        recorder.record(event)
+
+    engine = DiscreteEventEngine(capacidad, seed=seed, on_event=on_event,
+                                 wait_range=(0.1, 0.3), dwell_range=(0.5, 2.0))
+    engine.add_vehicles(vehicles, 0.1)
+    engine.run()
+    recorder.record("texto libre: no va a la traza")
+    recorder.close(stats.snapshot())
+    return recorder.count
+
+
+def test_round_trip_reproduces_the_recorded_stats(tmp_path):
+    filename = str(tmp_path / "corrida.traza")
+    count = _record_run(filename)
+    meta, events = load_trace(filename)
+    assert meta["seed"] == 5 and meta["capacidad"] == 4
+    assert len(events) == count
+    assert "resumen" in meta
+
+    _, snapshot, mismatches = replay_stats(filename)
+    assert mismatches == []
+    for key, value in meta["resumen"].items():
+        if key not in ("vehiculos_creados", "vehiculos_vivos"):
+            assert snapshot[key] == value
+
+
+def test_replay_stats_reports_a_tampered_trace(tmp_path):
+    filename = str(tmp_path / "corrida.traza")
+    _record_run(filename)
+    with open(filename, encoding="utf-8") as f:
+        lines = f.readlines()
+    # Quitar el último evento antes del resumen
+    del lines[-2]
+    with open(filename, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    assert replay_stats(filename)[2]
+
+
+def test_replay_keeps_order_and_intervals():
+    events = [ParkingEvent(EventKind.LLEGADA, 1, 10.0), ParkingEvent(EventKind.INGRESO, 1, 10.5, 0),
+              ParkingEvent(EventKind.SALIDA, 1, 12.0, 0)]
+    replayed = []
+    assert replay(events, replayed.append, origin=100.0) == 3
+    assert [e.timestamp for e in replayed] == [100.0, 100.5, 102.0]
+    assert [e.kind for e in replayed] == [e.kind for e in events]
+
+
+def test_load_trace_rejects_other_files(tmp_path):
+    path = tmp_path / "otro.csv"
+    path.write_text("timestamp,tipo\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_trace(str(path))
+
+
+def test_capacity_comes_from_the_trace_not_the_lot(tmp_path):
+    filename = str(tmp_path / "grande.traza")
+    _record_run(filename, capacidad=40, vehicles=200)
+    meta, events = load_trace(filename)
+    assert trace_capacity(meta, events) == 40
+    # Sin capacidad en la cabecera, el mayor espacio usado
+    assert trace_capacity({}, events) == max(e.slot for e in events) + 1
+    assert trace_capacity({"capacidad": None}, []) == 0
+
+
+def test_trace_with_more_slots_than_its_header_loads(tmp_path):
+    # Traza grabada con un parqueadero de 8 espacios y cabecera de 2
+    filename = str(tmp_path / "chica.traza")
+    recorder = TraceRecorder(filename, capacidad=2)
+    for vehicle_id in range(1, 9):
+        recorder.record(ParkingEvent(EventKind.INGRESO, vehicle_id, float(vehicle_id), vehicle_id - 1))
+    for vehicle_id in range(1, 9):
+        recorder.record(ParkingEvent(EventKind.SALIDA, vehicle_id, 10.0 + vehicle_id, vehicle_id - 1))
+    recorder.close()
+    meta, events = load_trace(filename)
+    assert trace_capacity(meta, events) == 8
+    _, snapshot, mismatches = replay_stats(filename)
+    assert mismatches == []
+    assert snapshot["ocupacion_maxima"] == 8
+    # Con la capacidad de la cabecera la utilización pasaría de 1
+    assert 0 < snapshot["utilizacion"] <= 1
+
+
+def test_vehicle_rng_is_a_stream_per_vehicle():
+    def draws(seed, vehicle_id):
+        rng = vehicle_rng(seed, vehicle_id)
+        return [rng.random() for _ in range(5)]
+
+    first = draws(42, 7)
+    # Otros vehículos sorteando antes (otro orden de los hilos) no cambian su secuencia
+    for other in range(1, 7):
+        draws(42, other)
+    random.random()
+    assert draws(42, 7) == first
+    assert draws(42, 8) != first
+    assert draws(43, 7) != first
@@ -0,0 +1,87 @@
+import pytest
+from engine import DiscreteEventEngine
+from gates import Gate, GateBank, RoundRobin, service_time
+
+
+class _Fixed:
+    """Tiempo de servicio constante (misma interfaz que las distribuciones de traffic.py)."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def sample(self, rng, n):
+        return [self.seconds] * n
+
+
+def test_gate_serves_in_order_and_measures_itself():
+    gate = Gate("E1", _Fixed(1.0))
+    assert gate.arrive("A", 0.0)
+    assert not gate.arrive("B", 0.5)
+    assert not gate.arrive("C", 0.5)
+    assert gate.load() == 3
+    assert gate.finish(1.0) == "B"
+    assert gate.finish(2.0) == "C"
+    assert gate.finish(3.0) is None
+
+    stats = gate.stats(4.0)
+    assert stats["puerta"] == "E1"
+    assert stats["atendidos"] == 3
+    assert stats["utilizacion"] == pytest.approx(0.75)
+    assert stats["max_en_fila"] == 2
+    assert stats["en_fila"] == 0
+    # Fila: 2 vehículos de 0.5 a 1.0 y 1 de 1.0 a 2.0 -> área 2.0 en 4 s
+    assert stats["fila_promedio"] == pytest.approx(0.5)
+    # Esperas 0, 0.5 y 1.5 entre 3 atendidos
+    assert stats["espera_promedio"] == pytest.approx(2.0 / 3)
+
+
+def test_gate_counts_the_vehicle_in_service_until_now():
+    gate = Gate("S1", _Fixed(1.0))
+    gate.arrive("A", 1.0)
+    assert gate.stats(2.0)["utilizacion"] == pytest.approx(0.5)
+
+
+def test_clear_empties_the_line():
+    gate = Gate("E1", _Fixed(1.0))
+    gate.arrive("A", 0.0)
+    gate.arrive("B", 0.0)
+    assert gate.clear(1.0) == ["B"]
+    assert gate.load() == 1
+
+
+def test_bank_picks_the_shortest_queue():
+    bank = GateBank.build("E", 2, _Fixed(1.0))
+    first = bank.choose()
+    first.arrive("A", 0.0)
+    second = bank.choose()
+    assert second is not first
+    second.arrive("B", 0.0)
+    assert bank.choose() is first
+    assert [stats["puerta"] for stats in bank.stats(1.0)] == ["E1", "E2"]
+
+
+def test_round_robin_ignores_the_queues():
+    bank = GateBank.build("S", 3, _Fixed(1.0), "turno")
+    assert isinstance(bank.strategy, RoundRobin)
+    chosen = [bank.choose().name for _ in range(4)]
+    assert chosen == ["S1", "S2", "S3", "S1"]
+
+
+def test_bank_needs_at_least_one_gate():
+    with pytest.raises(ValueError):
+        GateBank([])
+
+
+def test_engine_reports_gate_stats():
+    entry = GateBank.build("E", 1, service_time("uniforme", 2.0))
+    exit_gates = GateBank.build("S", 1, service_time("uniforme", 1.0))
+    engine = DiscreteEventEngine(5, seed=1, wait_range=(1, 1), dwell_range=(5, 5),
+                                 entry_gates=entry, exit_gates=exit_gates)
+    engine.add_vehicles(50, 0.5)
+    summary = engine.run()
+    assert summary["completados"] == 50
+    gates = {stats["puerta"]: stats for stats in summary["puertas"]}
+    assert gates["E1"]["atendidos"] == gates["S1"]["atendidos"] == 50
+    # Llegan cada 0.5 s y la barrera tarda 2 s en promedio: la entrada es el cuello de botella
+    assert gates["E1"]["utilizacion"] > 0.9
+    assert gates["E1"]["max_en_fila"] > 0
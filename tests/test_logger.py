@@ -0,0 +1,76 @@
+import csv
+import gzip
+import pytest
+from events import EventKind, ParkingEvent
+from logger import CABECERA_CSV, TIPO_TEXTO, EventLogger, read_binary_log
+
+
+def _write(filename, fmt, items):
+    logger = EventLogger(filename, fmt, batch_size=2, flush_interval=10)
+    for item in items:
+        logger.log(item)
+    logger.close()
+
+
+@pytest.mark.parametrize("fmt, opener", [("csv", open), ("csv.gz", gzip.open)])
+def test_csv_is_one_table_with_a_single_header(tmp_path, fmt, opener):
+    filename = str(tmp_path / f"log.{fmt}")
+    _write(filename, fmt, [ParkingEvent(EventKind.INGRESO, 3, 1.0, 2), "Simulación iniciada"])
+    _write(filename, fmt, [ParkingEvent(EventKind.ERROR, 4, 2.0, detail="falló")])
+    with opener(filename, "rt", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(CABECERA_CSV)
+    assert all(len(row) == len(CABECERA_CSV) for row in rows)
+    assert [row[1:] for row in rows[1:]] == [
+        ["INGRESO", "3", "2", ""],
+        [TIPO_TEXTO, "", "", "Simulación iniciada"],
+        ["ERROR", "4", "-1", "falló"],
+    ]
+
+
+@pytest.mark.parametrize("fmt, opener", [("csv", open), ("csv.gz", gzip.open)])
+def test_csv_with_another_header_is_rotated(tmp_path, fmt, opener):
+    filename = str(tmp_path / f"log.{fmt}")
+    # Formato viejo (log_to_csv): timestamp y texto, sin cabecera
+    with opener(filename, "wt", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(["2024-01-01T00:00:00", "Vehículo 1 ingresó"])
+    (tmp_path / f"log.{fmt}.1").write_text("ocupado", encoding="utf-8")
+
+    logger = EventLogger(filename, fmt)
+    logger.log(ParkingEvent(EventKind.INGRESO, 3, 1.0, 2))
+    logger.close()
+    assert logger.rotated == filename + ".2"
+    with opener(logger.rotated, "rt", newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [["2024-01-01T00:00:00", "Vehículo 1 ingresó"]]
+    with opener(filename, "rt", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(CABECERA_CSV)
+    assert [row[1:] for row in rows[1:]] == [["INGRESO", "3", "2", ""]]
+
+    # Con la cabecera actual se sigue agregando sin rotar
+    logger = EventLogger(filename, fmt)
+    logger.close()
+    assert logger.rotated is None
+
+
+def test_binary_log_round_trip(tmp_path):
+    filename = str(tmp_path / "log.bin")
+    event = ParkingEvent(EventKind.SALIDA, 9, 12.5, 1)
+    _write(filename, "bin", [event, "texto libre"])
+    assert [item for _, item in read_binary_log(filename)] == [event, "texto libre"]
+
+
+def test_flush_writes_what_was_queued(tmp_path):
+    filename = str(tmp_path / "log.csv")
+    logger = EventLogger(filename, batch_size=1000, flush_interval=60)
+    logger.log("uno")
+    logger.flush()
+    try:
+        assert logger.rows_written == 1
+    finally:
+        logger.close()
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        EventLogger(str(tmp_path / "log.xml"), "xml")
@@ -0,0 +1,86 @@
+import urllib.error
+import pytest
+from metrics import MetricsRegistry, MetricsServer, parse, scrape
+from parking_lot import ParkingLot
+
+
+def test_render_and_parse_round_trip():
+    registry = MetricsRegistry()
+    registry.counter("entradas_total", "Entradas").inc(3)
+    registry.gauge("ocupados", "Ocupados").set(2.5)
+    registry.gauge("leido", "Leído en cada scrape", lambda: 7)
+    text = registry.render()
+    assert "# TYPE entradas_total counter" in text
+    assert "# HELP ocupados Ocupados" in text
+    values = parse(text)
+    assert values["entradas_total"] == 3
+    assert values["ocupados"] == 2.5
+    assert values["leido"] == 7
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("espera_segundos", "Espera", buckets=(1.0, 5.0))
+    for value in (0.5, 2.0, 3.0, 10.0):
+        histogram.observe(value)
+    values = parse(registry.render())
+    assert values['espera_segundos_bucket{le="1"}'] == 1
+    assert values['espera_segundos_bucket{le="5"}'] == 3
+    assert values['espera_segundos_bucket{le="+Inf"}'] == 4
+    assert values["espera_segundos_count"] == 4
+    assert values["espera_segundos_sum"] == pytest.approx(15.5)
+
+
+def test_same_name_returns_the_same_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("a_total", "A") is registry.counter("a_total", "A")
+    with pytest.raises(ValueError):
+        registry.gauge("a_total", "A")
+
+
+def test_collectors_with_labels():
+    registry = MetricsRegistry()
+    registry.add_collector(lambda: [("puerta_atendidos", "gauge", "Atendidos",
+                                     [({"puerta": "E1"}, 4), ({"puerta": 'S"1'}, 2)])])
+    values = parse(registry.render())
+    assert values['puerta_atendidos{puerta="E1"}'] == 4
+    assert values['puerta_atendidos{puerta="S\\"1"}'] == 2
+
+
+def test_failing_collector_is_counted_in_the_same_scrape():
+    registry = MetricsRegistry()
+
+    def broken():
+        return [("parcial", "gauge", "Parcial", 1), ("malo", "gauge", "Malo", 1 / 0)]
+
+    registry.add_collector(broken)
+    registry.add_collector(lambda: [("bueno", "gauge", "Bueno", 1)])
+    values = parse(registry.render())
+    assert values["metricas_errores_collector_total"] == 1
+    assert values["bueno"] == 1
+    assert "parcial" not in values
+    assert parse(registry.render())["metricas_errores_collector_total"] == 2
+
+
+def test_parking_lot_instrumentation():
+    registry = MetricsRegistry()
+    lot = ParkingLot(1, metrics=registry)
+    assert lot.try_enter("A", timeout=0)
+    assert not lot.try_enter("B", timeout=0)
+    lot.exit("A")
+    values = parse(registry.render())
+    assert values["parqueadero_try_enter_segundos_count"] == 2
+    assert values["parqueadero_exit_segundos_count"] == 1
+    assert values["parqueadero_rechazos_total"] == 1
+
+
+def test_server_serves_metrics_only():
+    registry = MetricsRegistry()
+    registry.gauge("ocupados", "Ocupados").set(4)
+    server = MetricsServer(registry, 0)
+    try:
+        assert scrape(server.url)["ocupados"] == 4
+        with pytest.raises(urllib.error.HTTPError):
+            scrape(server.url.replace("/metrics", "/otra"))
+    finally:
+        server.close()
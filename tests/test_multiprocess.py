@@ -0,0 +1,33 @@
+from multiprocess import _distribute, run_multiprocess
+
+
+def test_distribute_serves_the_oldest_waiters_first():
+    shares = _distribute([[3], [0, 1], []], [[], [5.0, 6.0], [2.0, 4.0]])
+    # Tres espacios y cuatro en fila: quedan afuera el de 6.0 (proceso 1)
+    assert shares == [[], [0], [1, 3]]
+
+
+def test_distribute_spreads_the_spare_spaces_evenly():
+    shares = _distribute([list(range(5)), [], []], [[], [], []], turn=1)
+    assert sorted(index for share in shares for index in share) == [0, 1, 2, 3, 4]
+    assert [len(share) for share in shares] == [1, 2, 2]
+
+
+def test_distribute_breaks_ties_by_process():
+    assert _distribute([[0], []], [[1.0], [1.0]]) == [[0], []]
+
+
+def test_shared_mode_is_reproducible():
+    runs = [run_multiprocess(400, 2, capacidad=5, interval=0.3, seed=3) for _ in range(2)]
+    for key in ("estacionados", "completados", "vehiculos_que_esperaron", "max_en_espera",
+                "espera_promedio", "tiempo_simulado", "rechazos"):
+        assert runs[0][key] == runs[1][key]
+    assert runs[0]["completados"] == 400
+    assert runs[0]["eventos_recibidos"] > 0
+
+
+def test_independent_mode_adds_up_the_lots():
+    summary = run_multiprocess(100, 2, capacidad=3, interval=0.5, seed=1, shared=False)
+    assert summary["modo"] == "independiente"
+    assert summary["capacidad"] == 6
+    assert summary["completados"] == 100
@@ -0,0 +1,152 @@
+import threading
+import time
+from parking_lot import ParkingLot
+from slots import LIBRE
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "la condición no se cumplió a tiempo"
+        time.sleep(0.001)
+
+
+def _enter_in_thread(lot, name, results):
+    thread = threading.Thread(target=lambda: results.append((name, lot.try_enter(name, timeout=None))))
+    thread.start()
+    return thread
+
+
+def test_full_lot_does_not_wait_with_zero_timeout():
+    lot = ParkingLot(1)
+    assert lot.try_enter("A", timeout=0)
+    assert not lot.try_enter("B", timeout=0)
+    assert lot.get_waiting_count() == 0
+
+
+def test_exit_hands_the_slot_to_the_first_in_line():
+    lot = ParkingLot(1)
+    assert lot.try_enter("A", timeout=0)
+    results = []
+    first = _enter_in_thread(lot, "B", results)
+    _wait_until(lambda: lot.get_waiting_count() == 1)
+    second = _enter_in_thread(lot, "C", results)
+    _wait_until(lambda: lot.get_waiting_count() == 2)
+
+    lot.exit("A")
+    first.join(2)
+    assert results == [("B", True)]
+    assert lot.slot_of("B") == 0
+    assert lot.get_occupied_count() == 1
+    assert lot.get_waiting_count() == 1
+
+    lot.exit("B")
+    second.join(2)
+    assert results == [("B", True), ("C", True)]
+    assert lot.get_queue_stats()["esperas"] == 2
+
+
+def test_waiting_times_out_and_leaves_the_line():
+    lot = ParkingLot(1)
+    assert lot.try_enter("A", timeout=0)
+    assert not lot.try_enter("B", timeout=0.01)
+    assert lot.get_waiting_count() == 0
+    lot.exit("A")
+    assert lot.get_occupied_count() == 0
+
+
+def test_exit_of_a_vehicle_that_is_not_inside_changes_nothing():
+    lot = ParkingLot(2)
+    assert lot.try_enter("A", timeout=0)
+    lot.exit("B")
+    lot.exit("A")
+    lot.exit("A")
+    assert lot.get_occupied_count() == 0
+    assert lot.exits == 1
+
+
+def test_resize_grows_and_admits_the_line_in_order():
+    lot = ParkingLot(1)
+    assert lot.try_enter("A", timeout=0)
+    results = []
+    first = _enter_in_thread(lot, "B", results)
+    _wait_until(lambda: lot.get_waiting_count() == 1)
+    second = _enter_in_thread(lot, "C", results)
+    _wait_until(lambda: lot.get_waiting_count() == 2)
+
+    lot.resize(2)
+    first.join(2)
+    assert results == [("B", True)]
+    assert lot.capacidad == 2
+    assert lot.slot_of("A") == 0 and lot.slot_of("B") == 1
+    assert lot.get_waiting_count() == 1
+
+    lot.resize(3)
+    second.join(2)
+    assert lot.get_occupied_count() == 3
+
+
+def test_resize_shrinks_without_evicting_parked_vehicles():
+    lot = ParkingLot(3)
+    for name in "ABC":
+        assert lot.try_enter(name, timeout=0)
+    lot.resize(1)
+    assert lot.capacidad == 1
+    assert lot.slot_of("C") == 2
+    assert lot.get_occupied_count() == 3
+
+    # Los espacios que ya no existen desaparecen al quedar vacíos
+    lot.exit("C")
+    lot.exit("B")
+    assert lot.get_occupied_count() == 1
+    assert not lot.try_enter("D", timeout=0)
+    lot.exit("A")
+    assert lot.try_enter("D", timeout=0)
+    assert lot.slot_of("D") == 0
+
+
+def test_snapshot_is_consistent_with_the_counters():
+    lot = ParkingLot(3)
+    assert lot.try_enter("A", timeout=0)
+    assert lot.try_enter("B", timeout=0)
+    lot.exit("A")
+    snapshot = lot.snapshot()
+    assert snapshot.capacidad == 3
+    assert snapshot.occupied == 1
+    assert (snapshot.entries, snapshot.exits) == (2, 1)
+    assert snapshot.slot_states == lot.get_slot_states()
+    assert len(snapshot.slot_states) == 3
+    assert snapshot.waiting == 0
+
+
+def test_snapshot_version_grows_with_every_write():
+    lot = ParkingLot(2)
+    before = lot.snapshot().version
+    assert lot.try_enter("A", timeout=0)
+    after_enter = lot.snapshot().version
+    lot.exit("A")
+    assert before < after_enter < lot.snapshot().version
+
+
+def test_snapshot_under_concurrent_writers_never_sees_a_torn_state():
+    lot = ParkingLot(4)
+    stop = threading.Event()
+
+    def churn(name):
+        while not stop.is_set():
+            if lot.try_enter(name, timeout=0):
+                lot.exit(name)
+            time.sleep(0)  # Ceder el GIL al lector
+
+    threads = [threading.Thread(target=churn, args=(f"V{k}",)) for k in range(6)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(500):
+            snapshot = lot.snapshot()
+            assert snapshot.occupied == snapshot.entries - snapshot.exits
+            assert snapshot.occupied == len(snapshot.slot_states) - snapshot.slot_states.count(LIBRE)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
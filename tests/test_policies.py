@@ -0,0 +1,179 @@
+import threading
+import time
+import pytest
+from parking_lot import ParkingLot
+from policies import (PRIORIDAD_NORMAL, PRIORIDAD_RESERVA, DynamicPricing, ReservationBook,
+                      ReservationPolicy)
+
+
+class _ManualClock:
+    """Reloj que solo avanza cuando la prueba lo mueve (las esperas son reales)."""
+
+    def __init__(self, now=0.0):
+        self.time = now
+
+    def now(self):
+        return self.time
+
+    def wait_event(self, event, timeout=None):
+        return event.wait(timeout)
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "la condición no se cumplió a tiempo"
+        time.sleep(0.001)
+
+
+# === ReservationBook ===
+
+def test_held_counts_half_open_windows():
+    book = ReservationBook()
+    book.book("A", 0, 10)
+    book.book("B", 5, 15)
+    assert [book.held(t) for t in (-1, 0, 5, 9.9, 10, 14, 15)] == [0, 1, 2, 2, 1, 1, 0]
+
+
+def test_peak_is_the_maximum_overlap_inside_the_window():
+    book = ReservationBook()
+    book.book("A", 0, 10)
+    book.book("B", 10, 20)   # Empieza justo cuando termina A: no se superponen
+    book.book("C", 5, 12)
+    assert book.peak(0, 20) == 2
+    assert book.peak(12, 20) == 1
+    assert book.peak(20, 30) == 0
+
+
+def test_limit_rejects_overlapping_bookings_only():
+    book = ReservationBook(limit=2)
+    assert book.book("A", 0, 10) is not None
+    assert book.book("B", 5, 15) is not None
+    assert book.book("C", 8, 9) is None        # Ya hay 2 en [8, 9)
+    assert book.book("D", 10, 20) is not None  # A terminó
+    with pytest.raises(ValueError):
+        book.book("E", 5, 5)
+
+
+def test_check_in_and_cancel_release_the_window():
+    book = ReservationBook(limit=1)
+    first = book.book("A", 0, 10)
+    assert book.active_for("A", 5) == first
+    assert book.active_for("A", 10) is None
+    book.check_in(first)
+    assert book.held(5) == 0
+    assert book.book("B", 0, 10) is not None
+
+
+def test_expire_forgets_lapsed_bookings_only():
+    book = ReservationBook()
+    for k in range(200):
+        book.book(f"V{k}", k, k + 10)
+    checked_in = book.active_for("V3", 5)
+    book.check_in(checked_in)
+    assert book.expire(50) == 40        # Las que terminan hasta 50, menos la que llegó
+    assert len(book) == 159
+    assert book.held(100) == 10
+    assert book.expire(50) == 0
+    assert book.expire(1000) == 159
+    assert len(book) == 0 and book.held(150) == 0
+
+
+# === DynamicPricing ===
+
+def test_rate_follows_the_occupancy_tiers():
+    pricing = DynamicPricing(1000)
+    assert [pricing.rate(o) for o in (0.0, 0.5, 0.6, 0.8, 0.95, 1.0)] == [1000, 1000, 1500, 1500, 2000, 2000]
+
+
+def test_quote_on_entry_and_charge_on_exit():
+    pricing = DynamicPricing(1000)
+    assert pricing.quote("A", 0.9, now=0) == 2000
+    assert pricing.quote("R", 0.9, now=0, reserved=True) == 1000
+    assert pricing.charge("A", 1800) == pytest.approx(1000)
+    assert pricing.charge("R", 3600) == pytest.approx(1000)
+    assert pricing.charge("A", 7200) == 0.0   # Ya cobrado
+    assert pricing.charged == 2
+    assert pricing.revenue == pytest.approx(2000)
+
+
+# === ReservationPolicy en ParkingLot ===
+
+def test_reservation_holds_the_last_free_slot():
+    clock = _ManualClock(1)
+    policy = ReservationPolicy(2)
+    policy.book.book("R", 0, 10)
+    lot = ParkingLot(2, clock=clock, policy=policy)
+    assert lot.try_enter("A", timeout=0)
+    assert not lot.try_enter("B", timeout=0)   # El espacio que queda es de R
+    assert lot.try_enter("R", timeout=0)
+    assert len(policy.book) == 0               # check_in al entrar
+
+
+def test_overbooking_allows_more_bookings_than_slots():
+    policy = ReservationPolicy(2, overbooking=1.5)
+    assert [policy.book.book(f"R{k}", 0, 10) is not None for k in range(4)] == [True, True, True, False]
+    policy.resize(4)
+    assert policy.book.book("R4", 0, 10) is not None
+
+
+def test_priority_classes_order_the_line():
+    clock = _ManualClock(1)
+    policy = ReservationPolicy(1)
+    lot = ParkingLot(1, clock=clock, policy=policy)
+    assert lot.try_enter("A", timeout=0)
+    policy.set_priority("VIP", PRIORIDAD_RESERVA + 1)
+    results = []
+
+    def enter(name):
+        thread = threading.Thread(target=lambda: results.append(name) if lot.try_enter(name, timeout=2) else None)
+        thread.start()
+        _wait_until(lambda: name in [w.name for w in lot._waiters])
+        return thread
+
+    threads = [enter("N1"), enter("N2"), enter("VIP")]
+    policy.book.book("R", 0, 100)
+    threads.append(enter("R"))
+    assert [w.name for w in lot._waiters] == ["VIP", "R", "N1", "N2"]
+    assert policy.priority("N1", 1) == PRIORIDAD_NORMAL
+    # El primer espacio es de R aunque VIP va antes: su reserva vigente lo retiene
+    for count, name in enumerate(("A", "R", "VIP", "N1"), 1):
+        lot.exit(name)
+        _wait_until(lambda count=count: len(results) == count)
+    for thread in threads:
+        thread.join(2)
+    assert results == ["R", "VIP", "N1", "N2"]
+
+
+def test_lapsed_reservation_goes_to_the_line_not_to_the_next_arrival():
+    clock = _ManualClock(1)
+    policy = ReservationPolicy(1)
+    policy.book.book("R", 0, 10)
+    lot = ParkingLot(1, clock=clock, policy=policy)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(lot.try_enter("A", timeout=2)))
+    waiter.start()
+    _wait_until(lambda: lot.get_waiting_count() == 1)
+
+    clock.time = 11   # R nunca llegó: su reserva venció
+    assert not lot.try_enter("B", timeout=0)
+    waiter.join(2)
+    assert results == [True]
+    assert lot.slot_of("A") == 0 and lot.slot_of("B") is None
+    assert len(policy.book) == 0   # La reserva vencida se olvidó
+
+
+def test_readmit_after_cancelling_a_reservation():
+    clock = _ManualClock(1)
+    policy = ReservationPolicy(1)
+    reservation = policy.book.book("R", 0, 10)
+    lot = ParkingLot(1, clock=clock, policy=policy)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(lot.try_enter("A", timeout=2)))
+    waiter.start()
+    _wait_until(lambda: lot.get_waiting_count() == 1)
+    with lot.lock:
+        policy.book.cancel(reservation)
+    assert lot.readmit() == 1
+    waiter.join(2)
+    assert results == [True]
@@ -0,0 +1,110 @@
+import pytest
+import session_store
+from engine import DiscreteEventEngine
+from events import EventKind, SIN_ESPACIO
+from session_store import SessionStore
+from settings import Settings
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "sesiones.db"), batch_size=50)
+    yield store
+    store.close()
+
+
+def _engine_run(store, seed, capacidad=4, vehicles=200):
+    run_id = store.start_run("motor", seed, capacidad, nota="prueba")
+    engine = DiscreteEventEngine(capacidad, seed=seed, on_event=store.recorder(run_id),
+                                 wait_range=(1, 3), dwell_range=(3, 8))
+    engine.add_vehicles(vehicles, 0.5)
+    summary = engine.run()
+    store.end_run(run_id, summary)
+    store.flush()
+    return run_id, summary
+
+
+def test_run_is_stored_and_queryable(store):
+    run_id, summary = _engine_run(store, seed=7)
+    [run] = store.runs()
+    assert run["id"] == run_id and run["modo"] == "motor" and run["seed"] == 7
+    assert run["meta"] == {"nota": "prueba"} and run["fin"] is not None
+    assert store.run_metrics(run_id)["completados"] == summary["completados"] == 200
+
+    first = store.vehicle(run_id, 1)
+    assert first["resultado"] == int(EventKind.SALIDA)
+    assert first["espera"] == pytest.approx(first["ingreso"] - first["llegada"])
+    assert first["estadia"] == pytest.approx(first["salida"] - first["ingreso"])
+    assert store.vehicle(run_id, 999) is None
+
+    history = store.vehicle_history(run_id, 1)
+    assert [e.kind for e in history][-2:] == [EventKind.INGRESO, EventKind.SALIDA]
+    assert history[-1].slot == first["espacio"]
+
+
+def test_slot_history_has_no_overlaps(store):
+    run_id, _ = _engine_run(store, seed=3)
+    total = 0
+    for slot in range(4):
+        occupants = store.slot_history(run_id, slot)
+        total += len(occupants)
+        for before, after in zip(occupants, occupants[1:]):
+            assert before["hasta"] <= after["desde"]
+    # Cada vehículo que estacionó aparece una vez en algún espacio
+    assert total == 200
+
+
+def test_compare_runs_orders_by_metric(store):
+    runs = [_engine_run(store, seed) for seed in (1, 2, 3)]
+    expected = sorted((summary["espera_promedio"], run_id) for run_id, summary in runs)
+    ranking = store.compare_runs("espera_promedio")
+    assert [(row["valor"], row["corrida"]) for row in ranking] == pytest.approx(expected)
+    worst = store.compare_runs("espera_promedio", limit=1, descending=True)
+    assert [row["corrida"] for row in worst] == [expected[-1][1]]
+
+
+def test_unfinished_vehicles_are_closed_with_the_run(store):
+    run_id = store.start_run("gui")
+    store.record(run_id, EventKind.LLEGADA, 1, 0.0)
+    store.record(run_id, EventKind.INGRESO, 1, 1.0, 2)
+    store.record(run_id, EventKind.LLEGADA, 2, 1.5)
+    store.end_run(run_id, {"estacionados": 1, "modo": "texto"})
+    store.flush()
+    parked = store.vehicle(run_id, 1)
+    assert parked["espacio"] == 2 and parked["salida"] is None and parked["resultado"] is None
+    assert store.vehicle(run_id, 2)["espacio"] is None
+    assert store.slot_history(run_id, 2) == [{"vehiculo": 1, "desde": 1.0, "hasta": None}]
+    # Solo las métricas numéricas
+    assert store.run_metrics(run_id) == {"estacionados": 1.0}
+
+
+def test_without_events_keeps_vehicles_and_assignments(tmp_path):
+    store = SessionStore(str(tmp_path / "sin_eventos.db"), batch_size=50, store_events=False)
+    try:
+        run_id, _ = _engine_run(store, seed=5)
+        assert store.vehicle_history(run_id, 1) == []
+        assert store.query("SELECT COUNT(*) AS n FROM eventos")[0]["n"] == 0
+        assert store.vehicle(run_id, 1)["resultado"] == int(EventKind.SALIDA)
+        assert sum(len(store.slot_history(run_id, slot)) for slot in range(4)) == 200
+    finally:
+        store.close()
+
+
+def test_defaults_come_from_settings(tmp_path, monkeypatch):
+    config = Settings(environ={}, overrides={"SESION_LOTE": 7, "SESION_EVENTOS": False})
+    monkeypatch.setattr(session_store, "SETTINGS", config)
+    store = SessionStore(str(tmp_path / "config.db"))
+    try:
+        assert store.batch_size == 7 and store.store_events is False
+        run_id = store.start_run()
+        for vehicle_id in range(1, 8):
+            store.record(run_id, EventKind.LLEGADA, vehicle_id, float(vehicle_id), SIN_ESPACIO)
+        # El séptimo evento completa un lote y lo pasa al escritor
+        assert store._pending == []
+    finally:
+        store.close()
+    explicit = SessionStore(str(tmp_path / "explicito.db"), batch_size=3, store_events=True)
+    try:
+        assert explicit.batch_size == 3 and explicit.store_events is True
+    finally:
+        explicit.close()
@@ -0,0 +1,74 @@
+import json
+import pytest
+from settings import Settings, _coerce, defaults, validate
+
+
+@pytest.mark.parametrize("name, value, default, expected", [
+    ("CAPACIDAD", "20", 10, 20),
+    ("CAPACIDAD", 20.0, 10, 20),
+    ("TIEMPO_MIN_ESPERA", 2, 1, 2.0),
+    ("TIEMPO_MIN_ESPERA", "1.5", 1, 1.5),
+    ("TRAFICO_PERFIL", "pico", None, "pico"),
+    ("METRICAS_PUERTO", "9464", None, 9464),
+    ("TRAFICO_HORAS_PICO", "[[7, 9], [17, 19]]", [(7, 9)], [(7, 9), (17, 19)]),
+    ("SESION_DB", None, None, None),
+])
+def test_coerce_converts_to_the_parameter_type(name, value, default, expected):
+    result = _coerce(name, value, default)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+@pytest.mark.parametrize("name, value, default", [
+    ("CAPACIDAD", "diez", 10),
+    ("CAPACIDAD", 2.5, 10),
+    ("CAPACIDAD", True, 10),
+    ("POLITICA_DESBORDE", 3, "bloquear"),
+])
+def test_coerce_rejects_the_wrong_type(name, value, default):
+    with pytest.raises(ValueError, match=name):
+        _coerce(name, value, default)
+
+
+def test_defaults_are_valid():
+    assert validate(defaults()) == []
+
+
+@pytest.mark.parametrize("changes, message", [
+    ({"CAPACIDAD": 0}, "CAPACIDAD"),
+    ({"TIEMPO_MIN_ESPERA": 5.0, "TIEMPO_MAX_ESPERA": 1.0}, "TIEMPO_MIN_ESPERA"),
+    ({"VELOCIDAD_SIMULACION": 10 ** 9}, "VELOCIDAD_SIMULACION"),
+    ({"LOG_FORMATO": "xml"}, "LOG_FORMATO"),
+    ({"METRICAS_PUERTO": 70000}, "METRICAS_PUERTO"),
+    ({"DISTRIBUCION_ESPACIOS": [(0, "A", "estandar", 0)]}, "DISTRIBUCION_ESPACIOS"),
+])
+def test_validate_reports_each_error(changes, message):
+    values = {**defaults(), **changes}
+    errors = validate(values)
+    assert len(errors) == 1
+    assert message in errors[0]
+
+
+def test_layers_apply_in_priority_order(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"CAPACIDAD": 20, "VEHICULOS_INICIALES": 3}), encoding="utf-8")
+    settings = Settings(str(path), environ={"PARQUEADERO_CAPACIDAD": "30", "OTRA": "x"},
+                        overrides={"VEHICULOS_INICIALES": 7})
+    assert settings.CAPACIDAD == 30
+    assert settings.VEHICULOS_INICIALES == 7
+
+
+def test_invalid_update_keeps_the_previous_configuration():
+    settings = Settings(environ={})
+    changes = []
+    settings.subscribe(changes.append)
+    assert settings.update(CAPACIDAD=25) == {"CAPACIDAD": 25}
+    with pytest.raises(ValueError, match="CAPACIDAD"):
+        settings.update(CAPACIDAD=0)
+    assert settings.CAPACIDAD == 25
+    assert changes == [{"CAPACIDAD": 25}]
+
+
+def test_unknown_parameter_is_rejected():
+    with pytest.raises(ValueError, match="NO_EXISTE"):
+        Settings(environ={"PARQUEADERO_NO_EXISTE": "1"})
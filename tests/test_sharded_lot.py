@@ -0,0 +1,30 @@
+import threading
+from sharded_lot import ShardedParkingLot
+from slots import LIBRE
+
+
+def test_exit_of_a_vehicle_that_is_not_inside_changes_nothing():
+    lot = ShardedParkingLot(4, stripes=2)
+    assert lot.try_enter("A", timeout=0)
+    lot.exit("B")
+    lot.exit("A")
+    lot.exit("A")
+    assert lot.get_occupied_count() == 0
+    assert all(state == LIBRE for state in lot.get_slot_states())
+
+
+def test_full_lot_hands_the_slot_to_the_line():
+    lot = ShardedParkingLot(2, stripes=2)
+    assert lot.try_enter("A", timeout=0) and lot.try_enter("B", timeout=0)
+    assert not lot.try_enter("C", timeout=0)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(lot.try_enter("C", timeout=2)))
+    waiter.start()
+    while lot.get_waiting_count() == 0:
+        waiter.join(0.001)
+    slot = lot.slot_of("A")
+    lot.exit("A")
+    waiter.join(2)
+    assert results == [True]
+    assert lot.slot_of("C") == slot
+    assert lot.get_occupied_count() == 2
@@ -0,0 +1,19 @@
+import threading
+from stats import SimulationStats
+
+
+def test_vehicle_numbers_are_unique_across_threads():
+    stats = SimulationStats(10)
+    numbers = []
+
+    def create():
+        for _ in range(2000):
+            numbers.append(stats.vehicle_started())
+
+    threads = [threading.Thread(target=create) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(numbers) == list(range(1, 8001))
+    assert stats.vehicles_created == stats.live_vehicles == 8000
@@ -0,0 +1,58 @@
+import pytest
+from sweep import PARAMETROS, grid, main, scenario_key, sweep
+
+
+def test_key_is_stable_and_ignores_key_order():
+    scenario = dict(PARAMETROS)
+    reordered = dict(reversed(list(scenario.items())))
+    assert scenario_key(scenario) == scenario_key(reordered)
+
+
+def test_integral_floats_hash_like_ints():
+    assert scenario_key({**PARAMETROS, "tasa": 600}) == scenario_key({**PARAMETROS, "tasa": 600.0})
+    assert scenario_key({**PARAMETROS, "tasa": 600}) != scenario_key({**PARAMETROS, "tasa": 600.5})
+
+
+def test_tuples_and_lists_hash_alike():
+    assert (scenario_key({**PARAMETROS, "horas_pico": [(7, 9)]})
+            == scenario_key({**PARAMETROS, "horas_pico": [[7.0, 9.0]]}))
+
+
+@pytest.mark.parametrize("name, value", [
+    ("capacidad", 999),
+    ("paciencia", 30.0),
+    ("horas_pico", [(1, 2)]),
+    ("distribucion_puerta", "lognormal"),
+    ("estrategia", "turno"),
+    ("seed", 12345),
+])
+def test_every_parameter_changes_the_key(name, value):
+    assert scenario_key({**PARAMETROS, name: value}) != scenario_key(PARAMETROS)
+
+
+def test_grid_fills_in_defaults():
+    scenarios = grid({"capacidad": [5, 10], "seed": [1, 2, 3]})
+    assert len(scenarios) == 6
+    assert all(set(s) == set(PARAMETROS) for s in scenarios)
+    assert scenarios[0]["intervalo"] == PARAMETROS["intervalo"]
+
+
+def test_sweep_reuses_cached_results(tmp_path):
+    cache = str(tmp_path / "cache.jsonl")
+    scenarios = grid({"capacidad": [2, 4], "vehiculos": [30]})
+    seen = []
+
+    def progress(done, total, scenario, cached):
+        seen.append(cached)
+
+    first = sweep(scenarios, workers=1, cache_file=cache, progress=progress)
+    assert seen == [False, False]
+    second = sweep(scenarios, workers=1, cache_file=cache, progress=progress)
+    assert seen[2:] == [True, True]
+    assert [r["completados"] for _, r in first] == [r["completados"] for _, r in second] == [30, 30]
+
+
+def test_cli_accepts_fractional_rates(capsys):
+    main(["--perfil", "constante", "--tasa", "37.5", "--horas", "1", "--capacidad", "3",
+          "--procesos", "1", "--sin-cache"])
+    assert "tasa_rechazo" in capsys.readouterr().out
@@ -0,0 +1,70 @@
+import threading
+import time
+import vehicle_pool
+from vehicle_pool import VehiclePool
+
+
+class _Job:
+    """Vehículo de prueba: queda 'estacionado' hasta que se abre la barrera."""
+
+    def __init__(self, gate, started):
+        self.gate = gate
+        self.started = started
+
+    def run(self):
+        self.started.release()
+        self.gate.wait(2)
+
+
+def _start(pool, count):
+    gate, started = threading.Event(), threading.Semaphore(0)
+    for _ in range(count):
+        pool.submit(_Job(gate, started))
+    for _ in range(count):
+        assert started.acquire(timeout=2), "un vehículo no consiguió hilo"
+    return gate
+
+
+def test_pool_grows_past_its_fixed_workers(monkeypatch):
+    monkeypatch.setattr(vehicle_pool, "_ESPERA_HILO_EXTRA", 0.05)
+    pool = VehiclePool(workers=2)
+    gate = _start(pool, 6)
+    assert pool.active() == 6
+    assert pool.peak_workers >= 6
+
+    gate.set()
+    assert pool.wait_idle(2)
+    deadline = time.monotonic() + 2
+    while pool.workers > 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.workers == 2  # Los extra terminan al quedar ociosos
+    assert pool.completed == 6
+    pool.shutdown(2)
+
+
+def test_max_workers_caps_the_pool():
+    pool = VehiclePool(workers=1, max_workers=2)
+    gate, started = threading.Event(), threading.Semaphore(0)
+    for _ in range(3):
+        pool.submit(_Job(gate, started))
+    assert started.acquire(timeout=2) and started.acquire(timeout=2)
+    assert not started.acquire(timeout=0.05)
+    assert pool.pending() == 1
+    gate.set()
+    assert pool.wait_idle(2)
+    pool.shutdown(2)
+
+
+def test_failing_vehicle_does_not_kill_the_worker(capsys):
+    class Broken:
+        def run(self):
+            raise RuntimeError("falla de prueba")
+
+    pool = VehiclePool(workers=1)
+    pool.submit(Broken())
+    assert pool.wait_idle(2)
+    assert "falla de prueba" in capsys.readouterr().err
+    _start(pool, 1).set()
+    assert pool.wait_idle(2)
+    assert pool.completed == 2
+    pool.shutdown(2)